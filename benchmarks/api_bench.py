@@ -0,0 +1,174 @@
+"""공간 API 부하 벤치마크
+
+main:app 을 로컬 MongoDB/S3 대체 환경 위에서 띄우고, 데이터셋 크기별로
+목록/상세/주변/이미지 포함 등록/삭제 요청의 p50/p99 지연 시간과 처리량을 JSON으로 출력한다.
+
+사용 예 (저장소 루트에서):
+    pip install -r requirements.txt -r benchmarks/requirements.txt
+    python -m benchmarks.api_bench --sizes 100 1000 10000 --output bench_api.json
+    python -m benchmarks.api_bench --mongo-uri mongodb://localhost:27017   # $geoNear 포함 측정
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import run_metadata, summarize, write_report
+from benchmarks.stand_ins import (
+    configure_environment,
+    local_backends,
+    make_image_bytes,
+    make_token,
+    seed_spaces,
+    silence_console_logs,
+)
+
+
+async def _measure(
+    name: str,
+    request: Callable[[int], Awaitable[int]],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    **fields
+) -> Dict:
+    for idx in range(warmup):
+        await request(idx)
+
+    samples: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for idx in counter:
+            started = time.perf_counter()
+            status_code = await request(warmup + idx)
+            samples.append(time.perf_counter() - started)
+            if status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed, scenario=name, requests=requests, warmup=warmup, concurrency=concurrency, errors=errors, **fields)
+
+
+def _space_form(rng: random.Random, user_id: str) -> Dict:
+    return {
+        "user_id": user_id,
+        "space_type": "STUDYROOM",
+        "space_name": f"벤치마크 등록 공간 {rng.randint(1, 10**6)}",
+        "capacity": "8",
+        "space_size": "30",
+        "usage_unit": "TIME",
+        "unit_price": "15000",
+        "location": json.dumps({
+            "sido": "서울특별시",
+            "address": "테스트로 1",
+            "type": "Point",
+            "coordinates": [rng.uniform(126.9, 127.1), rng.uniform(37.5, 37.6)]
+        }),
+        "amenities": ["WIFI", "PROJECTOR"],
+        "description": "벤치마크용 공간",
+        "content": "벤치마크용 공간 소개",
+        "operating_hour": json.dumps([{"day": "MONDAY", "open": "09:00", "close": "22:00"}])
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    import httpx
+
+    configure_environment()
+    silence_console_logs()
+
+    from main import app
+
+    results = []
+    async with local_backends(args.mongo_uri) as backends:
+        db = backends["db"]
+        nearby_supported = backends["mongo_backend"] != "mongomock"
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for size in args.sizes:
+                    documents = await seed_spaces(db, size, seed=args.seed)
+                    space_ids = [str(doc["_id"]) for doc in documents]
+                    rng = random.Random(args.seed)
+                    # 요청 수 / 워밍업 수는 _measure 가 결과에 기록
+                    common = {"dataset_size": size}
+
+                    async def list_spaces(idx: int) -> int:
+                        params = {"skip": rng.randrange(0, max(1, min(size, 1000))), "limit": args.page_size}
+                        response = await client.get("/api/v1/spaces", params=params)
+                        return response.status_code
+
+                    async def space_detail(idx: int) -> int:
+                        response = await client.get(f"/api/v1/spaces/{rng.choice(space_ids)}")
+                        return response.status_code
+
+                    async def nearby(idx: int) -> int:
+                        params = {"longitude": rng.uniform(126.9, 127.1), "latitude": rng.uniform(37.5, 37.6), "radius": args.radius}
+                        response = await client.get("/api/v1/spaces/nearby", params=params)
+                        return response.status_code
+
+                    results.append(await _measure("list", list_spaces, args.requests, args.concurrency, args.warmup, **common))
+                    results.append(await _measure("detail", space_detail, args.requests, args.concurrency, args.warmup, **common))
+                    if nearby_supported:
+                        results.append(await _measure("nearby", nearby, args.requests, args.concurrency, args.warmup, **common))
+                    else:
+                        results.append({"scenario": "nearby", "dataset_size": size, "skipped": "mongomock은 $geoNear 를 지원하지 않음 (--mongo-uri 사용)"})
+
+                    # 등록/삭제는 쓰기 경로이므로 동시성 1로 측정
+                    user_id = "bench-provider"
+                    headers = {"Authorization": f"Bearer {make_token(user_id)}"}
+                    image_rng = random.Random(args.seed)
+                    images = [make_image_bytes(image_rng, args.image_kb * 1024) for _ in range(args.images)]
+                    created_ids: List[str] = []
+
+                    async def create_space(idx: int) -> int:
+                        files = [("images", (f"photo_{n}.png", data, "image/png")) for n, data in enumerate(images)]
+                        response = await client.post("/api/v1/spaces", data=_space_form(rng, user_id), files=files, headers=headers)
+                        if response.status_code == 201:
+                            created_ids.append(response.json()["space_id"])
+                        return response.status_code
+
+                    async def delete_space(idx: int) -> int:
+                        if not created_ids:
+                            return 599
+                        response = await client.delete(f"/api/v1/spaces/{created_ids.pop()}", headers=headers)
+                        return response.status_code
+
+                    write_requests = max(1, args.requests // 4)
+                    write_fields = dict(common, images=args.images, image_kb=args.image_kb)
+                    results.append(await _measure("create_with_images", create_space, write_requests, 1, args.warmup, **write_fields))
+                    results.append(await _measure("delete", delete_space, write_requests, 1, 0, **write_fields))
+
+        metadata = run_metadata(benchmark="api", mongo_backend=backends["mongo_backend"], s3_backend="moto")
+
+    return {"metadata": metadata, "results": results}
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="공간 API 부하 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="시드할 공간 수")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="읽기 시나리오 동시 요청 수")
+    parser.add_argument("--warmup", type=int, default=10, help="측정 전 워밍업 요청 수")
+    parser.add_argument("--page-size", type=int, default=20, help="목록 조회 limit")
+    parser.add_argument("--radius", type=float, default=2.0, help="주변 조회 반경(km)")
+    parser.add_argument("--images", type=int, default=3, help="등록 시 이미지 수")
+    parser.add_argument("--image-kb", type=int, default=64, help="이미지 한 장 크기(KB)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mongo-uri", default=None, help="로컬 mongod 주소 (미지정 시 mongomock-motor)")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 (미지정 시 stdout)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    write_report(asyncio.run(run(args)), args.output)
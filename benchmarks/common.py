@@ -0,0 +1,68 @@
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_seconds: List[float], elapsed_seconds: Optional[float] = None, **fields) -> Dict:
+    """지연 시간 샘플(초)을 p50/p99/평균/처리량(ms, rps)으로 요약"""
+    elapsed = elapsed_seconds if elapsed_seconds is not None else sum(samples_seconds)
+    result = dict(fields)
+    result.update({
+        "samples": len(samples_seconds),
+        "p50_ms": round(percentile(samples_seconds, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples_seconds, 99) * 1000, 3),
+        "mean_ms": round(sum(samples_seconds) / len(samples_seconds) * 1000, 3) if samples_seconds else 0.0,
+        "throughput_per_second": round(len(samples_seconds) / elapsed, 1) if elapsed > 0 else None
+    })
+    return result
+
+
+def time_calls(fn: Callable[[], object], iterations: int, setup: Optional[Callable[[], object]] = None) -> List[float]:
+    """fn 을 iterations 번 호출하며 호출별 소요 시간(초)을 반환 (setup 시간은 제외)"""
+    samples = []
+    for _ in range(iterations):
+        arg = setup() if setup else None
+        started = time.perf_counter()
+        fn(arg) if setup else fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def run_metadata(**extra) -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    metadata = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds")
+    }
+    metadata.update(extra)
+    return metadata
+
+
+def write_report(report: Dict, output: Optional[str]):
+    """결과를 JSON으로 기록 (output 미지정 시 stdout)"""
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
@@ -0,0 +1,134 @@
+"""주변 공간 조회 벤치마크: 메모리 위치 인덱스(GeoGrid) vs MongoDB $geoNear
+
+데이터셋 크기별로 인덱스 적재 시간/메모리와 반경/가까운 순 k개 조회 지연 시간을 측정한다.
+MongoDB 경로와 결과 비교는 --mongo-uri 를 지정했을 때만 측정 (mongomock 은 $geoNear 미지원)
+
+사용 예 (저장소 루트에서):
+    python -m benchmarks.geo_bench --sizes 1000 10000 100000 --output bench_geo.json
+    python -m benchmarks.geo_bench --mongo-uri mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import run_metadata, summarize, time_calls, write_report
+from benchmarks.stand_ins import configure_environment, local_backends, make_space_documents, seed_spaces, silence_console_logs
+
+
+def _query_points(rng: random.Random, count: int) -> List[Tuple[float, float]]:
+    return [(rng.uniform(126.9, 127.1), rng.uniform(37.5, 37.6)) for _ in range(count)]
+
+
+def _bench_index(documents: List[Dict], points: List[Tuple[float, float]], args: argparse.Namespace) -> Tuple[List[Dict], object]:
+    from services.geo_index_service import GeoGrid, SpaceGeoIndex
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    grid = GeoGrid(args.cell_degrees)
+    for space in documents:
+        SpaceGeoIndex._apply(grid, space)
+    build_seconds = time.perf_counter() - started
+    memory_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = [{
+        "scenario": "index_build",
+        "dataset_size": len(documents),
+        "build_ms": round(build_seconds * 1000, 1),
+        "memory_bytes": memory_bytes,
+        "bytes_per_space": round(memory_bytes / max(1, len(documents)), 1),
+        "cells": len(grid.cells)
+    }]
+
+    for radius in args.radii:
+        queries = iter(points * (args.requests // len(points) + 1))
+        samples = time_calls(lambda: grid.query(*next(queries), radius * 1000), args.requests)
+        results.append(summarize(samples, scenario="index_radius", dataset_size=len(documents), radius_km=radius))
+
+        queries = iter(points * (args.requests // len(points) + 1))
+        samples = time_calls(lambda: grid.query(*next(queries), radius * 1000, args.k), args.requests)
+        results.append(summarize(samples, scenario="index_knn", dataset_size=len(documents), radius_km=radius, k=args.k))
+
+    return results, grid
+
+
+async def _bench_mongo(db, grid, points: List[Tuple[float, float]], args: argparse.Namespace, size: int) -> List[Dict]:
+    results = []
+    for radius in args.radii:
+        for scenario, limit in (("mongo_radius", None), ("mongo_knn", args.k)):
+            samples, mismatches = [], 0
+            for idx in range(args.requests):
+                longitude, latitude = points[idx % len(points)]
+                pipeline = [{"$geoNear": {
+                    "near": {"type": "Point", "coordinates": [longitude, latitude]},
+                    "key": "location",
+                    "distanceField": "distance",
+                    "maxDistance": radius * 1000,
+                    "spherical": True,
+                    "query": {"deleted_at": None}
+                }}, {"$project": {"_id": 1}}]
+                if limit:
+                    pipeline.append({"$limit": limit})
+
+                started = time.perf_counter()
+                spaces = await db.spaces.aggregate(pipeline).to_list(length=None)
+                samples.append(time.perf_counter() - started)
+
+                # 같은 결과(공간 집합)를 반환하는지 확인 (거리 경계의 부동소수점 차이는 불일치로 집계)
+                expected = {space["_id"] for space in spaces}
+                actual = {object_id for _, object_id in grid.query(longitude, latitude, radius * 1000, limit)}
+                mismatches += expected != actual
+
+            fields = {"dataset_size": size, "radius_km": radius, "mismatches": mismatches}
+            if limit:
+                fields["k"] = limit
+            results.append(summarize(samples, scenario=scenario, **fields))
+    return results
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    configure_environment()
+    silence_console_logs()
+
+    results = []
+    async with local_backends(args.mongo_uri) as backends:
+        db = backends["db"]
+        for size in args.sizes:
+            documents = make_space_documents(size, seed=args.seed)
+            points = _query_points(random.Random(args.seed), 100)
+
+            index_results, grid = _bench_index(documents, points, args)
+            results.extend(index_results)
+
+            if backends["mongo_backend"] == "mongomock":
+                results.append({"scenario": "mongo", "dataset_size": size, "skipped": "mongomock은 $geoNear 를 지원하지 않음 (--mongo-uri 사용)"})
+                continue
+
+            await seed_spaces(db, size, seed=args.seed)
+            await db.spaces.create_index([("location", "2dsphere")])
+            results.extend(await _bench_mongo(db, grid, points, args, size))
+
+        metadata = run_metadata(benchmark="geo", mongo_backend=backends["mongo_backend"], cell_degrees=args.cell_degrees)
+
+    return {"metadata": metadata, "results": results}
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="주변 공간 조회 벤치마크 (메모리 위치 인덱스 vs MongoDB)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="공간 수")
+    parser.add_argument("--radii", type=float, nargs="+", default=[1.0, 5.0], help="조회 반경(km)")
+    parser.add_argument("--k", type=int, default=20, help="가까운 순 조회 개수")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 측정 조회 수")
+    parser.add_argument("--cell-degrees", type=float, default=0.01, help="격자 칸 크기(도)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mongo-uri", default=None, help="로컬 mongod 주소 (미지정 시 메모리 인덱스만 측정)")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 (미지정 시 stdout)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    write_report(asyncio.run(run(args)), args.output)
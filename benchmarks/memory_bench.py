@@ -0,0 +1,136 @@
+"""목록 / 주변 조회 응답 가공 메모리·CPU 벤치마크
+
+BSON 디코딩부터 응답 본문 렌더링까지를 두 방식으로 비교한다.
+- legacy: 전체 문서 디코딩 → dict 수정 → 라우터의 Pydantic 모델 생성 → response_model 재검증/직렬화
+- record: 프로젝션된 문서 디코딩 → SpaceListRecord → to_payload() 한 번 변환
+tracemalloc 으로 호출당 최대 할당량(peak)을, time_calls 로 호출당 소요 시간을 측정한다.
+
+사용 예 (저장소 루트에서):
+    python -m benchmarks.memory_bench --page-sizes 20 100 --nearby-sizes 50 200 --output bench_memory.json
+"""
+import argparse
+import random
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import bson
+
+from benchmarks.common import run_metadata, summarize, time_calls, write_report
+from benchmarks.stand_ins import configure_environment, make_space_documents, silence_console_logs
+
+
+def _project(document: Dict, projection: Dict) -> Dict:
+    # MongoDB 프로젝션 결과와 같은 형태의 문서 (location.* 하위 필드, images $slice)
+    projected = {"_id": document["_id"]}
+    for field, spec in projection.items():
+        if "." in field:
+            parent, child = field.split(".", 1)
+            if child in document.get(parent, {}):
+                projected.setdefault(parent, {})[child] = document[parent][child]
+        elif field in document:
+            projected[field] = document[field][:spec["$slice"]] if isinstance(spec, dict) else document[field]
+    return projected
+
+
+def _peak_bytes(fn: Callable[[object], object], arg: object, repeat: int = 5) -> int:
+    peaks = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        fn(arg)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return min(peaks)
+
+
+def _bench(name: str, page_size: int, legacy: Callable, record: Callable, full: List[bytes], projected: List[bytes], iterations: int) -> List[Dict]:
+    results = []
+    for path, fn, payload in (("legacy", legacy, full), ("record", record, projected)):
+        fn(payload)
+        samples = time_calls(lambda: fn(payload), iterations)
+        results.append(summarize(
+            samples,
+            scenario=name,
+            path=path,
+            page_size=page_size,
+            bson_bytes=sum(len(raw) for raw in payload),
+            peak_alloc_bytes=_peak_bytes(fn, payload)
+        ))
+    return results
+
+
+def run(args: argparse.Namespace) -> Dict:
+    from moto import mock_aws
+    from pydantic import TypeAdapter
+
+    configure_environment()
+    silence_console_logs()
+
+    from schemas.space_response import SpaceListResponse, SpaceNearbyResponse
+    from services.space_service import SpaceService
+    from utils.json_response import json_response_class
+    from utils.type.space_record_type import SpaceListRecord
+
+    response_class = json_response_class()
+    list_adapter = TypeAdapter(List[SpaceListResponse])
+    nearby_adapter = TypeAdapter(List[SpaceNearbyResponse])
+    rng = random.Random(args.seed)
+
+    results = []
+    with mock_aws():
+        service = SpaceService(db=None, aws_service=None)
+
+        # 변경 전 목록: 라우터에서 모델 생성 후 FastAPI 가 model_dump → 재검증 → 직렬화
+        def legacy_list(raw_documents: List[bytes]):
+            spaces = [bson.decode(raw) for raw in raw_documents]
+            for space in spaces:
+                space['space_id'] = str(space['_id'])
+                space['thumbnail'] = service._thumbnail_url(space)
+                del space['_id']
+            models = [SpaceListResponse(**space) for space in spaces]
+            content = list_adapter.validate_python([model.model_dump() for model in models])
+            return response_class(list_adapter.dump_python(content, mode="json")).body
+
+        # 변경 전 주변 조회: dict 그대로 반환 → response_model 검증/직렬화
+        def legacy_nearby(raw_documents: List[bytes]):
+            spaces = [bson.decode(raw) for raw in raw_documents]
+            for space in spaces:
+                space['space_id'] = str(space['_id'])
+                space['thumbnail'] = service._thumbnail_url(space)
+                space['distance'] = round(space['distance'], 1)
+                del space['_id']
+            content = nearby_adapter.validate_python(spaces)
+            return response_class(nearby_adapter.dump_python(content, mode="json")).body
+
+        def record_list(raw_documents: List[bytes]):
+            spaces = [bson.decode(raw) for raw in raw_documents]
+            records = [SpaceListRecord.from_document(space, service._first_image_url(space), space.get("distance")) for space in spaces]
+            return response_class([record.to_payload() for record in records]).body
+
+        for scenario, legacy, sizes in (("list", legacy_list, args.page_sizes), ("nearby", legacy_nearby, args.nearby_sizes)):
+            for page_size in sizes:
+                documents = make_space_documents(page_size, seed=args.seed)
+                if scenario == "nearby":
+                    for document in documents:
+                        document["distance"] = rng.uniform(0, 3000)
+                projection = dict(SpaceListRecord.PROJECTION, distance=1)
+                full = [bson.encode(document) for document in documents]
+                projected = [bson.encode(_project(document, projection)) for document in documents]
+                results.extend(_bench(scenario, page_size, legacy, record_list, full, projected, args.iterations))
+
+    return {"metadata": run_metadata(benchmark="memory", response_class=response_class.__name__), "results": results}
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="목록 / 주변 조회 응답 가공 메모리·CPU 벤치마크")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[20, 100], help="목록 조회 limit")
+    parser.add_argument("--nearby-sizes", type=int, nargs="+", default=[50, 200], help="주변 조회 결과 수")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 (미지정 시 stdout)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    write_report(run(args), args.output)
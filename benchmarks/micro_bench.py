@@ -0,0 +1,96 @@
+"""응답 가공 / JWT 검증 마이크로 벤치마크
+
+사용 예 (저장소 루트에서):
+    python -m benchmarks.micro_bench --page-sizes 10 100 --output bench_micro.json
+"""
+import argparse
+import copy
+from typing import Dict, List, Optional
+
+from benchmarks.common import run_metadata, summarize, time_calls, write_report
+from benchmarks.stand_ins import configure_environment, make_space_documents, make_token, silence_console_logs
+
+
+def _bench_shaping(page_size: int, iterations: int) -> List[Dict]:
+    from moto import mock_aws
+
+    from schemas.space_response import SpaceListResponse, SpaceResponse
+    from services.space_service import SpaceService
+
+    results = []
+    documents = make_space_documents(page_size)
+
+    with mock_aws():
+        service = SpaceService(db=None, aws_service=None)
+
+        # 목록: 서비스의 문서 가공 + 라우터의 SpaceListResponse 생성 + 직렬화
+        def shape_list(docs: List[Dict]):
+            for space in docs:
+                space['space_id'] = str(space['_id'])
+                space['thumbnail'] = service._thumbnail_url(space)
+                del space['_id']
+            models = [SpaceListResponse(**space) for space in docs]
+            return [model.model_dump_json() for model in models]
+
+        samples = time_calls(shape_list, iterations, setup=lambda: copy.deepcopy(documents))
+        results.append(summarize(samples, scenario="shape_list", page_size=page_size))
+
+        # 상세: 이미지 URL 생성 + SpaceResponse 생성 + 직렬화
+        def shape_detail(space: Dict):
+            space['space_id'] = str(space['_id'])
+            space['images'] = [service._image_url(space['user_id'], space['space_id'], image['filename']) for image in space['images']]
+            del space['_id']
+            return SpaceResponse(message="공간이 조회되었습니다.", **space).model_dump_json()
+
+        samples = time_calls(shape_detail, iterations * page_size, setup=lambda: copy.deepcopy(documents[0]))
+        results.append(summarize(samples, scenario="shape_detail"))
+
+    return results
+
+
+def _bench_jwt(iterations: int) -> List[Dict]:
+    from fastapi import HTTPException
+
+    from utils.jwt_handler import verify_jwt_token
+
+    valid_token = make_token("bench-provider")
+    expired_token = make_token("bench-provider", ttl_seconds=-10)
+
+    results = []
+    samples = time_calls(lambda: verify_jwt_token(valid_token), iterations)
+    results.append(summarize(samples, scenario="jwt_verify_valid"))
+
+    def verify_expired():
+        try:
+            verify_jwt_token(expired_token)
+        except HTTPException:
+            pass
+
+    samples = time_calls(verify_expired, iterations)
+    results.append(summarize(samples, scenario="jwt_verify_expired"))
+    return results
+
+
+def run(args: argparse.Namespace) -> Dict:
+    configure_environment()
+    silence_console_logs()
+
+    results = []
+    for page_size in args.page_sizes:
+        results.extend(_bench_shaping(page_size, args.iterations))
+    results.extend(_bench_jwt(args.iterations * 10))
+
+    return {"metadata": run_metadata(benchmark="micro"), "results": results}
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="응답 가공 / JWT 검증 마이크로 벤치마크")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100], help="목록 가공 시 문서 수")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 (미지정 시 stdout)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    write_report(run(args), args.output)
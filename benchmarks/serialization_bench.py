@@ -0,0 +1,102 @@
+"""목록 응답 직렬화 / 압축 벤치마크
+
+표준 JSONResponse 와 ORJSONResponse 의 렌더링 CPU 시간, 인코딩별(gzip 레벨, brotli 품질) 압축 시간과 전송 바이트 수를 비교한다.
+FastAPI 가 response_model 로 검증/변환하는 단계는 두 응답 클래스에 공통이므로 별도 항목(model_serialize)으로 측정한다.
+
+사용 예 (저장소 루트에서):
+    python -m benchmarks.serialization_bench --page-sizes 10 100 --output bench_serialization.json
+"""
+import argparse
+import copy
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import run_metadata, summarize, time_calls, write_report
+from benchmarks.stand_ins import configure_environment, make_space_documents, silence_console_logs
+
+
+def _list_content(page_size: int) -> Tuple[List, TypeAdapter]:
+    from moto import mock_aws
+
+    from schemas.space_response import SpaceListResponse
+    from services.space_service import SpaceService
+
+    documents = copy.deepcopy(make_space_documents(page_size))
+    with mock_aws():
+        service = SpaceService(db=None, aws_service=None)
+        for space in documents:
+            space['space_id'] = str(space['_id'])
+            space['thumbnail'] = service._thumbnail_url(space)
+            del space['_id']
+
+    models = [SpaceListResponse(**space) for space in documents]
+    adapter = TypeAdapter(List[SpaceListResponse])
+    return models, adapter
+
+
+def _bench_page(page_size: int, iterations: int, gzip_levels: List[int], brotli_qualities: List[int]) -> List[Dict]:
+    from fastapi.responses import JSONResponse, ORJSONResponse
+
+    from utils.compression import brotli, compress
+
+    results = []
+    models, adapter = _list_content(page_size)
+
+    # response_model 검증/변환 (응답 클래스와 무관하게 공통)
+    samples = time_calls(lambda: adapter.dump_python(models, mode="json"), iterations)
+    results.append(summarize(samples, scenario="model_serialize", page_size=page_size))
+
+    content = adapter.dump_python(models, mode="json")
+    body = b""
+    for name, response_class in (("render_std_json", JSONResponse), ("render_orjson", ORJSONResponse)):
+        samples = time_calls(lambda: response_class(content).body, iterations)
+        body = response_class(content).body
+        results.append(summarize(samples, scenario=name, page_size=page_size, body_bytes=len(body)))
+
+    variants = [("gzip", {"gzip_level": level, "brotli_quality": 0}, f"gzip-{level}") for level in gzip_levels]
+    if brotli is not None:
+        variants += [("br", {"gzip_level": 0, "brotli_quality": quality}, f"br-{quality}") for quality in brotli_qualities]
+
+    for encoding, settings, label in variants:
+        samples = time_calls(lambda: compress(body, encoding, settings), iterations)
+        compressed = compress(body, encoding, settings)
+        results.append(summarize(
+            samples,
+            scenario="compress",
+            page_size=page_size,
+            encoding=label,
+            body_bytes=len(body),
+            wire_bytes=len(compressed),
+            ratio=round(len(compressed) / len(body), 3)
+        ))
+
+    return results
+
+
+def run(args: argparse.Namespace) -> Dict:
+    configure_environment()
+    silence_console_logs()
+
+    from utils.compression import brotli
+
+    results = []
+    for page_size in args.page_sizes:
+        results.extend(_bench_page(page_size, args.iterations, args.gzip_levels, args.brotli_qualities))
+
+    return {"metadata": run_metadata(benchmark="serialization", brotli_available=brotli is not None), "results": results}
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="목록 응답 직렬화 / 압축 벤치마크")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100], help="목록 문서 수")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[4, 11])
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 (미지정 시 stdout)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    write_report(run(args), args.output)
@@ -0,0 +1,153 @@
+"""벤치마크용 로컬 MongoDB / S3 대체 환경
+
+- MongoDB: 기본값은 mongomock-motor (in-process), --mongo-uri 지정 시 로컬 mongod 사용
+- S3: moto(mock_aws)로 in-process 가짜 버킷 생성
+"""
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from enums.day_of_week import DayOfWeek
+from enums.space_type import SpaceType
+from enums.usage_type import UsageType
+
+
+BENCH_DB_NAME = "spaceplace_bench"
+BENCH_BUCKET = "space-place-bench"
+BENCH_REGION = "ap-northeast-2"
+BENCH_JWT_SECRET = "benchmark-secret"
+
+# 서울 일대 (경도, 위도) 범위
+_SEOUL_BOUNDS = ((126.80, 127.18), (37.45, 37.68))
+_SIDOS = ["서울특별시", "경기도", "인천광역시", "부산광역시", "대구광역시"]
+_AMENITIES = ["WIFI", "PARKING", "PROJECTOR", "AIRCON", "SHOWER", "KITCHEN", "SPEAKER"]
+
+
+def configure_environment():
+    """.env 파일보다 먼저 적용되도록 개발 환경 변수를 벤치마크 값으로 설정"""
+    os.environ["APP_ENV"] = "development"
+    os.environ["USER_JWT_SECRET"] = BENCH_JWT_SECRET
+    os.environ["SPACE_S3_BUCKET_NAME"] = BENCH_BUCKET
+    os.environ["REGION_NAME"] = BENCH_REGION
+    os.environ["SPACE_DB_NAME"] = BENCH_DB_NAME
+    # mongomock 은 세션/트랜잭션과 change stream 을 지원하지 않음
+    os.environ["SPACE_OUTBOX_TRANSACTIONS"] = "false"
+    os.environ["SPACE_CHANGES_STREAM"] = "false"
+    for key in ("SPACE_ACCESS_KEY", "SPACE_SECRET_KEY", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        os.environ[key] = "testing"
+
+
+def silence_console_logs():
+    """로그 포맷팅 비용은 측정에 포함하되 콘솔 출력은 버림"""
+    from utils.logger import Logger
+
+    Logger.setup_logger()
+    for handler in logging.getLogger().handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setStream(open(os.devnull, "w"))
+
+
+@asynccontextmanager
+async def local_backends(mongo_uri: Optional[str] = None):
+    """moto S3 와 MongoDB 대체 클라이언트를 준비하고 MongoDB 싱글톤에 주입"""
+    import boto3
+    from moto import mock_aws
+
+    from utils.logger import Logger
+    from utils.mongodb import MongoDB
+    from utils.type.db_config_type import DBConfig
+
+    with mock_aws():
+        s3_client = boto3.client("s3", region_name=BENCH_REGION)
+        s3_client.create_bucket(Bucket=BENCH_BUCKET, CreateBucketConfiguration={"LocationConstraint": BENCH_REGION})
+
+        if mongo_uri:
+            from motor.motor_asyncio import AsyncIOMotorClient
+            client = AsyncIOMotorClient(mongo_uri)
+            backend = "mongod"
+        else:
+            from mongomock_motor import AsyncMongoMockClient
+            client = AsyncMongoMockClient()
+            backend = "mongomock"
+
+        # connect() 를 거치지 않도록 클라이언트가 연결된 인스턴스를 미리 등록
+        mongodb = MongoDB.__new__(MongoDB)
+        mongodb._db_config = DBConfig(host="", dbname=BENCH_DB_NAME, username="", password="")
+        mongodb._logger = Logger.setup_logger()
+        mongodb.client = client
+        mongodb.db = client[BENCH_DB_NAME]
+        MongoDB._instance = mongodb
+
+        try:
+            yield {"db": mongodb.db, "s3_client": s3_client, "mongo_backend": backend}
+        finally:
+            if mongo_uri:
+                await client.drop_database(BENCH_DB_NAME)
+            MongoDB._instance = None
+
+
+def make_token(user_id: str, ttl_seconds: int = 3600) -> str:
+    from jose import jwt
+    return jwt.encode({"user_id": user_id, "exp": int(time.time()) + ttl_seconds}, BENCH_JWT_SECRET, algorithm="HS256")
+
+
+def make_space_document(rng: random.Random, user_id: str, created_at: datetime) -> Dict:
+    longitude = rng.uniform(*_SEOUL_BOUNDS[0])
+    latitude = rng.uniform(*_SEOUL_BOUNDS[1])
+    usage_unit = rng.choice(list(UsageType))
+    return {
+        "_id": ObjectId(),
+        "user_id": user_id,
+        "space_type": rng.choice(list(SpaceType)).value,
+        "space_name": f"벤치마크 공간 {rng.randint(1, 10**6)}",
+        "capacity": rng.randint(2, 60),
+        "space_size": rng.randint(10, 300),
+        "usage_unit": usage_unit.value,
+        "unit_price": rng.randrange(5000, 300000, 500),
+        "amenities": rng.sample(_AMENITIES, rng.randint(1, 5)),
+        "description": "역에서 도보 5분, 조용하고 깔끔한 공간입니다.",
+        "content": "공간 소개 " * rng.randint(20, 120),
+        "location": {
+            "sido": rng.choice(_SIDOS),
+            "address": f"테스트로 {rng.randint(1, 999)}",
+            "type": "Point",
+            "coordinates": [longitude, latitude]
+        },
+        "operating_hour": [
+            {"day": day.value, "open": "09:00", "close": "22:00"} for day in DayOfWeek
+        ],
+        "images": [
+            {"filename": f"{idx}.png", "original_filename": f"photo_{idx}.png"} for idx in range(rng.randint(1, 8))
+        ],
+        "is_operate": True,
+        "created_at": created_at
+    }
+
+
+def make_space_documents(size: int, seed: int = 42, owners: int = 50) -> List[Dict]:
+    rng = random.Random(seed)
+    base = datetime.now() - timedelta(days=365)
+    user_ids = [f"provider-{idx}" for idx in range(owners)]
+    return [
+        make_space_document(rng, rng.choice(user_ids), base + timedelta(minutes=idx))
+        for idx in range(size)
+    ]
+
+
+async def seed_spaces(db, size: int, seed: int = 42, batch_size: int = 1000) -> List[Dict]:
+    await db.spaces.delete_many({})
+    documents = make_space_documents(size, seed)
+    for start in range(0, len(documents), batch_size):
+        await db.spaces.insert_many([dict(doc) for doc in documents[start:start + batch_size]])
+    return documents
+
+
+def make_image_bytes(rng: random.Random, size: int = 64 * 1024) -> bytes:
+    # PNG 시그니처 + 임의 데이터 (업로드 경로만 측정하므로 디코딩 가능할 필요는 없음)
+    return b"\x89PNG\r\n\x1a\n" + rng.randbytes(size)
@@ -6,17 +6,20 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from prometheus_fastapi_instrumentator import Instrumentator
-# from opentelemetry import trace
-# from opentelemetry.sdk.trace import TracerProvider
-# from opentelemetry.sdk.trace.export import BatchSpanProcessor
-# from opentelemetry.sdk.resources import Resource
-# from opentelemetry.semconv.resource import ResourceAttributes
-# from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 
+from routers.admin import admin_router
 from routers.space import space_router
+from services.aws_service import get_aws_service
+from services.facet_service import SpaceFacetService
+from services.geo_index_service import SpaceGeoIndex
+from services.idempotency_service import IdempotencyService
+from services.outbox import OutboxWorker
+from services.purge_worker import SpacePurgeWorker
 from utils import mongodb
 from utils.logger import Logger
 from utils.mongodb import MongoDB
+from utils.query_monitor import QueryMonitor
+from utils.tracing import setup_tracing
 
 
 @asynccontextmanager
@@ -25,36 +28,74 @@ async def lifespan(app: FastAPI):
     env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
     load_dotenv(env_type)
 
+    # OpenTelemetry (SPACE_TRACE_EXPORTER=otlp | file | none)
+    # .env 설정을 읽은 뒤에 설정, 이미 만들어진 FastAPIInstrumentor 의 tracer 도 이 provider 를 사용
+    setup_tracing("space-service")
+
     mongodb = await MongoDB.get_instance()
+    outbox = None
+    purge_worker = None
+    facet_service = None
+    geo_index = None
 
     try:
-        await mongodb.initialize()
+        db = await mongodb.initialize()
+        await IdempotencyService.initialize(db)
+
+        # 공간 변경 후속 작업(outbox) 워커
+        outbox = OutboxWorker.get_instance(db)
+        await outbox.initialize()
+
+        # 소프트 삭제된 공간 / 제외된 이미지 정리 작업
+        purge_worker = SpacePurgeWorker.get_instance(db, get_aws_service().get_s3_config())
+        purge_worker.register(outbox)
+        await purge_worker.initialize()
+
+        # 타입 × 시도별 공간 수 집계 (증감은 후속 작업, 주기적 재계산)
+        facet_service = SpaceFacetService.get_instance(db)
+        facet_service.register(outbox)
+        await facet_service.initialize()
+        facet_service.start()
+
+        outbox.start()
+
+        # 주변 공간 조회용 메모리 위치 인덱스 (SPACE_GEO_INDEX=true)
+        if SpaceGeoIndex.is_enabled():
+            geo_index = SpaceGeoIndex.get_instance(db)
+            await geo_index.rebuild()
+            geo_index.start()
+
+        query_monitor = QueryMonitor.get_instance()
+        if query_monitor:
+            query_monitor.start(db)
+
         yield
     finally:
+        if outbox:
+            await outbox.stop()
+        if purge_worker:
+            await purge_worker.stop()
+        if facet_service:
+            await facet_service.stop()
+        if geo_index:
+            await geo_index.stop()
+        if QueryMonitor.get_instance():
+            await QueryMonitor.get_instance().stop()
         await mongodb.close()
         MongoDB._instance = None
 
 app = FastAPI(title="공간 API", version="ver.1", lifespan=lifespan)
 
 app.include_router(space_router, prefix="/api/v1/spaces")
+app.include_router(admin_router, prefix="/api/v1/admin")
 
 @app.get("/health", status_code=status.HTTP_200_OK)
 async def health_check(logger: Logger = Depends(Logger.setup_logger)) -> dict:
     logger.info('health check')
     return {"status" : "ok"}
 
-# """Trace"""
-# # OpenTelemetry
-# resource = Resource.create({ResourceAttributes.SERVICE_NAME: "space-service"})
-# trace_provider = TracerProvider(resource=resource)
-
-# # 템포에 데이터 전송을 위한 OLTP span Exporter
-# tempo_exporter = OTLPSpanExporter(endpoint="http://localhost:4318/v1/traces")
-# span_processor = BatchSpanProcessor(tempo_exporter)
-# trace_provider.add_span_processor(span_processor) # Span 프로세서 추가
-
-# trace.set_tracer_provider(trace_provider)
-
+"""Trace"""
+# trace provider 는 lifespan 에서 설정 (setup_tracing)
 FastAPIInstrumentor.instrument_app(app, excluded_urls="client/.*/health")
 instrumentator = Instrumentator()
 instrumentator.instrument(app).expose(app) # 메트릭(/metrics) 노출
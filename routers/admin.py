@@ -0,0 +1,62 @@
+import hmac
+import os
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from routers.logging_router import LoggingAPIRoute
+from services.outbox import OutboxWorker
+from utils.mongodb import get_mongodb
+from utils.query_monitor import QueryMonitor
+
+
+admin_router = APIRouter(tags=["관리"], route_class=LoggingAPIRoute)
+
+
+def _verify_admin_token(admin_token: Optional[str]):
+    expected = os.getenv("SPACE_ADMIN_TOKEN")
+    # 토큰 비교 시간으로 값을 추측할 수 없도록 고정 시간 비교 (str 은 ASCII 만 허용하므로 bytes 로 비교)
+    if not expected or not hmac.compare_digest((admin_token or "").encode("UTF-8"), expected.encode("UTF-8")):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다.")
+
+
+# 쿼리 형태별 소요 시간 / explain 샘플 조회
+@admin_router.get("/query-stats", response_model=Dict, status_code=status.HTTP_200_OK, summary="MongoDB 쿼리 통계 조회")
+async def get_query_stats(admin_token: Optional[str] = Header(default=None, alias="X-Admin-Token")):
+    """ X-Admin-Token: {SPACE_ADMIN_TOKEN} """
+
+    _verify_admin_token(admin_token)
+
+    query_monitor = QueryMonitor.get_instance()
+    if not query_monitor:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="쿼리 모니터가 비활성화되어 있습니다. (SPACE_DB_QUERY_MONITOR=true)")
+
+    return query_monitor.snapshot()
+
+
+# 후속 작업(outbox) 종류별 대기/실행/중단 작업 수
+@admin_router.get("/outbox", response_model=Dict, status_code=status.HTTP_200_OK, summary="후속 작업 대기열 조회")
+async def get_outbox_stats(
+    admin_token: Optional[str] = Header(default=None, alias="X-Admin-Token"),
+    db: AsyncIOMotorDatabase = Depends(get_mongodb)
+):
+    """ X-Admin-Token: {SPACE_ADMIN_TOKEN} """
+
+    _verify_admin_token(admin_token)
+
+    return {"kinds": await OutboxWorker.backlog(db)}
+
+
+# 재시도를 중단한 후속 작업을 다시 대기열로
+@admin_router.post("/outbox/requeue", response_model=Dict, status_code=status.HTTP_200_OK, summary="중단된 후속 작업 재등록")
+async def requeue_outbox_dead_letters(
+    kind: Optional[str] = Query(default=None, description="작업 종류 (미지정 시 전체)"),
+    admin_token: Optional[str] = Header(default=None, alias="X-Admin-Token"),
+    db: AsyncIOMotorDatabase = Depends(get_mongodb)
+):
+    """ X-Admin-Token: {SPACE_ADMIN_TOKEN} """
+
+    _verify_admin_token(admin_token)
+
+    return {"requeued": await OutboxWorker.requeue_dead(db, kind)}
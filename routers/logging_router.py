@@ -1,3 +1,5 @@
+import os
+from contextlib import nullcontext
 from typing import Any, Callable, Dict
 
 from fastapi import UploadFile
@@ -5,25 +7,42 @@ from fastapi.routing import APIRoute
 from starlette.requests import Request
 from starlette.responses import Response
 
+from utils.admission import AdmissionController
+from utils.compression import compress_response
 from utils.logger import Logger
+from utils.metrics import stage
 
 
 class LoggingAPIRoute(APIRoute):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._logger = Logger.setup_logger() 
+        # @admission(...) 으로 지정된 엔드포인트만 동시 처리 수 제한
+        self._admission_kind = getattr(self.endpoint, "__admission_kind__", None)
 
     def get_route_handler(self) -> Callable:
         original_route_handler = super().get_route_handler()
 
         async def custom_route_handler(request: Request) -> Response:
-            await self._request_log(request)
-            response: Response = await original_route_handler(request)
-            self._response_log(request, response, self._logger)
+            # 업로드 요청은 multipart 파싱 전에 입장 여부를 결정
+            async with self._admit():
+                with stage(self.name, "request_log"):
+                    await self._request_log(request)
+                response: Response = await original_route_handler(request)
+            with stage(self.name, "response_log"):
+                self._response_log(request, response, self._logger)
+            # 로그는 원본 본문으로 남기고 전송 직전에 압축
+            with stage(self.name, "compress"):
+                response = compress_response(request, response, self.name)
             return response
 
         return custom_route_handler
 
+    def _admit(self):
+        if self._admission_kind is None or not AdmissionController.is_enabled():
+            return nullcontext()
+        return AdmissionController.get_instance().admit(self.name, self._admission_kind)
+
     @staticmethod
     def _has_json_body(request: Request) -> bool:
         if (
@@ -46,7 +65,8 @@ class LoggingAPIRoute(APIRoute):
             extra["body"] = request_body.decode("UTF-8")
             
         elif request.headers.get("content-type") and request.headers.get("content-type").startswith("multipart/form-data"):
-            form = await request.form()
+            with stage(self.name, "form_parse"):
+                form = await request.form()
             extra["body"] = {key: "파일" if isinstance(value, UploadFile) else value for key, value in form.items()}
 
 
@@ -54,12 +74,23 @@ class LoggingAPIRoute(APIRoute):
         self._logger.info(f"쿼리 파라미터: {extra['queryParams']}", extra=extra)
         self._logger.info(f"요청 데이터: {extra.get('body', '')}", extra=extra)
 
+    @staticmethod
+    def _body_preview(response: Response) -> str:
+        # 목록 응답 전체를 다시 디코딩하지 않도록 앞부분만 기록 (스트리밍 응답은 본문 없음)
+        body = getattr(response, "body", None)
+        if body is None:
+            return "<stream>"
+        max_bytes = int(os.getenv("SPACE_RESPONSE_LOG_MAX_BYTES", "2048"))
+        if len(body) <= max_bytes:
+            return body.decode("UTF-8", errors="replace")
+        return f"{body[:max_bytes].decode('UTF-8', errors='ignore')}... ({len(body)} bytes)"
+
     @staticmethod
     def _response_log(request: Request, response: Response, logger: Logger) -> Dict[str, str]:
         extra: Dict[str, str] = {
             "httpMethod": request.method,
             "url": request.url.path,
-            "body": response.body.decode("UTF-8")
+            "body": LoggingAPIRoute._body_preview(response)
         }
 		
         logger.info(f"응답 데이터: {extra['body']}", extra=extra)
\ No newline at end of file
@@ -1,75 +1,235 @@
 from datetime import datetime
 from typing import Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import Field
+from starlette.background import BackgroundTask
 from enums.space_type import SpaceType
 from routers.logging_router import LoggingAPIRoute
 from schemas.common import BaseResponse
 from schemas.payment import PaymentRequest
-from schemas.space_request import SpaceRequest, SpaceUpdateRequest, get_space_form, get_space_update_form
-from schemas.space_response import SpaceCreateResponse, SpaceListResponse, SpaceResponse
+from schemas.space_request import SpaceImportRecord, SpaceMetadataUpdateRequest, SpaceRequest, SpaceUpdateRequest, get_space_form, get_space_update_form
+from schemas.space_response import MySpacePageResponse, SpaceChangeResponse, SpaceCreateResponse, SpaceFacetResponse, SpaceListResponse, SpaceMapResponse, SpaceNearbyResponse, SpaceResponse
+from services.bulk_import_service import BulkImportService, get_bulk_import_service
+from services.change_feed_service import ChangeFeedService, get_change_feed_service
+from services.idempotency_service import IdempotencyService, get_idempotency_service
 from services.space_service import SpaceService, get_space_service
+from utils.admission import admission
 from utils.authenticate import userAuthenticate
+from utils.conditional import apply_validators, has_conditional_headers, is_not_modified, list_validators, not_modified_response, space_validators
+from utils.json_response import json_response_class
 
 
-space_router = APIRouter(tags=["공간"], route_class=LoggingAPIRoute)
+response_class = json_response_class()
+space_router = APIRouter(tags=["공간"], route_class=LoggingAPIRoute, default_response_class=response_class)
 
 
 # 위치 기준 데이터
-@space_router.get("/nearby", response_model=List[SpaceListResponse], status_code=status.HTTP_200_OK, summary="위치 기반 공간 목록 조회")
+@space_router.get("/nearby", response_model=List[SpaceNearbyResponse], status_code=status.HTTP_200_OK, summary="위치 기반 공간 목록 조회")
+@admission("geo")
 async def get_nearby_spaces(
     longitude: float = Query(description="경도"),
     latitude: float = Query(description="위도"),
     radius: float = Query(1.0, description="반경"),
+    limit: Optional[int] = Query(default=None, ge=1, le=500, description="가까운 순 최대 개수 (미지정 시 반경 내 전체)"),
+    space_type: Optional[SpaceType] = Query(default=None, description="공간 타입"),
+    max_price: Optional[int] = Query(default=None, ge=0, description="이용 단위별 최대 가격"),
     space_service: SpaceService = Depends(get_space_service)
 ):
-    nearby_spaces = await space_service.get_nearby_spaces(longitude, latitude, radius)
-    return nearby_spaces
+    nearby_spaces = await space_service.get_nearby_spaces(longitude, latitude, radius, limit, space_type, max_price)
+    # 레코드를 응답 본문으로 한 번만 변환 (response_model 은 문서화에만 사용)
+    return response_class(content=[space.to_payload() for space in nearby_spaces])
+
+
+# 지도 화면 (geohash 칸별 클러스터)
+@space_router.get("/map", response_model=SpaceMapResponse, status_code=status.HTTP_200_OK, summary="지도 영역 공간 클러스터 조회")
+@admission("geo")
+async def get_space_map(
+    bbox: str = Query(description="화면 영역 (최소 경도,최소 위도,최대 경도,최대 위도)"),
+    zoom: int = Query(ge=0, le=22, description="지도 줌 레벨"),
+    space_service: SpaceService = Depends(get_space_service)
+):
+    """ 줌 레벨에 맞는 geohash 칸별 공간 수 / 중심 / 최저가를 반환하고, 최대 확대 시에는 개별 공간을 반환합니다. """
+
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="bbox 형식이 올바르지 않습니다.")
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="bbox 범위가 올바르지 않습니다.")
+
+    space_map = await space_service.get_map(min_lon, min_lat, max_lon, max_lat, zoom)
+    return SpaceMapResponse(**space_map)
 
 
 # 공간 등록
 @space_router.post("", response_model=SpaceCreateResponse, status_code=status.HTTP_201_CREATED, summary="공간 등록")
+@admission("upload")
 async def create_space(
     space_data: SpaceRequest = Depends(get_space_form),
     token_info: Dict = Depends(userAuthenticate),
-    space_service: SpaceService = Depends(get_space_service)
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+    space_service: SpaceService = Depends(get_space_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ):
-    """ Authorization: Bearer {token} """
+    """ Authorization: Bearer {token}
+
+    Idempotency-Key 헤더를 보내면 같은 키로 재시도한 요청은 다시 등록하지 않고 처음 결과를 그대로 반환합니다.
+    """
 
     if token_info["user_id"] != space_data.user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="로그인을 다시 해주세요")
     
     if len(space_data.images) <= 0:
         HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"이미지를 등록해주세요")
-    
-    space_id = await space_service.create_space(space_data)
 
-    return SpaceCreateResponse(
-        message="공간이 등록되었습니다.", 
-        space_id= str(space_id)
+    async def register():
+        space_id = await space_service.create_space(space_data)
+        response = SpaceCreateResponse(message="공간이 등록되었습니다.", space_id=str(space_id))
+        return status.HTTP_201_CREATED, response.model_dump()
+
+    if idempotency_key is None:
+        _, body = await register()
+        return SpaceCreateResponse(**body)
+
+    # 같은 키의 재시도는 이미지 내용이 아닌 파일 이름/크기로 같은 요청인지 판단
+    fingerprint = IdempotencyService.fingerprint({
+        **space_data.model_dump(mode="json", exclude={"images", "created_at"}),
+        "images": [(image.filename, image.size) for image in space_data.images]
+    })
+    status_code, body, replayed = await idempotency_service.execute(space_data.user_id, idempotency_key, fingerprint, register)
+    if replayed:
+        return JSONResponse(status_code=status_code, content=body, headers={"Idempotent-Replayed": "true"})
+    return SpaceCreateResponse(**body)
+
+
+# 공간 일괄 등록 (NDJSON 스트리밍)
+@space_router.post(
+    "/bulk",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="공간 일괄 등록 (NDJSON)",
+    openapi_extra={"requestBody": {"required": True, "content": {"application/x-ndjson": {"schema": SpaceImportRecord.model_json_schema()}}}}
+)
+# admission 은 스트림 시작까지만 적용, 스트리밍 중 동시 처리 수는 SPACE_BULK_MAX_CONCURRENT_IMPORTS 로 제한
+@admission("upload")
+async def import_spaces(
+    request: Request,
+    token_info: Dict = Depends(userAuthenticate),
+    bulk_import_service: BulkImportService = Depends(get_bulk_import_service)
+):
+    """ Authorization: Bearer {token}
+
+    한 줄에 공간 하나(JSON)를 담은 NDJSON 본문을 받아 배치 단위로 등록합니다.
+    images 에는 내려받을 https 이미지 URL(SPACE_BULK_IMAGE_ALLOWED_HOSTS 의 호스트만 허용)을 지정하고, 결과는 레코드마다 한 줄씩(마지막 줄은 summary) NDJSON 으로 반환됩니다.
+    """
+
+    bulk_import_service.ensure_capacity()
+    return StreamingResponse(
+        bulk_import_service.import_spaces(token_info["user_id"], request.stream()),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(bulk_import_service.release_capacity)
     )
 
 
 # 공간 목록 조회
 @space_router.get("", response_model=List[SpaceListResponse], status_code=status.HTTP_200_OK, summary="공간 목록 조회")
+@admission("read")
 async def get_spaces(
+    request: Request,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
     space_type: Optional[SpaceType] = None,
     sido: Optional[str] = None,
     space_service: SpaceService = Depends(get_space_service)
 ):
+    # 목록 구성(공간 id, 버전)이 그대로면 본문 없이 304 응답 (목록은 If-None-Match 로만 확인)
+    if "if-none-match" in request.headers:
+        validators = await space_service.get_spaces_validators(skip, limit, space_type, sido)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
     spaces = await space_service.get_spaces(skip, limit, space_type, sido)
-    return [SpaceListResponse(**space) for space in spaces]
+    list_response = response_class(content=[space.to_payload() for space in spaces])
+    apply_validators(list_response, list_validators(space_service.spaces_list_key(skip, limit, space_type, sido), spaces))
+    return list_response
+
+
+# 변경 피드 (검색/추천 색인 증분 동기화)
+@space_router.get(
+    "/changes",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="공간 변경 피드 (NDJSON)",
+    responses={200: {"content": {"application/x-ndjson": {"schema": SpaceChangeResponse.model_json_schema()}}}}
+)
+# admission 은 스트림 시작(토큰 확인, change stream 열기)까지만 적용, 대기하는 요청 수는 SPACE_CHANGES_MAX_FOLLOWERS 로 제한
+@admission("read")
+async def get_space_changes(
+    since: Optional[str] = Query(default=None, description="이전 응답의 next_token (없으면 처음부터)"),
+    limit: int = Query(1000, ge=1, le=10000, description="최대 레코드 수"),
+    wait: float = Query(0, ge=0, le=30, description="새 변경이 없을 때 기다릴 최대 시간(초)"),
+    change_feed_service: ChangeFeedService = Depends(get_change_feed_service)
+):
+    """ since 토큰 이후 변경된 공간을 변경 순서대로 한 줄씩 반환합니다. (since 가 없으면 전체 공간 후 변경)
+
+    운영 중인 공간은 op=upsert(공간 정보 포함), 운영 중단/삭제된 공간은 op=delete 이며,
+    마지막 줄의 next_token 을 다음 요청의 since 로 전달하면 이어서 받을 수 있습니다. (has_more=true 면 바로 다시 요청)
+    토큰이 보관 범위를 벗어나면 410 (응답 도중이면 마지막 줄의 expired=true) 을 반환하므로 since 없이 처음부터 다시 동기화해야 합니다.
+    같은 공간이 여러 번 나올 수 있으므로 version 이 더 큰 경우만 반영하세요.
+    """
+
+    await change_feed_service.open(since, wait)
+    return StreamingResponse(
+        change_feed_service.stream_changes(limit),
+        media_type="application/x-ndjson",
+        # 스트림을 시작하기 전에 연결이 끊겨도 change stream 커서를 닫음
+        background=BackgroundTask(change_feed_service.close)
+    )
+
+
+# 타입 / 시도별 공간 수 (카테고리, 지역 탐색 화면)
+@space_router.get("/facets", response_model=SpaceFacetResponse, status_code=status.HTTP_200_OK, summary="타입 / 시도별 공간 수 조회")
+@admission("read")
+async def get_facets(
+    space_service: SpaceService = Depends(get_space_service)
+):
+    facets = await space_service.get_facets()
+    return SpaceFacetResponse(**facets)
+
+
+# 내 공간 목록 조회 (공급자 대시보드)
+@space_router.get("/mine", response_model=MySpacePageResponse, status_code=status.HTTP_200_OK, summary="내 공간 목록 조회")
+@admission("read")
+async def get_my_spaces(
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor"),
+    limit: int = Query(default=20, ge=1, le=100),
+    token_info: Dict = Depends(userAuthenticate),
+    space_service: SpaceService = Depends(get_space_service)
+):
+    """ Authorization: Bearer {token} """
+
+    spaces, next_cursor = await space_service.get_my_spaces(token_info["user_id"], cursor, limit)
+    return response_class(content={"spaces": [space.to_payload() for space in spaces], "next_cursor": next_cursor})
 
 
 # 특정 공간 조회
 @space_router.get("/{space_id}", response_model=SpaceResponse, status_code=status.HTTP_200_OK, summary="특정 공간 조회")
+@admission("read")
 async def get_space(
     space_id: str, 
+    request: Request,
+    response: Response,
     space_service: SpaceService = Depends(get_space_service)
 ):
+    # 버전 필드만 조회해서 변경이 없으면 본문 조회/가공 없이 304 응답
+    if has_conditional_headers(request):
+        validators = await space_service.get_space_validators(space_id)
+        if validators and is_not_modified(request, validators):
+            return not_modified_response(validators)
+
     space = await space_service.get_space(space_id)
+    apply_validators(response, space_validators(space))
 
     return SpaceResponse(
         message="공간이 조회되었습니다.", 
@@ -79,22 +239,39 @@ async def get_space(
 
 # 공간 수정 
 @space_router.put("/{space_id}", response_model=BaseResponse, status_code=status.HTTP_200_OK, summary="공간 수정")
+@admission("upload")
 async def update_spaces(
     space_id: str = Path(description="공간 고유번호"), 
     space_update_data: SpaceUpdateRequest = Depends(get_space_update_form), 
     token_info=Depends(userAuthenticate),
     space_service: SpaceService = Depends(get_space_service)
 ):
-    """ Authorization: Bearer {token} """
+    """ Authorization: Bearer {token}
 
-    if len(space_update_data.images) <= 0:
-        HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="이미지를 등록해주세요")
+    keep_images 로 유지할 기존 이미지 파일명을 지정하면 새 이미지(images)만 보내면 됩니다.
+    """
 
     await space_service.update_spaces(token_info["user_id"], space_id, space_update_data)
     return BaseResponse(message = "공간이 정상적으로 수정되었습니다.")
 
+
+# 공간 정보 수정 (이미지 제외, JSON)
+@space_router.patch("/{space_id}", response_model=BaseResponse, status_code=status.HTTP_200_OK, summary="공간 정보 수정")
+@admission("write")
+async def update_space_metadata(
+    space_update_data: SpaceMetadataUpdateRequest,
+    space_id: str = Path(description="공간 고유번호"),
+    token_info=Depends(userAuthenticate),
+    space_service: SpaceService = Depends(get_space_service)
+):
+    """ Authorization: Bearer {token} """
+
+    await space_service.update_space_metadata(token_info["user_id"], space_id, space_update_data)
+    return BaseResponse(message = "공간이 정상적으로 수정되었습니다.")
+
 # 공간 삭제
 @space_router.delete("/{space_id}", response_model=BaseResponse, status_code=status.HTTP_200_OK, summary="공간 삭제")
+@admission("write")
 async def delete_space(
     space_id: str, 
     token_info=Depends(userAuthenticate),
@@ -1,5 +1,5 @@
 import json
-from typing import Annotated, List, Set
+from typing import Annotated, List, Optional, Set
 from fastapi import Form, UploadFile
 from pydantic import Field, BaseModel
 from enums.space_type import SpaceType
@@ -76,7 +76,8 @@ class SpaceUpdateRequest(BaseModel):
     content: str = Field(description="내용")
     operating_hour: List[OperatingHour] = Field(description="운영 시간")
     is_operate: bool = Field(default=True, description="운영 여부")
-    images: List[UploadFile] = Field(description="공간 이미지")
+    images: List[UploadFile] = Field(default=[], description="새로 추가하거나 교체할 공간 이미지")
+    keep_images: Optional[List[str]] = Field(default=None, description="유지할 기존 이미지 파일명 (순서대로, 미지정 시 images 로 전체 교체)")
     
     class Config:
         json_encoders = {
@@ -93,7 +94,8 @@ async def get_space_update_form(
     description: Annotated[str, Form(description="한줄 소개")],
     content: Annotated[str, Form(description="내용")],
     operating_hour: Annotated[str, Form(description="운영 시간 (JSON)")],
-    images: Annotated[List[UploadFile], Form(description="공간 이미지")]
+    images: Annotated[Optional[List[UploadFile]], Form(description="새로 추가하거나 교체할 공간 이미지")] = None,
+    keep_images: Annotated[Optional[List[str]], Form(description="유지할 기존 이미지 파일명")] = None
 ) -> SpaceUpdateRequest:
     
     return SpaceUpdateRequest(
@@ -104,5 +106,25 @@ async def get_space_update_form(
         description=description,
         content=content,
         operating_hour=json.loads(operating_hour),
-        images=images
-    )
\ No newline at end of file
+        images=images or [],
+        keep_images=keep_images
+    )
+
+
+# 이미지 없이 정보만 수정 (JSON)
+class SpaceMetadataUpdateRequest(BaseModel):
+    capacity: Optional[int] = Field(default=None, description="수용 인원")
+    usage_unit: Optional[UsageType] = Field(default=None, description="이용 단위(DAY | TIME)")
+    unit_price: Optional[int] = Field(default=None, description="이용 단위별 가격")
+    amenities: Optional[List[str]] = Field(default=None, description="편의 시설")
+    description: Optional[str] = Field(default=None, description="한줄 소개")
+    content: Optional[str] = Field(default=None, description="내용")
+    operating_hour: Optional[List[OperatingHour]] = Field(default=None, description="운영 시간")
+    is_operate: Optional[bool] = Field(default=None, description="운영 여부")
+
+
+# 일괄 등록(NDJSON) 한 줄에 해당하는 공간 (이미지는 다운로드할 URL)
+class SpaceImportRecord(SpaceRequest):
+    user_id: Optional[str] = Field(default=None, description="공급자 ID (미지정 시 토큰의 사용자)")
+    images: List[str] = Field(min_length=1, description="공간 이미지 URL (https)")
+    external_id: Optional[str] = Field(default=None, description="요청자가 지정한 레코드 식별자 (결과 매칭용)")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 from pydantic import Field, BaseModel
 from enums.space_type import SpaceType
 from enums.usage_type import UsageType
@@ -21,7 +21,10 @@ class SpaceListResponse(BaseModel):
     unit_price: int = Field(description="이용 단위별 가격")
     amenities: List[str] = Field(description="편의 시설")
     location: Location
-    thumbnail: str = Field(description="썸네일 이미지")
+    thumbnail: Optional[str] = Field(default=None, description="썸네일 이미지")
+
+class SpaceNearbyResponse(SpaceListResponse):
+    distance: float = Field(description="기준 위치와의 거리(m)")
 
 class SpaceResponse(BaseResponse):
     space_id: str = Field(description="공간 고유번호")
@@ -40,3 +43,75 @@ class SpaceResponse(BaseResponse):
     is_operate: bool = Field(default=True, description="운영 여부")
     created_at: datetime = Field(default_factory=datetime.now, description="생성일")
     images: List[str] = Field(description="공간 이미지 목록")
+
+
+# 변경 피드의 공간 정보 (응답 메시지 제외)
+class SpaceChangeDetail(SpaceResponse):
+    message: Optional[str] = Field(default=None, exclude=True)
+
+# 변경 피드 레코드 (NDJSON 한 줄)
+class SpaceChangeResponse(BaseModel):
+    op: str = Field(description="upsert | delete (운영 중단/삭제된 공간은 delete)")
+    space_id: str = Field(description="공간 고유번호")
+    version: int = Field(description="문서 버전")
+    updated_at: datetime = Field(description="수정 시각")
+    token: str = Field(description="이 레코드 다음부터 이어 읽기 위한 토큰 (since 에 전달)")
+    space: Optional[SpaceChangeDetail] = Field(default=None, description="공간 정보 (upsert 일 때만)")
+
+
+class MySpaceListResponse(BaseModel):
+    space_id: str = Field(description="공간 고유번호")
+    space_type: SpaceType = Field(description="공간 타입(PlAYING | CAMP | ...)")
+    space_name: str = Field(description="공간 이름 (업체명)")
+    usage_unit: UsageType = Field(description="이용 단위(년, 월, 주, 일, 시)")
+    unit_price: int = Field(description="이용 단위별 가격")
+    is_operate: bool = Field(description="운영 여부")
+    created_at: datetime = Field(description="생성일")
+    thumbnail: Optional[str] = Field(default=None, description="썸네일 이미지")
+
+class MySpacePageResponse(BaseModel):
+    spaces: List[MySpaceListResponse] = Field(description="내 공간 목록")
+    next_cursor: Optional[str] = Field(default=None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+# 일괄 등록 결과 (레코드마다 한 줄씩 NDJSON 으로 전송)
+class SpaceImportResult(BaseModel):
+    line: int = Field(description="입력 파일의 줄 번호")
+    external_id: Optional[str] = Field(default=None, description="요청자가 지정한 레코드 식별자")
+    status: str = Field(description="created | invalid | failed")
+    space_id: Optional[str] = Field(default=None, description="등록된 공간 고유번호")
+    errors: List[str] = Field(default=[], description="실패 사유")
+
+class SpaceImportSummary(BaseModel):
+    total: int = Field(description="처리한 레코드 수")
+    created: int = Field(description="등록된 공간 수")
+    invalid: int = Field(description="검증 실패 레코드 수")
+    failed: int = Field(description="이미지/저장 실패 레코드 수")
+
+
+# 타입 / 시도별 운영 중인 공간 수
+class SpaceFacetResponse(BaseModel):
+    space_type: Dict[str, int] = Field(description="공간 타입별 공간 수")
+    sido: Dict[str, int] = Field(description="시도별 공간 수")
+    space_type_sido: Dict[str, Dict[str, int]] = Field(description="공간 타입 × 시도별 공간 수")
+    updated_at: Optional[datetime] = Field(default=None, description="집계 갱신 시각")
+
+
+# 지도 화면용 geohash 칸별 클러스터
+class SpaceMapCluster(BaseModel):
+    geohash: str = Field(description="geohash 칸")
+    count: int = Field(description="칸 안의 공간 수")
+    centroid: List[float] = Field(description="공간 좌표 평균 (경도, 위도 순서)")
+    min_price: Optional[int] = Field(default=None, description="칸 안의 최저 가격")
+
+class SpaceMapPoint(BaseModel):
+    space_id: str = Field(description="공간 고유번호")
+    space_name: str = Field(description="공간 이름 (업체명)")
+    unit_price: int = Field(description="이용 단위별 가격")
+    coordinates: List[float] = Field(description="경도, 위도 순서")
+    thumbnail: Optional[str] = Field(default=None, description="썸네일 이미지")
+
+class SpaceMapResponse(BaseModel):
+    precision: int = Field(description="클러스터 geohash 길이 (개별 공간 응답이면 저장 길이)")
+    clusters: List[SpaceMapCluster] = Field(default=[], description="geohash 칸별 클러스터")
+    spaces: List[SpaceMapPoint] = Field(default=[], description="최대 확대 시 개별 공간")
@@ -1,6 +1,7 @@
 import os
 import boto3
-from typing import Dict
+from botocore.config import Config
+from typing import Dict, Optional
 
 from utils.aws_ssm import ParameterStore
 from utils.credential import Credential
@@ -21,18 +22,24 @@ class AWSService:
         return cls._instance
     
     # 서비스별 client 생성
-    def create_client(self, service_name: str):
+    def create_client(self, service_name: str, config: Optional[Config] = None):
         return boto3.client(
             service_name,
             aws_access_key_id=self._credentials.access_key,
             aws_secret_access_key=self._credentials.secret_key,
-            region_name=self._credentials.region
+            region_name=self._credentials.region,
+            config=config
         )
 
-    # S3
+    # S3 (응답이 없는 호출이 요청 처리 자원을 계속 점유하지 않도록 timeout 지정)
     def get_s3_config(self) -> Dict:
+        s3_client_config = Config(
+            connect_timeout=float(os.getenv('SPACE_S3_CONNECT_TIMEOUT', '3')),
+            read_timeout=float(os.getenv('SPACE_S3_READ_TIMEOUT', '10')),
+            retries={"max_attempts": int(os.getenv('SPACE_S3_MAX_ATTEMPTS', '3')), "mode": "standard"}
+        )
         return {
-            "s3_client": self.create_client('s3'),
+            "s3_client": self.create_client('s3', s3_client_config),
             "bucket": os.getenv('SPACE_S3_BUCKET_NAME')
         }
     
@@ -0,0 +1,322 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from bson import ObjectId
+from fastapi import Depends, HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from schemas.space_request import SpaceImportRecord
+from schemas.space_response import SpaceImportResult, SpaceImportSummary
+from services.aws_service import AWSService, get_aws_service
+from services.facet_service import SpaceFacetService
+from services.geo_index_service import SpaceGeoIndex
+from services.purge_worker import SpacePurgeWorker
+from services.space_service import SpaceService
+from utils.logger import Logger
+from utils.metrics import record_documents, record_s3, stage
+from utils.mongodb import get_mongodb
+
+
+async def get_bulk_import_service(db: AsyncIOMotorDatabase = Depends(get_mongodb), aws_service: AWSService = Depends(get_aws_service)):
+    return BulkImportService(db, aws_service)
+
+
+class _ImageFailed(Exception):
+    pass
+
+
+class BulkImportService:
+    """NDJSON 스트림으로 받은 공간 레코드를 배치 단위로 등록
+
+    - 레코드는 한 줄씩 검증하고, 배치(SPACE_BULK_BATCH_SIZE)가 차면 이미지를 올린 뒤 insert_many 로 저장
+    - 이미지 다운로드/업로드는 프로세스 전체에서 SPACE_BULK_IMAGE_WORKERS 개로 제한
+    - 결과는 레코드마다 한 줄씩 바로 내보내므로 파일 크기와 상관없이 메모리는 배치 크기만큼만 사용
+    - 서버에서 이미지를 내려받으므로 SPACE_BULK_IMAGE_ALLOWED_HOSTS 에 지정한 호스트만 허용 (미설정 시 일괄 등록 거절)
+    """
+
+    _logger = Logger.setup_logger()
+    _operation = "bulk_import"
+
+    # Content-Type 기준 확장자 (SpaceService._ALLOWED_EXTENSIONS 와 동일한 형식만 허용)
+    _CONTENT_TYPE_EXTENSIONS = {
+        "image/png": ".png",
+        "image/jpeg": ".jpg",
+        "image/gif": ".gif",
+        "image/bmp": ".bmp"
+    }
+    _SPOOL_MAX_SIZE = 1024 * 1024
+    _DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+    # 동시에 진행 중인 일괄 등록 수 / 이미지 작업 제한 (이벤트 루프 단위)
+    _active_imports = 0
+    _image_slots: Optional[asyncio.Semaphore] = None
+
+    def __init__(self, db: AsyncIOMotorDatabase, aws_service: AWSService):
+        self.db = db
+        self.s3 = aws_service.get_s3_config()
+
+        self._batch_size = int(os.getenv("SPACE_BULK_BATCH_SIZE", "100"))
+        self._max_line_bytes = int(os.getenv("SPACE_BULK_MAX_LINE_BYTES", str(256 * 1024)))
+        self._max_images = int(os.getenv("SPACE_BULK_MAX_IMAGES", "10"))
+        self._max_image_bytes = int(os.getenv("SPACE_BULK_IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+        self._image_timeout = float(os.getenv("SPACE_BULK_IMAGE_TIMEOUT", "10"))
+        self._max_concurrent_imports = int(os.getenv("SPACE_BULK_MAX_CONCURRENT_IMPORTS", "2"))
+        allowed_hosts = os.getenv("SPACE_BULK_IMAGE_ALLOWED_HOSTS", "")
+        self._allowed_hosts = {host.strip().lower() for host in allowed_hosts.split(",") if host.strip()}
+        self._reserved = False
+
+        if BulkImportService._image_slots is None:
+            BulkImportService._image_slots = asyncio.Semaphore(int(os.getenv("SPACE_BULK_IMAGE_WORKERS", "8")))
+
+    def ensure_capacity(self):
+        # 스트리밍 응답이 시작되기 전에 거절하고 자리를 예약 (release_capacity 로 반납)
+        if not self._allowed_hosts:
+            self._logger.error("일괄 등록 이미지 호스트(SPACE_BULK_IMAGE_ALLOWED_HOSTS)가 설정되지 않았습니다.")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="일괄 등록을 사용할 수 없습니다.")
+        if BulkImportService._active_imports >= self._max_concurrent_imports:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="진행 중인 일괄 등록이 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "30"}
+            )
+        BulkImportService._active_imports += 1
+        self._reserved = True
+
+    # 스트림 종료(import_spaces) / 응답 종료(BackgroundTask) 중 먼저 호출된 쪽에서 한 번만 반납
+    # (스트림이 시작되기 전에 연결이 끊기면 제너레이터의 finally 가 실행되지 않음)
+    def release_capacity(self):
+        if self._reserved:
+            self._reserved = False
+            BulkImportService._active_imports -= 1
+
+    async def import_spaces(self, user_id: str, body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        summary = {"total": 0, "created": 0, "invalid": 0, "failed": 0}
+        try:
+            async with httpx.AsyncClient(timeout=self._image_timeout, follow_redirects=False) as http_client:
+                batch: List[Tuple[int, SpaceImportRecord]] = []
+                async for line_no, line in self._iter_lines(body):
+                    summary["total"] += 1
+                    if line is None:
+                        # 줄 구분이 깨진 입력은 이후 줄도 신뢰할 수 없으므로 중단
+                        summary["invalid"] += 1
+                        yield self._result_line(SpaceImportResult(line=line_no, status="invalid", errors=[f"한 줄은 {self._max_line_bytes} bytes 를 넘을 수 없습니다."]))
+                        break
+
+                    record, errors = self._parse_record(user_id, line)
+                    if record is None:
+                        summary["invalid"] += 1
+                        yield self._result_line(SpaceImportResult(line=line_no, status="invalid", errors=errors))
+                        continue
+
+                    batch.append((line_no, record))
+                    if len(batch) >= self._batch_size:
+                        for result in await self._flush(http_client, user_id, batch):
+                            summary[result.status] += 1
+                            yield self._result_line(result)
+                        batch = []
+
+                if batch:
+                    for result in await self._flush(http_client, user_id, batch):
+                        summary[result.status] += 1
+                        yield self._result_line(result)
+        finally:
+            self.release_capacity()
+            self._logger.info(f"공간 일괄 등록 완료({user_id}): {summary}")
+
+        yield json.dumps({"summary": SpaceImportSummary(**summary).model_dump()}, ensure_ascii=False) + "\n"
+
+    @staticmethod
+    def _result_line(result: SpaceImportResult) -> str:
+        return result.model_dump_json() + "\n"
+
+    async def _iter_lines(self, body: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+        # 요청 본문을 줄 단위로 분리 (한 줄 최대 크기만큼만 버퍼링, 초과 시 None 을 내보내고 종료)
+        buffer = b""
+        line_no = 0
+        async for chunk in body:
+            buffer += chunk
+            while True:
+                newline = buffer.find(b"\n")
+                if newline < 0:
+                    break
+                line, buffer = buffer[:newline], buffer[newline + 1:]
+                line_no += 1
+                if line.strip():
+                    yield line_no, line
+            if len(buffer) > self._max_line_bytes:
+                yield line_no + 1, None
+                return
+
+        if buffer.strip():
+            yield line_no + 1, buffer
+
+    def _parse_record(self, user_id: str, line: bytes) -> Tuple[Optional[SpaceImportRecord], List[str]]:
+        try:
+            record = SpaceImportRecord.model_validate_json(line)
+        except ValidationError as e:
+            return None, [f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()]
+
+        errors = []
+        if record.user_id is None:
+            record.user_id = user_id
+        elif record.user_id != user_id:
+            errors.append("user_id: 본인 공간만 등록할 수 있습니다.")
+
+        if len(record.images) > self._max_images:
+            errors.append(f"images: 이미지는 최대 {self._max_images}개까지 등록할 수 있습니다.")
+        for url in record.images:
+            error = self._check_image_url(url)
+            if error:
+                errors.append(f"images: {error}")
+
+        return (None, errors) if errors else (record, [])
+
+    def _check_image_url(self, url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        if parsed.scheme != "https" or not parsed.hostname:
+            return f"https URL 만 사용할 수 있습니다.({url})"
+        if parsed.hostname.lower() not in self._allowed_hosts:
+            return f"허용되지 않은 이미지 호스트입니다.({parsed.hostname})"
+        return None
+
+    async def _flush(self, http_client: httpx.AsyncClient, user_id: str, batch: List[Tuple[int, SpaceImportRecord]]) -> List[SpaceImportResult]:
+        # 공간 id 를 미리 만들어 이미지 경로에 사용하고, 이미지가 모두 올라간 레코드만 한 번에 저장
+        space_ids = [ObjectId() for _ in batch]
+        with stage(self._operation, "images", records=len(batch)):
+            uploads = await asyncio.gather(*(
+                self._upload_images(http_client, record, space_id) for (_, record), space_id in zip(batch, space_ids)
+            ))
+
+        results: List[Optional[SpaceImportResult]] = [None] * len(batch)
+        documents, positions = [], []
+        now = datetime.now()
+        for index, ((line_no, record), space_id, (image_entries, error)) in enumerate(zip(batch, space_ids, uploads)):
+            if error:
+                results[index] = SpaceImportResult(line=line_no, external_id=record.external_id, status="failed", errors=[error])
+                continue
+
+            document = record.model_dump(exclude={"images", "external_id", "created_at"})
+            document.update({
+                "_id": space_id,
+                "images": image_entries,
+                "created_at": now,
+                "updated_at": now,
+                "version": 1,
+                "geohash": SpaceService.geohash_of(document["location"])
+            })
+            documents.append(document)
+            positions.append(index)
+
+        failed_inserts: Dict[int, str] = {}
+        if documents:
+            with stage(self._operation, "db_insert"):
+                try:
+                    await self.db.spaces.insert_many(documents, ordered=False)
+                except BulkWriteError as e:
+                    failed_inserts = {error["index"]: error.get("errmsg", "저장 실패") for error in e.details.get("writeErrors", [])}
+                record_documents(self._operation, len(documents) - len(failed_inserts))
+
+        created = []
+        for document_index, (index, document) in enumerate(zip(positions, documents)):
+            line_no, record = batch[index]
+            if document_index in failed_inserts:
+                await self._discard_images(user_id, document["_id"], [f"{user_id}/{document['_id']}/{image['filename']}" for image in document["images"]])
+                results[index] = SpaceImportResult(line=line_no, external_id=record.external_id, status="failed", errors=[failed_inserts[document_index]])
+            else:
+                created.append(document)
+                results[index] = SpaceImportResult(line=line_no, external_id=record.external_id, status="created", space_id=str(document["_id"]))
+
+        with stage(self._operation, "enqueue"):
+            try:
+                await SpaceFacetService.apply_created(self.db, created)
+            except Exception as e:
+                # 이미 저장된 공간이므로 결과는 그대로 반환 (집계는 다음 재계산에서 보정)
+                self._logger.error(f"일괄 등록 집계 갱신 등록 실패: {e}")
+        SpaceGeoIndex.apply(created)
+        return results
+
+    async def _upload_images(self, http_client: httpx.AsyncClient, record: SpaceImportRecord, space_id: ObjectId) -> Tuple[List[Dict], Optional[str]]:
+        urls = list(dict.fromkeys(record.images))
+        outcomes = await asyncio.gather(
+            *(self._upload_image(http_client, url, f"{record.user_id}/{space_id}") for url in urls),
+            return_exceptions=True
+        )
+
+        entries, digests, uploaded_paths = [], set(), []
+        error = None
+        for url, outcome in zip(urls, outcomes):
+            if isinstance(outcome, BaseException):
+                error = error or (str(outcome) if isinstance(outcome, _ImageFailed) else f"이미지 처리 중 오류가 발생했습니다.({url})")
+                if not isinstance(outcome, _ImageFailed):
+                    self._logger.error(f"일괄 등록 이미지 처리 실패: {url} {outcome}")
+                continue
+            uploaded_paths.append(f"{record.user_id}/{space_id}/{outcome['filename']}")
+            # 같은 내용의 이미지는 한 번만 등록 (경로가 내용 해시이므로 업로드도 한 번만 남음)
+            if outcome["sha256"] not in digests:
+                digests.add(outcome["sha256"])
+                entries.append(outcome)
+
+        if error:
+            await self._discard_images(record.user_id, space_id, list(dict.fromkeys(uploaded_paths)))
+            return [], error
+        return entries, None
+
+    async def _upload_image(self, http_client: httpx.AsyncClient, url: str, prefix: str) -> Dict:
+        async with BulkImportService._image_slots:
+            with tempfile.SpooledTemporaryFile(max_size=self._SPOOL_MAX_SIZE) as spool:
+                digest = hashlib.sha256()
+                size = 0
+                with stage(self._operation, "image_download"):
+                    async with http_client.stream("GET", url) as response:
+                        if response.status_code != 200:
+                            raise _ImageFailed(f"이미지를 내려받을 수 없습니다.({url}, {response.status_code})")
+                        content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                        extension = self._CONTENT_TYPE_EXTENSIONS.get(content_type)
+                        if extension is None:
+                            raise _ImageFailed(f"지원하지 않는 이미지 형식입니다.({url}, {content_type})")
+
+                        async for chunk in response.aiter_bytes(self._DOWNLOAD_CHUNK_SIZE):
+                            size += len(chunk)
+                            if size > self._max_image_bytes:
+                                raise _ImageFailed(f"이미지 크기가 너무 큽니다.({url})")
+                            digest.update(chunk)
+                            spool.write(chunk)
+
+                sha256 = digest.hexdigest()
+                filename = f"{sha256}{extension}"
+                spool.seek(0)
+                with stage(self._operation, "s3_upload"):
+                    await asyncio.to_thread(
+                        self.s3["s3_client"].upload_fileobj,
+                        spool,
+                        self.s3["bucket"],
+                        f"{prefix}/{filename}",
+                        ExtraArgs={"ACL": "public-read", "ContentType": content_type}
+                    )
+                    record_s3(self._operation, "upload", size)
+
+        return {
+            "filename": filename,
+            "original_filename": os.path.basename(urlparse(url).path) or filename,
+            "sha256": sha256,
+            "size": size
+        }
+
+    # 저장되지 않은 공간의 업로드 이미지는 후속 작업으로 삭제
+    async def _discard_images(self, user_id: str, space_id: ObjectId, paths: List[str]):
+        if not paths:
+            return
+        try:
+            await SpacePurgeWorker.enqueue_images(self.db, str(space_id), user_id, paths)
+        except Exception as e:
+            # 남은 객체는 이미지 정리 작업(image_reconciler)에서 정리됨
+            self._logger.error(f"일괄 등록 중 업로드된 이미지 정리 등록 실패: {paths} {e}")
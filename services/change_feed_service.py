@@ -0,0 +1,313 @@
+import asyncio
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import Depends, HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from prometheus_client import Counter, Gauge
+from pydantic import ValidationError
+from pymongo.errors import OperationFailure
+
+from schemas.space_response import SpaceChangeResponse
+from services.aws_service import AWSService, get_aws_service
+from services.space_service import SpaceService
+from utils.cursor import decode_cursor, encode_cursor
+from utils.logger import Logger
+from utils.metrics import record_documents, stage
+from utils.mongodb import get_mongodb
+
+
+CHANGE_FEED_RECORDS_TOTAL = Counter("space_change_feed_records_total", "변경 피드로 전송한 레코드 수", ["op"])
+CHANGE_FEED_FOLLOWERS = Gauge("space_change_feed_followers", "변경을 기다리는(wait > 0) 변경 피드 요청 수")
+
+
+async def get_change_feed_service(db: AsyncIOMotorDatabase = Depends(get_mongodb), aws_service: AWSService = Depends(get_aws_service)):
+    return ChangeFeedService(db, aws_service)
+
+
+class ChangeFeedService:
+    """공간 변경 피드 (요청마다 open → stream_changes → close)
+
+    레플리카셋 / 샤드 클러스터 (change stream 사용)
+    - 토큰은 change stream resume token 이므로 커밋 순서대로 빠짐없이 이어 받음 (인스턴스 시계, 복제 지연과 무관)
+    - since 없이 시작하면 현재 위치를 먼저 기록하고 전체 공간을 _id 순서로 내보낸 뒤 그 위치부터 change stream 으로 이어감
+      (전체 조회 중에 바뀐 공간은 한 번 더 나올 수 있으므로 version 으로 확인)
+    - oplog 보관 범위를 벗어난 토큰은 410, 응답 도중에 벗어나면 마지막 줄의 expired=true (처음부터 다시 동기화)
+    단일 서버 (change stream 사용 불가)
+    - (updated_at, _id) 순서로 프라이머리에서 조회하며, updated_at 은 각 인스턴스가 기록한 시각이므로
+      SPACE_CHANGES_SETTLE_SECONDS 보다 최근에 수정된 문서는 다음 조회로 미룸 (인스턴스 간 시계 차이는 settle 안이어야 함)
+    운영 중인 공간은 upsert, 운영 중단/삭제된 공간은 delete 로 내보냄
+    (삭제된 공간은 purge 후에도 SPACE_TOMBSTONE_RETENTION_DAYS 동안 삭제 표시가 남음)
+    """
+
+    _logger = Logger.setup_logger()
+    _operation = "change_feed"
+
+    _PROJECTION = {"geohash": 0, "purged_at": 0}
+    _CHANGE_PIPELINE = [
+        {"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+        {"$project": {"fullDocument.geohash": 0, "fullDocument.purged_at": 0}}
+    ]
+    _STREAM_TOKEN_PREFIX = "cs."
+    # oplog 보관 범위를 벗어났거나 사용할 수 없는 resume token (InvalidResumeToken, ChangeStreamFatalError, ChangeStreamHistoryLost)
+    _EXPIRED_CODES = {260, 280, 286}
+
+    # 변경을 기다리는 요청 수 (요청마다 change stream 커서를 하나씩 사용)
+    _followers = 0
+    # 레플리카셋이 아니면 change stream 을 쓸 수 없으므로 한 번 실패하면 (updated_at, _id) 조회만 사용
+    _change_stream_available = True
+
+    def __init__(self, db: AsyncIOMotorDatabase, aws_service: AWSService):
+        self.db = db
+        self.space_service = SpaceService(db, aws_service)
+
+        self._batch_size = int(os.getenv("SPACE_CHANGES_BATCH_SIZE", "200"))
+        self._settle = timedelta(seconds=float(os.getenv("SPACE_CHANGES_SETTLE_SECONDS", "5")))
+        self._poll_interval = float(os.getenv("SPACE_CHANGES_POLL_INTERVAL", "2"))
+        self._max_followers = int(os.getenv("SPACE_CHANGES_MAX_FOLLOWERS", "16"))
+        self._retention = timedelta(days=int(os.getenv("SPACE_TOMBSTONE_RETENTION_DAYS", "30")))
+        self._use_change_stream = os.getenv("SPACE_CHANGES_STREAM", "true").lower() == "true"
+
+        self._wait = 0.0
+        self._follow = False
+        self._change_stream = None
+        self._pending: Optional[Dict] = None
+        # change stream: 이어 받을 resume token / 전체 조회 중이면 마지막으로 보낸 _id
+        self._resume_token: Optional[Dict] = None
+        self._scanning = False
+        self._scan_after: Optional[ObjectId] = None
+        # 단일 서버: 마지막으로 보낸 (updated_at, _id)
+        self._position: Optional[Tuple[datetime, ObjectId]] = None
+
+    async def open(self, since: Optional[str], wait: float):
+        """스트리밍 응답이 시작되기 전에 토큰을 확인하고 change stream 을 염 (잘못된 토큰 400, 만료된 토큰 410)"""
+        self._wait = wait
+        self._follow = wait > 0 and ChangeFeedService._followers < self._max_followers
+        if self._follow:
+            ChangeFeedService._followers += 1
+            CHANGE_FEED_FOLLOWERS.set(ChangeFeedService._followers)
+
+        try:
+            stream_token = since is None or since.startswith(self._STREAM_TOKEN_PREFIX)
+            if self._use_change_stream and ChangeFeedService._change_stream_available:
+                if not stream_token:
+                    raise self._gone("토큰 형식이 현재 저장소와 맞지 않습니다. since 없이 처음부터 다시 동기화해주세요.")
+                if since is None:
+                    self._scanning = True
+                else:
+                    self._resume_token, self._scan_after, self._scanning = self._decode_stream_token(since)
+                if await self._open_change_stream():
+                    return
+                if since is not None:
+                    raise self._gone("토큰 형식이 현재 저장소와 맞지 않습니다. since 없이 처음부터 다시 동기화해주세요.")
+            elif since is not None and stream_token:
+                raise self._gone("토큰 형식이 현재 저장소와 맞지 않습니다. since 없이 처음부터 다시 동기화해주세요.")
+
+            self._position = self.resume_position(since)
+        except BaseException:
+            await self.close()
+            raise
+
+    # 스트림이 끝나거나(stream_changes) 응답이 끝날 때(BackgroundTask) 호출, 여러 번 호출해도 한 번만 정리
+    async def close(self):
+        if self._change_stream is not None:
+            change_stream, self._change_stream = self._change_stream, None
+            await change_stream.close()
+        if self._follow:
+            self._follow = False
+            ChangeFeedService._followers -= 1
+            CHANGE_FEED_FOLLOWERS.set(ChangeFeedService._followers)
+
+    @staticmethod
+    def _gone(detail: str) -> HTTPException:
+        return HTTPException(status_code=status.HTTP_410_GONE, detail=detail)
+
+    async def _open_change_stream(self) -> bool:
+        options = {
+            "full_document": "updateLookup",
+            "batch_size": self._batch_size,
+            # 기다리지 않는 요청은 빈 getMore 를 짧게
+            "max_await_time_ms": 1000 if self._follow else 100
+        }
+        if self._resume_token:
+            options["start_after"] = self._resume_token
+
+        change_stream = self.db.spaces.watch(self._CHANGE_PIPELINE, **options)
+        try:
+            change = await change_stream.try_next()
+        except OperationFailure as e:
+            await change_stream.close()
+            if e.code in self._EXPIRED_CODES:
+                raise self._gone("토큰이 보관 범위를 벗어났습니다. since 없이 처음부터 다시 동기화해주세요.")
+            ChangeFeedService._change_stream_available = False
+            self._logger.warning(f"change stream 을 사용할 수 없어 (updated_at, _id) 조회로 전환합니다: {e}")
+            return False
+
+        self._change_stream = change_stream
+        if self._resume_token is None:
+            # 처음 동기화: 지금 위치부터 이어 받음 (방금 받은 변경은 이후 전체 조회에 반영되어 있음)
+            self._resume_token = change_stream.resume_token
+        else:
+            self._pending = change
+        return True
+
+    def resume_position(self, since: Optional[str]) -> Optional[Tuple[datetime, ObjectId]]:
+        if not since:
+            return None
+        position = decode_cursor(since)
+        if position[0] < datetime.now() - self._retention:
+            # 보관 기간이 지나 삭제 표시가 사라졌을 수 있으므로 처음부터 다시 동기화해야 함
+            raise self._gone("토큰이 보관 기간을 지났습니다. since 없이 처음부터 다시 동기화해주세요.")
+        return position
+
+    def _stream_token(self) -> str:
+        data = {"r": self._resume_token, "s": self._scanning, "a": str(self._scan_after) if self._scan_after else None}
+        raw = json.dumps(data, separators=(",", ":")).encode("UTF-8")
+        return self._STREAM_TOKEN_PREFIX + base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def _decode_stream_token(self, token: str) -> Tuple[Dict, Optional[ObjectId], bool]:
+        try:
+            encoded = token[len(self._STREAM_TOKEN_PREFIX):]
+            data = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+            return data["r"], ObjectId(data["a"]) if data.get("a") else None, bool(data.get("s"))
+        except (ValueError, KeyError, TypeError, InvalidId, UnicodeDecodeError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="유효하지 않은 토큰입니다.")
+
+    def _next_token(self) -> Optional[str]:
+        if self._change_stream is not None or self._resume_token is not None:
+            return self._stream_token()
+        return encode_cursor(*self._position) if self._position else None
+
+    async def stream_changes(self, limit: int) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait
+        streaming = self._change_stream is not None
+        expired = False
+        sent = 0
+        try:
+            while sent < limit:
+                requested = min(self._batch_size, limit - sent)
+                if streaming and self._scanning:
+                    lines, count = await self._scan_batch(requested)
+                elif streaming:
+                    lines, count = await self._stream_batch(requested)
+                else:
+                    lines, count = await self._poll_batch(requested)
+                for line in lines:
+                    yield line
+                sent += count
+
+                if count == requested or (streaming and self._scanning):
+                    continue
+                if not self._follow or loop.time() >= deadline:
+                    break
+                if not streaming:
+                    await asyncio.sleep(max(0.0, min(self._poll_interval, deadline - loop.time())))
+
+        except OperationFailure as e:
+            if not streaming or e.code not in self._EXPIRED_CODES:
+                raise
+            expired = True
+            self._logger.warning(f"변경 피드 토큰이 보관 범위를 벗어남: {e}")
+        finally:
+            await self.close()
+
+        if expired:
+            yield json.dumps({"next_token": None, "has_more": False, "expired": True}) + "\n"
+        else:
+            yield json.dumps({"next_token": self._next_token(), "has_more": sent >= limit}) + "\n"
+
+    # 처음 동기화: 전체 공간을 _id 순서로 (끝나면 기록해 둔 위치부터 change stream)
+    async def _scan_batch(self, limit: int) -> Tuple[List[str], int]:
+        query = {"_id": {"$gt": self._scan_after}} if self._scan_after else {}
+        with stage(self._operation, "db_query"):
+            cursor = self.db.spaces.find(query, self._PROJECTION).sort("_id", 1).limit(limit)
+            spaces = await cursor.to_list(length=limit)
+            record_documents(self._operation, len(spaces))
+
+        lines = []
+        for space in spaces:
+            self._scan_after = space["_id"]
+            line = self._change_line(space, self._stream_token())
+            if line:
+                lines.append(line)
+        if len(spaces) < limit:
+            self._scanning, self._scan_after = False, None
+        return lines, len(spaces)
+
+    # 새 변경이 없으면 max_await_time_ms 동안 기다린 뒤 빈 결과 (resume token 은 확인한 위치까지 진행)
+    async def _stream_batch(self, limit: int) -> Tuple[List[str], int]:
+        lines, count = [], 0
+        while count < limit:
+            change, self._pending = self._pending, None
+            if change is None:
+                change = await self._change_stream.try_next()
+            if change is None:
+                self._resume_token = self._change_stream.resume_token
+                break
+            count += 1
+            self._resume_token = change["_id"]
+            line = self._change_event_line(change)
+            if line:
+                lines.append(line)
+        return lines, count
+
+    async def _poll_batch(self, limit: int) -> Tuple[List[str], int]:
+        spaces = await self._read_batch(self._position, limit)
+        lines = []
+        for space in spaces:
+            self._position = (space["updated_at"], space["_id"])
+            line = self._change_line(space, encode_cursor(*self._position))
+            if line:
+                lines.append(line)
+        return lines, len(spaces)
+
+    async def _read_batch(self, position: Optional[Tuple[datetime, ObjectId]], limit: int) -> List[Dict]:
+        query: Dict = {"updated_at": {"$lte": datetime.now() - self._settle}}
+        if position:
+            updated_at, last_id = position
+            query["updated_at"]["$gte"] = updated_at
+            query["$or"] = [
+                {"updated_at": {"$gt": updated_at}},
+                {"updated_at": updated_at, "_id": {"$gt": last_id}}
+            ]
+
+        with stage(self._operation, "db_query"):
+            cursor = self.db.spaces.find(query, self._PROJECTION).sort([("updated_at", 1), ("_id", 1)]).limit(limit)
+            spaces = await cursor.to_list(length=limit)
+            record_documents(self._operation, len(spaces))
+        return spaces
+
+    def _change_event_line(self, change: Dict) -> Optional[str]:
+        space = change.get("fullDocument")
+        if space is None:
+            # 삭제되었거나 조회 시점에 이미 사라진 문서
+            removed_at = change.get("wallTime") or datetime.now()
+            space = {"_id": change["documentKey"]["_id"], "deleted_at": removed_at, "updated_at": removed_at}
+        return self._change_line(space, self._stream_token())
+
+    def _change_line(self, space: Dict, token: str) -> Optional[str]:
+        removed = bool(space.get("deleted_at")) or not space.get("is_operate")
+        change = {
+            "op": "delete" if removed else "upsert",
+            "space_id": str(space["_id"]),
+            "version": space.get("version", 0),
+            "updated_at": space.get("updated_at") or space.get("created_at"),
+            "token": token
+        }
+        try:
+            with stage(self._operation, "shaping"):
+                if not removed:
+                    change["space"] = self.space_service.shape_space(space)
+                line = SpaceChangeResponse(**change).model_dump_json() + "\n"
+        except ValidationError as e:
+            # 응답 형식에 맞지 않는 문서는 건너뜀 (토큰은 다음 문서로 진행)
+            self._logger.error(f"변경 피드 레코드 변환 실패: {change['space_id']} {e}")
+            return None
+        CHANGE_FEED_RECORDS_TOTAL.labels(op=change["op"]).inc()
+        return line
@@ -0,0 +1,238 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from prometheus_client import Counter
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from services.outbox import OutboxWorker
+from utils.logger import Logger
+
+
+FACET_DRIFT_TOTAL = Counter("space_facet_drift_total", "재계산 시 보정된 공간 수 차이(절대값 합)")
+
+
+class SpaceFacetService:
+    """공간 타입 × 시도별 운영 중인 공간 수를 문서 하나(space_facets)로 유지
+
+    - 등록/수정/삭제 시 변경된 (타입, 시도) 칸의 증감을 후속 작업(facet_increment)으로 등록하고 워커가 $inc 로 갱신
+      (증감마다 increment_id 를 두고 반영한 id 를 문서의 applied 에 남겨 재시도/임대 만료로 다시 실행되어도 한 번만 반영)
+    - SPACE_FACETS_RECOMPUTE_INTERVAL 마다 전체 집계와 (현재 집계 문서 + 반영 대기 중인 증감)의 차이를 $inc 로 보정
+      보정도 $inc 이므로 재계산 중에 반영되는 증감과 겹쳐도 덮어쓰지 않는다.
+    조회는 문서 하나만 읽으면 된다.
+
+    레플리카셋에서는 집계 문서 / 대기 작업 / 공간 집계를 같은 시점(snapshot 세션)에서 읽어 정확히 보정하며,
+    전체 집계는 snapshot 보관 시간(minSnapshotHistoryWindowInSeconds, 기본 300초) 안에 끝나야 한다.
+    (snapshot 을 쓸 수 없는 환경은 세 조회 사이에 반영된 변경만큼 차이가 다음 재계산까지 남을 수 있음)
+    """
+
+    _instance: Optional['SpaceFacetService'] = None
+
+    _COLLECTION = "space_facets"
+    _DOCUMENT_ID = "space_type_sido"
+
+    # snapshot 세션 사용 여부 (MongoDB 5.0 이상 레플리카셋, 실패하면 일반 조회로 전환)
+    _snapshot_reads = True
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._logger = Logger.setup_logger()
+        self._recompute_interval = float(os.getenv("SPACE_FACETS_RECOMPUTE_INTERVAL", "3600"))
+        self._recompute_retry = float(os.getenv("SPACE_FACETS_RECOMPUTE_RETRY", "30"))
+        # 중복 반영 확인용으로 남겨 둘 최근 increment_id 수
+        self._applied_window = int(os.getenv("SPACE_FACETS_APPLIED_WINDOW", "5000"))
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls, db: AsyncIOMotorDatabase) -> 'SpaceFacetService':
+        if cls._instance is None:
+            cls._instance = SpaceFacetService(db)
+        return cls._instance
+
+    async def initialize(self):
+        # 집계 문서가 없으면(최초 배포) 바로 계산
+        if not await self.db[self._COLLECTION].find_one({"_id": self._DOCUMENT_ID}, {"_id": 1}):
+            await self.recompute()
+
+    def register(self, outbox: OutboxWorker):
+        outbox.register("facet_increment", self._apply_increments)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        SpaceFacetService._instance = None
+
+    async def _run(self):
+        failures = 0
+        while True:
+            # 실패하면 SPACE_FACETS_RECOMPUTE_RETRY 부터 두 배씩 (최대 재계산 주기) 후 다시 시도
+            delay = min(self._recompute_retry * 2 ** (failures - 1), self._recompute_interval) if failures else self._recompute_interval
+            await asyncio.sleep(delay)
+            try:
+                await self.recompute()
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                self._logger.error(f"공간 집계 재계산 실패({failures}회): {e}")
+
+    # 전체 집계와의 차이를 보정하고 보정한 공간 수(절대값 합)를 반환
+    async def recompute(self) -> int:
+        if SpaceFacetService._snapshot_reads and await OutboxWorker.supports_transactions(self.db):
+            try:
+                async with await self.db.client.start_session(snapshot=True) as session:
+                    return await self._correct(session)
+            except OperationFailure as e:
+                SpaceFacetService._snapshot_reads = False
+                self._logger.warning(f"snapshot 조회를 사용할 수 없어 일반 조회로 재계산합니다: {e}")
+        return await self._correct(None)
+
+    async def _correct(self, session: Optional[AsyncIOMotorClientSession]) -> int:
+        document = await self.db[self._COLLECTION].find_one({"_id": self._DOCUMENT_ID}, {"counts": 1, "applied": 1}, session=session) or {}
+        applied = set(document.get("applied", []))
+
+        # 현재 집계 문서에 아직 반영되지 않은 증감까지 더한 값이 (같은 시점의) 전체 집계와 같아야 함
+        expected: Dict[str, Dict[str, int]] = {space_type: dict(sidos) for space_type, sidos in document.get("counts", {}).items()}
+        jobs = self.db[OutboxWorker._COLLECTION].find({"kind": "facet_increment"}, {"payload": 1}, session=session)
+        async for job in jobs:
+            payload = job["payload"]
+            if payload.get("increment_id") in applied:
+                # 반영 후 작업 삭제 전
+                continue
+            for space_type, sido, value in payload["increments"]:
+                expected.setdefault(space_type, {})[sido] = expected.get(space_type, {}).get(sido, 0) + value
+
+        pipeline = [
+            {"$match": {"is_operate": True, "deleted_at": None}},
+            {"$group": {"_id": {"space_type": "$space_type", "sido": "$location.sido"}, "count": {"$sum": 1}}}
+        ]
+        counts: Dict[str, Dict[str, int]] = {}
+        async for row in self.db.spaces.aggregate(pipeline, session=session):
+            space_type, sido = row["_id"].get("space_type"), row["_id"].get("sido")
+            if space_type and sido:
+                counts.setdefault(space_type, {})[sido] = row["count"]
+
+        corrections = self._corrections(expected, counts)
+        now = datetime.now()
+        update = {"$set": {"recomputed_at": now, "updated_at": now}}
+        if corrections:
+            update["$inc"] = {f"counts.{space_type}.{sido}": value for (space_type, sido), value in corrections.items()}
+        await self.db[self._COLLECTION].update_one({"_id": self._DOCUMENT_ID}, update, upsert=True)
+
+        drift = sum(abs(value) for value in corrections.values())
+        if drift and document:
+            FACET_DRIFT_TOTAL.inc(drift)
+            self._logger.warning(f"공간 집계 보정: 차이 {drift}")
+        return drift
+
+    @staticmethod
+    def _corrections(before: Dict[str, Dict[str, int]], after: Dict[str, Dict[str, int]]) -> Dict[Tuple[str, str], int]:
+        keys = {(space_type, sido) for counts in (before, after) for space_type, sidos in counts.items() for sido in sidos}
+        differences = {
+            (space_type, sido): after.get(space_type, {}).get(sido, 0) - before.get(space_type, {}).get(sido, 0) for space_type, sido in keys
+        }
+        return {key: value for key, value in differences.items() if value}
+
+    @staticmethod
+    def _facet_key(space: Optional[Dict]) -> Optional[Tuple[str, str]]:
+        # 목록 조회 대상(운영 중, 삭제되지 않음)인 공간만 집계
+        if not space or not space.get("is_operate") or space.get("deleted_at"):
+            return None
+        space_type = space.get("space_type")
+        sido = (space.get("location") or {}).get("sido")
+        if not space_type or not sido:
+            return None
+        return str(getattr(space_type, "value", space_type)), sido
+
+    # 변경 전/후 문서로 증감 등록 (session 이 있으면 문서 쓰기와 같은 트랜잭션)
+    @classmethod
+    async def apply_change(
+        cls,
+        db: AsyncIOMotorDatabase,
+        before: Optional[Dict],
+        after: Optional[Dict],
+        session: Optional[AsyncIOMotorClientSession] = None
+    ):
+        before_key, after_key = cls._facet_key(before), cls._facet_key(after)
+        if before_key == after_key:
+            return
+
+        increments: Dict[Tuple[str, str], int] = {}
+        if before_key:
+            increments[before_key] = increments.get(before_key, 0) - 1
+        if after_key:
+            increments[after_key] = increments.get(after_key, 0) + 1
+        await cls._enqueue(db, increments, session)
+
+    @classmethod
+    async def apply_created(
+        cls,
+        db: AsyncIOMotorDatabase,
+        spaces: Iterable[Dict],
+        session: Optional[AsyncIOMotorClientSession] = None
+    ):
+        increments: Dict[Tuple[str, str], int] = {}
+        for space in spaces:
+            key = cls._facet_key(space)
+            if key:
+                increments[key] = increments.get(key, 0) + 1
+        await cls._enqueue(db, increments, session)
+
+    @classmethod
+    async def _enqueue(cls, db: AsyncIOMotorDatabase, increments: Dict[Tuple[str, str], int], session: Optional[AsyncIOMotorClientSession]):
+        increments = [[space_type, sido, value] for (space_type, sido), value in increments.items() if value]
+        if increments:
+            payload = {"increments": increments, "increment_id": str(ObjectId())}
+            await OutboxWorker.enqueue(db, "facet_increment", payload, session=session)
+
+    # 실패/임대 만료 시 OutboxWorker 가 다시 실행하므로 applied 에 없는 increment_id 만 반영
+    async def _apply_increments(self, payload: Dict):
+        query = {"_id": self._DOCUMENT_ID}
+        update = {
+            "$inc": {f"counts.{space_type}.{sido}": value for space_type, sido, value in payload["increments"]},
+            "$set": {"updated_at": datetime.now()}
+        }
+        increment_id = payload.get("increment_id")
+        if increment_id:
+            query["applied"] = {"$ne": increment_id}
+            update["$push"] = {"applied": {"$each": [increment_id], "$slice": -self._applied_window}}
+        try:
+            await self.db[self._COLLECTION].update_one(query, update, upsert=True)
+        except DuplicateKeyError:
+            # 이미 반영된 증감 (문서가 있어 upsert 가 같은 _id 로 삽입하려다 실패)
+            pass
+
+    @classmethod
+    async def get_counts(cls, db: AsyncIOMotorDatabase) -> Dict:
+        document = await db[cls._COLLECTION].find_one({"_id": cls._DOCUMENT_ID}, {"applied": 0}) or {}
+
+        space_type_sido: Dict[str, Dict[str, int]] = {}
+        space_types: Dict[str, int] = {}
+        sidos: Dict[str, int] = {}
+        for space_type, counts in document.get("counts", {}).items():
+            for sido, count in counts.items():
+                if count <= 0:
+                    continue
+                space_type_sido.setdefault(space_type, {})[sido] = count
+                space_types[space_type] = space_types.get(space_type, 0) + count
+                sidos[sido] = sidos.get(sido, 0) + count
+
+        return {
+            "space_type": space_types,
+            "sido": sidos,
+            "space_type_sido": space_type_sido,
+            "updated_at": document.get("updated_at")
+        }
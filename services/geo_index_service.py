@@ -0,0 +1,279 @@
+import asyncio
+import heapq
+import math
+import os
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from prometheus_client import Gauge
+
+from enums.space_type import SpaceType
+from utils.logger import Logger
+
+
+GEO_INDEX_SPACES = Gauge("space_geo_index_spaces", "메모리 위치 인덱스에 적재된 공간 수")
+GEO_INDEX_SYNC_AGE = Gauge("space_geo_index_sync_age_seconds", "메모리 위치 인덱스 마지막 동기화 이후 경과 시간(초)")
+
+# MongoDB 2dsphere 와 같은 지구 반지름 (m)
+EARTH_RADIUS_METERS = 6378100.0
+
+
+class GeoGrid:
+    """공간 위치를 위도/경도 격자로 나눈 메모리 인덱스
+
+    공간마다 슬롯 번호를 하나 할당하고 경도/위도/타입/가격은 슬롯 순서대로 array 에 저장한다.
+    격자 칸(cell_degrees 도 단위)에는 해당 칸에 있는 슬롯 번호만 보관한다.
+    """
+
+    _ID_SIZE = 12
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self.longitudes = array("d")
+        self.latitudes = array("d")
+        self.prices = array("q")
+        self.types = array("b")
+        self.ids = bytearray()
+        self.slots: Dict[bytes, int] = {}
+        self.cells: Dict[Tuple[int, int], array] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _cell(self, longitude: float, latitude: float) -> Tuple[int, int]:
+        return math.floor(longitude / self.cell_degrees), math.floor(latitude / self.cell_degrees)
+
+    def upsert(self, object_id: ObjectId, longitude: float, latitude: float, type_code: int, price: int):
+        key = object_id.binary
+        slot = self.slots.get(key)
+        cell = self._cell(longitude, latitude)
+
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self.longitudes[slot], self.latitudes[slot] = longitude, latitude
+                self.prices[slot], self.types[slot] = price, type_code
+                self.ids[slot * self._ID_SIZE:(slot + 1) * self._ID_SIZE] = key
+            else:
+                slot = len(self.longitudes)
+                self.longitudes.append(longitude)
+                self.latitudes.append(latitude)
+                self.prices.append(price)
+                self.types.append(type_code)
+                self.ids += key
+            self.slots[key] = slot
+            self.cells.setdefault(cell, array("I")).append(slot)
+            return
+
+        previous_cell = self._cell(self.longitudes[slot], self.latitudes[slot])
+        if previous_cell != cell:
+            self._remove_from_cell(previous_cell, slot)
+            self.cells.setdefault(cell, array("I")).append(slot)
+        self.longitudes[slot], self.latitudes[slot] = longitude, latitude
+        self.prices[slot], self.types[slot] = price, type_code
+
+    def remove(self, object_id: ObjectId):
+        slot = self.slots.pop(object_id.binary, None)
+        if slot is None:
+            return
+        self._remove_from_cell(self._cell(self.longitudes[slot], self.latitudes[slot]), slot)
+        self._free.append(slot)
+
+    def _remove_from_cell(self, cell: Tuple[int, int], slot: int):
+        slots = self.cells.get(cell)
+        if slots is None:
+            return
+        slots.remove(slot)
+        if not slots:
+            del self.cells[cell]
+
+    def object_id(self, slot: int) -> ObjectId:
+        return ObjectId(bytes(self.ids[slot * self._ID_SIZE:(slot + 1) * self._ID_SIZE]))
+
+    def query(
+        self,
+        longitude: float,
+        latitude: float,
+        radius_meters: float,
+        limit: Optional[int] = None,
+        type_code: Optional[int] = None,
+        max_price: Optional[int] = None
+    ) -> List[Tuple[float, ObjectId]]:
+        """반경 안의 공간을 가까운 순서로 (거리(m), _id) 목록으로 반환 (limit 지정 시 가까운 k개)"""
+        lat_span = math.degrees(radius_meters / EARTH_RADIUS_METERS)
+        lon_span = min(180.0, lat_span / max(math.cos(math.radians(latitude)), 1e-6))
+        min_x, min_y = self._cell(longitude - lon_span, max(-90.0, latitude - lat_span))
+        max_x, max_y = self._cell(longitude + lon_span, min(90.0, latitude + lat_span))
+
+        # 반경이 넓어 확인할 칸이 실제 칸 수보다 많으면 존재하는 칸만 순회
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self.cells):
+            cells = [slots for (x, y), slots in self.cells.items() if min_x <= x <= max_x and min_y <= y <= max_y]
+        else:
+            cells = [self.cells[(x, y)] for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1) if (x, y) in self.cells]
+
+        longitudes, latitudes, prices, types = self.longitudes, self.latitudes, self.prices, self.types
+        origin_lat = math.radians(latitude)
+        origin_cos = math.cos(origin_lat)
+        hits = []
+        for slots in cells:
+            for slot in slots:
+                if type_code is not None and types[slot] != type_code:
+                    continue
+                if max_price is not None and prices[slot] > max_price:
+                    continue
+                # haversine
+                lat = math.radians(latitudes[slot])
+                half_dlat = (lat - origin_lat) / 2
+                half_dlon = math.radians(longitudes[slot] - longitude) / 2
+                a = math.sin(half_dlat) ** 2 + origin_cos * math.cos(lat) * math.sin(half_dlon) ** 2
+                distance = 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+                if distance <= radius_meters:
+                    hits.append((distance, slot))
+
+        hits = heapq.nsmallest(limit, hits) if limit is not None else sorted(hits)
+        return [(distance, self.object_id(slot)) for distance, slot in hits]
+
+
+class SpaceGeoIndex:
+    """주변 공간 조회(/nearby)용 프로세스 내 위치 인덱스 (SPACE_GEO_INDEX=true 일 때만 사용)
+
+    - 시작 시 삭제되지 않은 공간의 좌표/타입/가격만 읽어 GeoGrid 로 적재
+    - 이 인스턴스의 등록/수정/삭제는 write hook(apply/remove)으로 즉시 반영
+    - 다른 인스턴스의 변경은 SPACE_GEO_INDEX_REFRESH_INTERVAL 마다 updated_at 이후 수정된 문서만 읽어 반영
+    - SPACE_GEO_INDEX_REBUILD_INTERVAL 마다 전체를 다시 적재 (빈 슬롯 정리, 누락 보정)
+    반경/거리/필터 계산은 메모리에서 처리하고 응답할 공간의 문서만 MongoDB 에서 조회한다.
+    """
+
+    _instance: Optional['SpaceGeoIndex'] = None
+
+    _PROJECTION = {"location.coordinates": 1, "space_type": 1, "unit_price": 1, "deleted_at": 1}
+    _TYPE_CODES = {space_type.value: code for code, space_type in enumerate(SpaceType)}
+    _UNKNOWN_TYPE = -1
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._logger = Logger.setup_logger()
+        self._cell_degrees = float(os.getenv("SPACE_GEO_INDEX_CELL_DEGREES", "0.01"))
+        self._refresh_interval = float(os.getenv("SPACE_GEO_INDEX_REFRESH_INTERVAL", "5"))
+        self._rebuild_interval = float(os.getenv("SPACE_GEO_INDEX_REBUILD_INTERVAL", "3600"))
+        # 인스턴스별 시계로 기록된 updated_at 이 커밋 순서와 다를 수 있으므로 겹쳐서 읽음
+        self._settle = timedelta(seconds=float(os.getenv("SPACE_CHANGES_SETTLE_SECONDS", "5")))
+        self._grid: Optional[GeoGrid] = None
+        self._synced_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return os.getenv("SPACE_GEO_INDEX", "false").lower() == "true"
+
+    @classmethod
+    def get_instance(cls, db: AsyncIOMotorDatabase) -> 'SpaceGeoIndex':
+        if cls._instance is None:
+            cls._instance = SpaceGeoIndex(db)
+        return cls._instance
+
+    @classmethod
+    def ready(cls) -> Optional['SpaceGeoIndex']:
+        # 적재가 끝난 인덱스만 사용 (그 전에는 MongoDB 로 조회)
+        if cls._instance is None or cls._instance._grid is None:
+            return None
+        return cls._instance
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        SpaceGeoIndex._instance = None
+
+    async def _run(self):
+        last_rebuild = time.monotonic()
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                if self._grid is None or time.monotonic() - last_rebuild >= self._rebuild_interval:
+                    await self.rebuild()
+                    last_rebuild = time.monotonic()
+                else:
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error(f"위치 인덱스 갱신 실패: {e}")
+            if self._synced_at:
+                GEO_INDEX_SYNC_AGE.set((datetime.now() - self._synced_at).total_seconds())
+
+    async def rebuild(self):
+        started = datetime.now()
+        grid = GeoGrid(self._cell_degrees)
+        async for space in self.db.spaces.find({"deleted_at": None}, self._PROJECTION):
+            self._apply(grid, space)
+
+        # 적재 중에 반영된 write hook 은 다음 refresh 에서 다시 읽음
+        self._grid = grid
+        self._synced_at = started
+        GEO_INDEX_SPACES.set(len(grid))
+        self._logger.info(f"위치 인덱스 적재 완료: 공간 {len(grid)}개 ({(datetime.now() - started).total_seconds():.2f}초)")
+
+    async def refresh(self):
+        started = datetime.now()
+        query = {"updated_at": {"$gte": self._synced_at - self._settle}}
+        async for space in self.db.spaces.find(query, self._PROJECTION):
+            self._apply(self._grid, space)
+        self._synced_at = started
+        GEO_INDEX_SPACES.set(len(self._grid))
+
+    @classmethod
+    def _apply(cls, grid: GeoGrid, space: Dict):
+        coordinates = (space.get("location") or {}).get("coordinates")
+        if space.get("deleted_at") or not coordinates:
+            grid.remove(space["_id"])
+            return
+        space_type = space.get("space_type")
+        type_code = cls._TYPE_CODES.get(getattr(space_type, "value", space_type), cls._UNKNOWN_TYPE)
+        grid.upsert(space["_id"], float(coordinates[0]), float(coordinates[1]), type_code, int(space.get("unit_price") or 0))
+
+    # 등록/수정된 공간 반영 (write hook, _id 와 _PROJECTION 필드가 있는 문서)
+    @classmethod
+    def apply(cls, spaces: List[Dict]):
+        instance = cls.ready()
+        if instance is None:
+            return
+        for space in spaces:
+            instance._apply(instance._grid, space)
+        GEO_INDEX_SPACES.set(len(instance._grid))
+
+    # 삭제된 공간 제외 (write hook)
+    @classmethod
+    def remove(cls, object_id: ObjectId):
+        instance = cls.ready()
+        if instance is None:
+            return
+        instance._grid.remove(object_id)
+        GEO_INDEX_SPACES.set(len(instance._grid))
+
+    def query(
+        self,
+        longitude: float,
+        latitude: float,
+        radius_meters: float,
+        limit: Optional[int] = None,
+        space_type: Optional[SpaceType] = None,
+        max_price: Optional[int] = None
+    ) -> List[Tuple[float, ObjectId]]:
+        type_code = None
+        if space_type is not None:
+            type_code = self._TYPE_CODES.get(space_type.value, self._UNKNOWN_TYPE)
+        return self._grid.query(longitude, latitude, radius_meters, limit, type_code, max_price)
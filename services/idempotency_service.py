@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from utils.logger import Logger
+from utils.mongodb import get_mongodb
+
+
+async def get_idempotency_service(db: AsyncIOMotorDatabase = Depends(get_mongodb)):
+    return IdempotencyService(db)
+
+
+class IdempotencyService:
+    """Idempotency-Key 헤더로 같은 요청의 재시도를 한 번만 처리
+
+    space_idempotency_keys 컬렉션에 (사용자, 키)별로 처리 중/완료 상태와 응답을 저장한다.
+    - 처음 들어온 요청만 실제로 처리하고 결과를 기록
+    - 처리 중인 동안 들어온 재시도는 결과가 기록될 때까지 대기 후 같은 응답을 반환
+    - 같은 키로 다른 내용을 보내면 422
+    - 서버 오류(5xx)로 끝난 요청은 기록을 지워 재시도가 다시 처리되도록 함
+    - 처리하는 동안 임대(locked_until)를 주기적으로 연장하므로 임대가 만료된 기록은 처리하던 인스턴스가 종료된 경우뿐이며,
+      이어받은 요청은 새 owner 토큰을 기록하므로 이전 처리의 완료/해제는 반영되지 않음
+    기록은 expires_at 기준 TTL 인덱스로 자동 삭제된다.
+    """
+
+    _COLLECTION = "space_idempotency_keys"
+    _MAX_KEY_LENGTH = 255
+
+    # 같은 프로세스에서 처리 중인 키의 완료 알림 (다른 인스턴스는 조회로 확인)
+    _completions: Dict[str, asyncio.Event] = {}
+
+    _logger = Logger.setup_logger()
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._ttl_seconds = int(os.getenv("SPACE_IDEMPOTENCY_TTL", "86400"))
+        self._lease_seconds = int(os.getenv("SPACE_IDEMPOTENCY_LEASE_SECONDS", "120"))
+        self._wait_seconds = float(os.getenv("SPACE_IDEMPOTENCY_WAIT_SECONDS", "10"))
+
+    @property
+    def keys(self):
+        return self.db[self._COLLECTION]
+
+    @classmethod
+    async def initialize(cls, db: AsyncIOMotorDatabase):
+        await db[cls._COLLECTION].create_index("expires_at", expireAfterSeconds=0, name="expires_at_ttl")
+
+    @staticmethod
+    def fingerprint(payload: Dict) -> str:
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode("UTF-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _record_id(self, user_id: str, key: str) -> str:
+        if not key or len(key) > self._MAX_KEY_LENGTH:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Idempotency-Key 는 1~{self._MAX_KEY_LENGTH}자여야 합니다.")
+        return f"{user_id}:{key}"
+
+    async def execute(self, user_id: str, key: str, fingerprint: str, handler: Callable[[], Awaitable[Tuple[int, Dict]]]) -> Tuple[int, Dict, bool]:
+        """handler 를 키당 한 번만 실행하고 (상태 코드, 응답 본문, 재사용 여부) 반환"""
+        owner, stored = await self.begin(user_id, key, fingerprint)
+        if stored is not None:
+            return stored["status_code"], stored["body"], True
+
+        heartbeat = asyncio.create_task(self._extend_lease(self._record_id(user_id, key), owner))
+        try:
+            try:
+                status_code, body = await handler()
+            finally:
+                await self._stop_heartbeat(heartbeat)
+        except HTTPException as e:
+            # 요청 자체의 오류(4xx)는 결과로 남기고, 서버 오류는 재시도할 수 있도록 해제
+            if e.status_code < 500:
+                await self.complete(user_id, key, owner, e.status_code, {"detail": e.detail})
+            else:
+                await self.release(user_id, key, owner)
+            raise
+        except BaseException:
+            await self.release(user_id, key, owner)
+            raise
+
+        await self.complete(user_id, key, owner, status_code, body)
+        return status_code, body, False
+
+    async def begin(self, user_id: str, key: str, fingerprint: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """처리 권한을 얻으면 (owner 토큰, None), 이미 완료된 요청이면 (None, 저장된 응답({status_code, body})) 반환"""
+        record_id = self._record_id(user_id, key)
+        deadline = asyncio.get_running_loop().time() + self._wait_seconds
+        delay = 0.1
+
+        while True:
+            now = datetime.now()
+            owner = uuid.uuid4().hex
+            try:
+                await self.keys.insert_one({
+                    "_id": record_id,
+                    "fingerprint": fingerprint,
+                    "status": "in_progress",
+                    "owner": owner,
+                    "locked_until": now + timedelta(seconds=self._lease_seconds),
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self._ttl_seconds)
+                })
+                self._completions[record_id] = asyncio.Event()
+                return owner, None
+            except DuplicateKeyError:
+                pass
+
+            record = await self._take_over_expired(record_id, fingerprint) or await self.keys.find_one({"_id": record_id})
+            if record is None:
+                # 조회 사이에 만료/삭제된 경우 다시 시도
+                continue
+            if record["fingerprint"] != fingerprint:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="같은 Idempotency-Key 로 다른 요청을 보낼 수 없습니다.")
+            if record.get("taken_over"):
+                self._completions[record_id] = asyncio.Event()
+                return record["owner"], None
+            if record["status"] == "completed":
+                return None, record["response"]
+
+            # 처리 중: 완료될 때까지 대기
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="같은 요청이 아직 처리 중입니다.",
+                    headers={"Retry-After": str(max(1, int(self._wait_seconds)))}
+                )
+            await self._wait_for_completion(record_id, min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+
+    # 처리하던 인스턴스가 종료되어 임대(lease)가 만료된 기록은 이어받아 다시 처리
+    async def _take_over_expired(self, record_id: str, fingerprint: str) -> Optional[Dict]:
+        now = datetime.now()
+        record = await self.keys.find_one_and_update(
+            {"_id": record_id, "status": "in_progress", "fingerprint": fingerprint, "locked_until": {"$lte": now}},
+            {"$set": {"owner": uuid.uuid4().hex, "locked_until": now + timedelta(seconds=self._lease_seconds)}},
+            return_document=ReturnDocument.AFTER
+        )
+        if record:
+            self._logger.warning(f"만료된 멱등성 키를 이어서 처리합니다: {record_id}")
+            record["taken_over"] = True
+        return record
+
+    # 처리하는 동안 임대 기간의 1/3 마다 임대 연장 (처리가 길어져도 다른 요청이 이어받지 않도록)
+    async def _extend_lease(self, record_id: str, owner: str):
+        while True:
+            await asyncio.sleep(self._lease_seconds / 3)
+            try:
+                result = await self.keys.update_one(
+                    {"_id": record_id, "status": "in_progress", "owner": owner},
+                    {"$set": {"locked_until": datetime.now() + timedelta(seconds=self._lease_seconds)}}
+                )
+            except Exception as e:
+                # 일시적인 실패는 다음 주기에 다시 연장
+                self._logger.error(f"멱등성 키 임대 연장 실패: {record_id} {e}")
+                continue
+            if not result.matched_count:
+                self._logger.warning(f"멱등성 키 임대를 잃었습니다: {record_id}")
+                return
+
+    @staticmethod
+    async def _stop_heartbeat(heartbeat: asyncio.Task):
+        heartbeat.cancel()
+        try:
+            await heartbeat
+        except asyncio.CancelledError:
+            # 요청 자체가 취소된 경우는 그대로 전달
+            if asyncio.current_task().cancelling():
+                raise
+
+    async def _wait_for_completion(self, record_id: str, timeout: float):
+        event = self._completions.get(record_id)
+        if event is None:
+            await asyncio.sleep(timeout)
+            return
+        # wait_for 는 완료 알림과 취소가 겹치면 취소를 삼킬 수 있어(Python 3.11) timeout 사용
+        try:
+            async with asyncio.timeout(timeout):
+                await event.wait()
+        except TimeoutError:
+            pass
+
+    # 임대를 가진 요청(owner)만 결과를 기록 (이어받은 요청이 있으면 그 결과를 유지)
+    async def complete(self, user_id: str, key: str, owner: str, status_code: int, body: Dict):
+        record_id = self._record_id(user_id, key)
+        result = await self.keys.update_one(
+            {"_id": record_id, "status": "in_progress", "owner": owner},
+            {"$set": {"status": "completed", "response": {"status_code": status_code, "body": body}, "completed_at": datetime.now()},
+             "$unset": {"locked_until": "", "owner": ""}}
+        )
+        if not result.matched_count:
+            self._logger.warning(f"임대를 잃은 멱등성 키의 결과는 기록하지 않습니다: {record_id}")
+        self._notify(record_id)
+
+    # 서버 오류 등으로 결과를 남기지 않을 때 기록 삭제 (재시도가 다시 처리)
+    async def release(self, user_id: str, key: str, owner: str):
+        record_id = self._record_id(user_id, key)
+        try:
+            await self.keys.delete_one({"_id": record_id, "status": "in_progress", "owner": owner})
+        except Exception as e:
+            # 삭제 실패 시 임대 만료 후 재시도가 이어받음
+            self._logger.error(f"멱등성 키 해제 실패: {record_id} {e}")
+        self._notify(record_id)
+
+    def _notify(self, record_id: str):
+        event = self._completions.pop(record_id, None)
+        if event:
+            event.set()
@@ -0,0 +1,359 @@
+"""S3 이미지와 spaces 컬렉션을 대조하여 고아 객체를 찾는 작업
+
+사용 예:
+    python -m services.image_reconciler                       # 리포트만 출력 (dry-run)
+    python -m services.image_reconciler --delete --rate 50    # 초당 50개 이하로 고아 객체 삭제
+    python -m services.image_reconciler --s3-endpoint-url http://localhost:5000 \\
+        --mongo-uri mongodb://localhost:27017 --db-name spaceplaceDB --bucket space-place-bucket
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, IO, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from utils.logger import Logger
+
+
+class _RateLimiter:
+    """초당 rate 개까지 허용하는 토큰 버킷"""
+
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+
+    async def acquire(self, amount: int):
+        if self._rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= min(amount, self._rate):
+                self._tokens -= amount
+                return
+            await asyncio.sleep((min(amount, self._rate) - self._tokens) / self._rate)
+
+
+class ImageReconciler:
+    """버킷 목록을 페이지 단위로 읽으며 {user_id}/{space_id}/ 단위로 공간 문서와 대조
+
+    S3 목록은 키 순서로 반환되므로 같은 prefix의 객체는 연속해서 나오며,
+    다음 prefix가 시작되면 이전 prefix는 완료된 것으로 보고 batch_size 개씩 $in 조회한다.
+    객체가 하나도 없는 공간은 이미지가 있는 공간을 같은 키 순서({user_id}/{space_id}/)로 함께 읽어(merge) 누락으로 집계하므로
+    메모리는 batch_size 에 비례한다. (정렬은 서버에서 allowDiskUse 로 수행)
+
+    --delete 는 서비스 키 형식({user_id}/{ObjectId}/{filename})인 객체만 삭제하며,
+    형식이 다르거나(invalid_key, invalid_space_id) 소유자가 다른(owner_mismatch) 객체는 리포트만 한다.
+    """
+
+    # 서비스가 만든 객체인지 확신할 수 없어 리포트만 하는 사유
+    _REPORT_ONLY_REASONS = {"invalid_key", "invalid_space_id", "owner_mismatch"}
+
+    # S3 delete_objects 한 번에 지울 수 있는 최대 키 수
+    _S3_DELETE_BATCH = 1000
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        s3_client,
+        bucket: str,
+        batch_size: int = 500,
+        delete: bool = False,
+        delete_rate: float = 100.0,
+        min_age: timedelta = timedelta(hours=1),
+        prefix: str = "",
+        orphan_output: Optional[IO] = None
+    ):
+        self.db = db
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.batch_size = batch_size
+        self.delete = delete
+        self.min_age = min_age
+        self.prefix = prefix
+        self._rate_limiter = _RateLimiter(delete_rate)
+        self._delete_chunk = min(self._S3_DELETE_BATCH, int(delete_rate)) if delete_rate >= 1 else self._S3_DELETE_BATCH
+        self._orphan_output = orphan_output
+        self._logger = Logger.setup_logger()
+
+        self._stats = {
+            "objects_scanned": 0,
+            "bytes_scanned": 0,
+            "prefixes_checked": 0,
+            "skipped_recent": 0,
+            "pending_purge": 0,
+            "orphans": 0,
+            "orphan_bytes": 0,
+            "missing_objects": 0,
+            "report_only": 0,
+            "deleted": 0,
+            "delete_errors": 0
+        }
+        self._pending_deletes: List[Dict] = []
+        # 버킷 목록과 나란히 읽는 이미지가 있는 공간 (키 순서)
+        self._spaces = None
+        self._next_space: Optional[Dict] = None
+
+    async def run(self) -> Dict:
+        started = time.monotonic()
+        # spaces 의 updated_at 은 로컬 시각(naive)으로 기록됨
+        started_at = datetime.now()
+        self._spaces = self._spaces_with_images(started_at)
+        cutoff = datetime.now(timezone.utc) - self.min_age
+
+        # prefix -> (user_id, space_id, [객체])
+        groups: "OrderedDict[str, Tuple[str, str, List[Dict]]]" = OrderedDict()
+        completed: List[Tuple[str, str, List[Dict]]] = []
+
+        async for obj in self._list_objects():
+            self._stats["objects_scanned"] += 1
+            self._stats["bytes_scanned"] += obj.get("Size", 0)
+
+            # 업로드 진행 중일 수 있는 최근 객체는 대조에는 쓰되 삭제 대상에서는 제외
+            obj["recent"] = obj["LastModified"] > cutoff
+
+            parts = obj["Key"].split("/")
+            if len(parts) != 3 or not all(parts):
+                await self._report_orphans([obj], "invalid_key")
+                continue
+
+            group_prefix = f"{parts[0]}/{parts[1]}/"
+            if group_prefix not in groups:
+                while groups:
+                    completed.append(groups.popitem(last=False)[1])
+                # 이 prefix 보다 앞선 공간은 버킷에 객체가 없음
+                await self._advance_spaces(group_prefix)
+                groups[group_prefix] = (parts[0], parts[1], [])
+            groups[group_prefix][2].append(obj)
+
+            if len(completed) >= self.batch_size:
+                await self._check_groups(completed)
+                completed = []
+
+        completed.extend(groups.values())
+        if completed:
+            await self._check_groups(completed)
+        await self._flush_deletes()
+        await self._advance_spaces(None)
+
+        elapsed = time.monotonic() - started
+        report = dict(self._stats)
+        report["mode"] = "delete" if self.delete else "dry-run"
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["objects_per_second"] = round(self._stats["objects_scanned"] / elapsed, 1) if elapsed > 0 else None
+        return report
+
+    async def _list_objects(self):
+        params = {"Bucket": self.bucket, "Prefix": self.prefix}
+        while True:
+            response = await asyncio.to_thread(self.s3_client.list_objects_v2, **params)
+            for obj in response.get("Contents", []):
+                yield obj
+            if not response.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = response["NextContinuationToken"]
+
+    async def _check_groups(self, groups: List[Tuple[str, str, List[Dict]]]):
+        object_ids = []
+        valid_groups = []
+        for group in groups:
+            try:
+                object_ids.append(ObjectId(group[1]))
+            except InvalidId:
+                self._stats["prefixes_checked"] += 1
+                await self._report_orphans(group[2], "invalid_space_id")
+                continue
+            valid_groups.append(group)
+
+        spaces = {}
+        cursor = self.db.spaces.find(
+            {"_id": {"$in": object_ids}},
+            {"user_id": 1, "images.filename": 1, "deleted_at": 1, "purged_at": 1}
+        )
+        async for space in cursor:
+            spaces[str(space["_id"])] = space
+
+        for user_id, space_id, objects in valid_groups:
+            self._stats["prefixes_checked"] += 1
+            space = spaces.get(space_id)
+
+            if space is None:
+                await self._report_orphans(objects, "missing_document")
+                continue
+            if space.get("user_id") != user_id:
+                await self._report_orphans(objects, "owner_mismatch")
+                continue
+            if space.get("purged_at"):
+                # 정리가 끝난 공간(삭제 표시만 남음)에 남아 있는 객체
+                await self._report_orphans(objects, "purged")
+                continue
+            if space.get("deleted_at"):
+                # 삭제 워커가 정리할 대상
+                self._stats["pending_purge"] += len(objects)
+                continue
+
+            referenced = {image["filename"] for image in space.get("images", [])}
+            stored = {obj["Key"].rsplit("/", 1)[1] for obj in objects}
+
+            unreferenced = [obj for obj in objects if obj["Key"].rsplit("/", 1)[1] not in referenced]
+            if unreferenced:
+                await self._report_orphans(unreferenced, "unreferenced")
+
+            self._report_missing(user_id, space_id, referenced - stored)
+
+    # S3 목록과 같은 순서(UTF-8 바이트 순)로 정렬한 이미지가 있는 공간 (확인 시작 후 수정된 공간은 목록과 시점이 달라 제외)
+    # (user_id, _id) 순서는 user_id 가 다른 user_id 의 앞부분인 경우 S3 의 "{user_id}/" 순서와 달라 prefix 문자열로 정렬
+    def _spaces_with_images(self, started_at: datetime):
+        pipeline = [
+            {"$match": {"deleted_at": None, "images.0": {"$exists": True}, "updated_at": {"$not": {"$gte": started_at}}}},
+            {"$project": {
+                "prefix": {"$concat": ["$user_id", "/", {"$toString": "$_id"}, "/"]},
+                "user_id": 1,
+                "images.filename": 1
+            }},
+            {"$match": {"prefix": {"$regex": f"^{re.escape(self.prefix)}"}}},
+            {"$sort": {"prefix": 1}}
+        ]
+        return self.db.spaces.aggregate(pipeline, allowDiskUse=True, batchSize=self.batch_size)
+
+    # until(prefix) 보다 앞선 공간은 버킷에 객체가 없으므로 이미지 전체를 누락으로 집계 (None 이면 끝까지)
+    async def _advance_spaces(self, until: Optional[str]):
+        while True:
+            if self._next_space is None:
+                self._next_space = await anext(self._spaces, None)
+                if self._next_space is None:
+                    return
+            space = self._next_space
+            if until is not None and space["prefix"] >= until:
+                if space["prefix"] == until:
+                    # 객체가 있는 공간은 _check_groups 에서 대조
+                    self._next_space = None
+                return
+            self._next_space = None
+            self._report_missing(space["user_id"], str(space["_id"]), {image["filename"] for image in space.get("images", [])})
+
+    def _report_missing(self, user_id: str, space_id: str, filenames: Set[str]):
+        for filename in sorted(filenames):
+            self._stats["missing_objects"] += 1
+            self._write_record({"type": "missing_object", "space_id": space_id, "key": f"{user_id}/{space_id}/{filename}"})
+
+    async def _report_orphans(self, objects: List[Dict], reason: str):
+        for obj in objects:
+            if obj["recent"]:
+                self._stats["skipped_recent"] += 1
+                continue
+
+            self._stats["orphans"] += 1
+            self._stats["orphan_bytes"] += obj.get("Size", 0)
+            self._write_record({"type": "orphan", "reason": reason, "key": obj["Key"], "size": obj.get("Size", 0)})
+
+            if reason in self._REPORT_ONLY_REASONS:
+                self._stats["report_only"] += 1
+            elif self.delete:
+                self._pending_deletes.append({"Key": obj["Key"]})
+                if len(self._pending_deletes) >= self._delete_chunk:
+                    await self._flush_deletes()
+
+    async def _flush_deletes(self):
+        while self._pending_deletes:
+            # 초당 삭제 한도를 넘지 않는 크기로 나누어 삭제
+            chunk, self._pending_deletes = self._pending_deletes[:self._delete_chunk], self._pending_deletes[self._delete_chunk:]
+            await self._rate_limiter.acquire(len(chunk))
+
+            result = await asyncio.to_thread(
+                self.s3_client.delete_objects,
+                Bucket=self.bucket,
+                Delete={"Objects": chunk, "Quiet": True}
+            )
+            errors = result.get("Errors", [])
+            self._stats["deleted"] += len(chunk) - len(errors)
+            self._stats["delete_errors"] += len(errors)
+            for error in errors:
+                self._logger.error(f"고아 이미지 삭제 실패: {error.get('Key')} {error.get('Message')}")
+
+    def _write_record(self, record: Dict):
+        if self._orphan_output:
+            self._orphan_output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="S3 고아 이미지 정리")
+    parser.add_argument("--delete", action="store_true", help="고아 객체 삭제 (기본값: 리포트만 출력)")
+    parser.add_argument("--rate", type=float, default=100.0, help="초당 최대 삭제 객체 수 (0이면 제한 없음)")
+    parser.add_argument("--batch-size", type=int, default=500, help="한 번에 $in 으로 조회할 공간 수")
+    parser.add_argument("--min-age-minutes", type=int, default=60, help="이 시간보다 최근에 올라온 객체는 건너뜀")
+    parser.add_argument("--prefix", default="", help="검사할 S3 prefix (예: user_id/)")
+    parser.add_argument("--orphans-out", default=None, help="고아/누락 객체 목록을 NDJSON으로 기록할 파일 ('-'는 stdout)")
+    parser.add_argument("--bucket", default=None, help="버킷 이름 (기본값: SPACE_S3_BUCKET_NAME)")
+    parser.add_argument("--s3-endpoint-url", default=None, help="로컬 S3 대체 서버 주소 (moto_server, minio 등)")
+    parser.add_argument("--mongo-uri", default=None, help="MongoDB 접속 문자열 (기본값: 환경 설정)")
+    parser.add_argument("--db-name", default=None, help="--mongo-uri 사용 시 데이터베이스 이름")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> Dict:
+    import boto3
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
+    load_dotenv(env_type)
+
+    mongodb = None
+    client = None
+    if args.mongo_uri:
+        client = AsyncIOMotorClient(args.mongo_uri)
+        db = client[args.db_name or os.getenv('SPACE_DB_NAME')]
+    else:
+        from utils.mongodb import MongoDB
+        mongodb = await MongoDB.get_instance()
+        db = mongodb.db
+
+    if args.s3_endpoint_url:
+        s3_client = boto3.client("s3", endpoint_url=args.s3_endpoint_url, region_name=os.getenv('REGION_NAME'))
+    else:
+        from services.aws_service import get_aws_service
+        s3_client = get_aws_service().get_s3_config()["s3_client"]
+
+    output = None
+    if args.orphans_out == "-":
+        output = sys.stdout
+    elif args.orphans_out:
+        output = open(args.orphans_out, "w", encoding="utf-8")
+
+    try:
+        reconciler = ImageReconciler(
+            db,
+            s3_client,
+            args.bucket or os.getenv('SPACE_S3_BUCKET_NAME'),
+            batch_size=args.batch_size,
+            delete=args.delete,
+            delete_rate=args.rate,
+            min_age=timedelta(minutes=args.min_age_minutes),
+            prefix=args.prefix,
+            orphan_output=output
+        )
+        return await reconciler.run()
+    finally:
+        if output and output is not sys.stdout:
+            output.close()
+        if mongodb:
+            await mongodb.close()
+        if client:
+            client.close()
+
+
+if __name__ == "__main__":
+    report = asyncio.run(_main(_parse_args()))
+    print(json.dumps(report, ensure_ascii=False, indent=2), file=sys.stderr)
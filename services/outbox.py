@@ -0,0 +1,357 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from utils.logger import Logger
+
+
+OUTBOX_BACKLOG = Gauge("space_outbox_backlog", "후속 작업(outbox) 상태별 작업 수", ["kind", "status"])
+OUTBOX_OLDEST_PENDING = Gauge("space_outbox_oldest_pending_seconds", "가장 오래 대기 중인 후속 작업의 대기 시간(초)", ["kind"])
+OUTBOX_DEAD_LETTERS = Gauge("space_outbox_dead_letters", "재시도를 중단한 후속 작업 수", ["kind"])
+OUTBOX_JOBS_TOTAL = Counter("space_outbox_jobs_total", "처리된 후속 작업 수", ["kind", "result"])
+OUTBOX_JOB_LATENCY = Histogram(
+    "space_outbox_job_latency_seconds",
+    "후속 작업 등록부터 완료까지 걸린 시간(초)",
+    ["kind"],
+    buckets=(0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 1800, 3600)
+)
+OUTBOX_JOB_DURATION = Histogram(
+    "space_outbox_job_duration_seconds",
+    "후속 작업 실행 시간(초)",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+)
+
+Handler = Callable[[Dict], Awaitable[None]]
+T = TypeVar("T")
+
+
+class OutboxWorker:
+    """공간 변경의 후속 작업(S3 정리, 집계 갱신 등)을 MongoDB outbox 로 받아 백그라운드에서 실행
+
+    - 변경 요청은 문서 쓰기와 같은 트랜잭션 안에서 enqueue 하고 바로 응답 (트랜잭션 미지원 환경은 쓰기 직후 등록)
+    - 종류(kind)별 handler 를 register 로 등록하며, 전체 SPACE_OUTBOX_WORKERS 개 / 종류별 SPACE_OUTBOX_{KIND}_CONCURRENCY 개까지 동시 실행
+    - 실패한 작업은 지수 백오프로 재시도하고 SPACE_OUTBOX_MAX_ATTEMPTS 회 실패하면 space_outbox_dead 로 이동
+    - 실행 중에는 임대(locked_until)를 주기적으로 연장하고, 완료/재시도/중단 기록은 작업을 가져간 워커(owner)만 반영
+    작업은 컬렉션에 저장되므로 프로세스가 재시작되어도 이어서 처리된다.
+    """
+
+    _instance: Optional['OutboxWorker'] = None
+
+    _COLLECTION = "space_outbox"
+    _DEAD_COLLECTION = "space_outbox_dead"
+    _STATUSES = ("pending", "running")
+
+    # 트랜잭션 사용 여부 (레플리카셋/mongos 에서만 가능, 처음 사용할 때 확인)
+    _transactions: Optional[bool] = None
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._logger = Logger.setup_logger()
+
+        self._workers = int(os.getenv("SPACE_OUTBOX_WORKERS", "4"))
+        self._poll_interval = float(os.getenv("SPACE_OUTBOX_POLL_INTERVAL", "5"))
+        self._lease_seconds = int(os.getenv("SPACE_OUTBOX_LEASE_SECONDS", "300"))
+        self._max_attempts = int(os.getenv("SPACE_OUTBOX_MAX_ATTEMPTS", "8"))
+        self._backoff_base = float(os.getenv("SPACE_OUTBOX_BACKOFF_BASE", "5"))
+        self._backoff_max = float(os.getenv("SPACE_OUTBOX_BACKOFF_MAX", "3600"))
+
+        self._handlers: Dict[str, Handler] = {}
+        self._limits: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    @property
+    def jobs(self):
+        return self.db[self._COLLECTION]
+
+    @classmethod
+    def get_instance(cls, db: AsyncIOMotorDatabase) -> 'OutboxWorker':
+        if cls._instance is None:
+            cls._instance = OutboxWorker(db)
+        return cls._instance
+
+    def register(self, kind: str, handler: Handler):
+        self._handlers[kind] = handler
+        self._limits[kind] = int(os.getenv(f"SPACE_OUTBOX_{kind.upper()}_CONCURRENCY", str(self._workers)))
+        self._running.setdefault(kind, 0)
+
+    async def initialize(self):
+        await self.jobs.create_index([("status", 1), ("next_run_at", 1)], name="status_next_run_at")
+        # 같은 대상에 대한 중복 등록 방지 (dedupe_key 가 있는 작업만)
+        await self.jobs.create_index(
+            "dedupe_key",
+            unique=True,
+            partialFilterExpression={"dedupe_key": {"$exists": True}},
+            name="dedupe_key_unique"
+        )
+
+    @classmethod
+    async def supports_transactions(cls, db: AsyncIOMotorDatabase) -> bool:
+        if cls._transactions is None:
+            setting = os.getenv("SPACE_OUTBOX_TRANSACTIONS", "auto").lower()
+            if setting in ("true", "false"):
+                cls._transactions = setting == "true"
+            else:
+                try:
+                    hello = await db.client.admin.command("hello")
+                    cls._transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
+                except Exception as e:
+                    # 배포 형태를 확인할 수 없으면 트랜잭션 없이 쓰기 직후 등록
+                    Logger.setup_logger().warning(f"트랜잭션 지원 여부 확인 실패(트랜잭션 없이 진행): {e}")
+                    cls._transactions = False
+        return cls._transactions
+
+    @classmethod
+    async def run_in_transaction(cls, db: AsyncIOMotorDatabase, callback: Callable[[Optional[AsyncIOMotorClientSession]], Awaitable[T]]) -> T:
+        """문서 쓰기와 작업 등록을 한 트랜잭션으로 실행하고 callback 의 결과를 반환 (미지원 환경은 session=None 으로 한 번 실행)
+
+        async def write(session):
+            await self.db.spaces.update_one(..., session=session)
+            await OutboxWorker.enqueue(self.db, "kind", {...}, session=session)
+        await OutboxWorker.run_in_transaction(self.db, write)
+
+        TransientTransactionError / UnknownTransactionCommitResult(같은 공간 동시 수정 등)는 callback 부터 다시 실행하므로
+        callback 은 세션 밖의 상태를 바꾸지 않아야 한다.
+        """
+        if not await cls.supports_transactions(db):
+            result = await callback(None)
+            cls._notify()
+            return result
+
+        async with await db.client.start_session() as session:
+            result = await session.with_transaction(callback)
+        # 커밋된 뒤에 워커를 깨움
+        cls._notify()
+        return result
+
+    @classmethod
+    async def enqueue(
+        cls,
+        db: AsyncIOMotorDatabase,
+        kind: str,
+        payload: Dict,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        dedupe_key: Optional[str] = None
+    ):
+        now = datetime.now()
+        job = {
+            "kind": kind,
+            "payload": payload,
+            "status": "pending",
+            "attempts": 0,
+            "next_run_at": now,
+            "created_at": now
+        }
+        if dedupe_key:
+            # 같은 키의 작업이 대기/실행 중이면 새로 등록하지 않음
+            job["dedupe_key"] = dedupe_key
+            try:
+                await db[cls._COLLECTION].update_one(
+                    {"dedupe_key": dedupe_key},
+                    {"$setOnInsert": job},
+                    upsert=True,
+                    session=session
+                )
+            except DuplicateKeyError:
+                # 동시 upsert 경합 (트랜잭션 안에서는 중단된 트랜잭션을 호출자가 처리)
+                if session is not None:
+                    raise
+        else:
+            await db[cls._COLLECTION].insert_one(job, session=session)
+
+        if session is None:
+            cls._notify()
+
+    @classmethod
+    def _notify(cls):
+        if cls._instance:
+            cls._instance._wakeup.set()
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self._workers)]
+            self._tasks.append(asyncio.create_task(self._monitor()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        OutboxWorker._instance = None
+
+    async def _run(self):
+        while True:
+            try:
+                job = await self._claim_job()
+                if job:
+                    await self._process(job)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error(f"후속 작업 워커 오류: {e}")
+
+            # wait_for 는 깨우기와 취소가 겹치면 취소를 삼켜 stop() 이 끝나지 않으므로 asyncio.timeout 사용
+            self._wakeup.clear()
+            try:
+                async with asyncio.timeout(self._poll_interval):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+    # 실행 시각이 지난 대기 작업이나 임대(lease)가 만료된 실행 중 작업 중 동시 실행 한도가 남은 종류의 작업을 하나 가져오기
+    async def _claim_job(self) -> Optional[Dict]:
+        kinds = [kind for kind, limit in self._limits.items() if self._running[kind] < limit]
+        if not kinds:
+            return None
+
+        now = datetime.now()
+        job = await self.jobs.find_one_and_update(
+            {
+                "kind": {"$in": kinds},
+                "$or": [
+                    {"status": "pending", "next_run_at": {"$lte": now}},
+                    {"status": "running", "locked_until": {"$lte": now}}
+                ]
+            },
+            {"$set": {"status": "running", "owner": uuid.uuid4().hex, "locked_until": now + timedelta(seconds=self._lease_seconds)}},
+            sort=[("next_run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if job:
+            # 조회 중에 다른 작업이 같은 종류의 자리를 가져갔더라도 한 번은 초과 허용
+            self._running[job["kind"]] += 1
+        return job
+
+    def _owned(self, job: Dict) -> Dict:
+        return {"_id": job["_id"], "owner": job["owner"]}
+
+    async def _process(self, job: Dict):
+        kind = job["kind"]
+        started = time.monotonic()
+        heartbeat = asyncio.create_task(self._extend_lease(job))
+        try:
+            try:
+                await self._handlers[kind](job["payload"])
+            finally:
+                heartbeat.cancel()
+                try:
+                    await heartbeat
+                except asyncio.CancelledError:
+                    # 워커 자신이 취소된 경우(stop)는 그대로 전달
+                    if asyncio.current_task().cancelling():
+                        raise
+            result = await self.jobs.delete_one(self._owned(job))
+            if not result.deleted_count:
+                self._logger.warning(f"임대를 잃은 후속 작업의 완료는 기록하지 않습니다: {kind} {job['_id']}")
+            OUTBOX_JOBS_TOTAL.labels(kind=kind, result="success").inc()
+            OUTBOX_JOB_LATENCY.labels(kind=kind).observe((datetime.now() - job["created_at"]).total_seconds())
+
+        except Exception as e:
+            attempts = job.get("attempts", 0) + 1
+            if attempts >= self._max_attempts:
+                await self._dead_letter(job, attempts, e)
+            else:
+                delay = min(self._backoff_base * (2 ** (attempts - 1)), self._backoff_max)
+                await self.jobs.update_one(
+                    self._owned(job),
+                    {"$set": {
+                        "status": "pending",
+                        "attempts": attempts,
+                        "last_error": str(e),
+                        "next_run_at": datetime.now() + timedelta(seconds=delay)
+                    }, "$unset": {"locked_until": "", "owner": ""}}
+                )
+                OUTBOX_JOBS_TOTAL.labels(kind=kind, result="retry").inc()
+                self._logger.warning(f"후속 작업 재시도 예정({kind}, {attempts}회, {delay}초 후): {job['payload']} {e}")
+        finally:
+            self._running[kind] -= 1
+            OUTBOX_JOB_DURATION.labels(kind=kind).observe(time.monotonic() - started)
+
+    # 실행하는 동안 임대 기간의 1/3 마다 임대 연장 (처리가 길어져도 다른 워커가 가져가지 않도록)
+    async def _extend_lease(self, job: Dict):
+        while True:
+            await asyncio.sleep(self._lease_seconds / 3)
+            try:
+                result = await self.jobs.update_one(
+                    {**self._owned(job), "status": "running"},
+                    {"$set": {"locked_until": datetime.now() + timedelta(seconds=self._lease_seconds)}}
+                )
+            except Exception as e:
+                # 일시적인 실패는 다음 주기에 다시 연장
+                self._logger.error(f"후속 작업 임대 연장 실패: {job['kind']} {job['_id']} {e}")
+                continue
+            if not result.matched_count:
+                self._logger.warning(f"후속 작업 임대를 잃었습니다: {job['kind']} {job['_id']}")
+                return
+
+    async def _dead_letter(self, job: Dict, attempts: int, error: Exception):
+        owned = self._owned(job)
+        job.update({"attempts": attempts, "last_error": str(error), "dead_at": datetime.now()})
+        job.pop("locked_until", None)
+        job.pop("owner", None)
+        await self.db[self._DEAD_COLLECTION].insert_one(job)
+        if not (await self.jobs.delete_one(owned)).deleted_count:
+            # 다른 워커가 이어받은 작업은 중단하지 않음
+            await self.db[self._DEAD_COLLECTION].delete_one({"_id": job["_id"]})
+            self._logger.warning(f"임대를 잃은 후속 작업은 중단하지 않습니다: {job['kind']} {job['_id']}")
+            return
+        OUTBOX_JOBS_TOTAL.labels(kind=job["kind"], result="dead").inc()
+        self._logger.error(f"후속 작업 실패(재시도 중단): {job['kind']} {job['payload']} {error}")
+
+    # 재시도를 중단한 작업을 다시 대기열로 (관리자 요청)
+    @classmethod
+    async def requeue_dead(cls, db: AsyncIOMotorDatabase, kind: Optional[str] = None) -> int:
+        query = {"kind": kind} if kind else {}
+        requeued = 0
+        async for job in db[cls._DEAD_COLLECTION].find(query):
+            await cls.enqueue(db, job["kind"], job["payload"], dedupe_key=job.get("dedupe_key"))
+            await db[cls._DEAD_COLLECTION].delete_one({"_id": job["_id"]})
+            requeued += 1
+        return requeued
+
+    @classmethod
+    async def backlog(cls, db: AsyncIOMotorDatabase) -> Dict:
+        """종류별 상태별 작업 수 / 가장 오래된 대기 작업 등록 시각 / 중단된 작업 수"""
+        kinds: Dict[str, Dict] = {}
+        pipeline = [{"$group": {"_id": {"kind": "$kind", "status": "$status"}, "count": {"$sum": 1}, "oldest": {"$min": "$created_at"}}}]
+        async for row in db[cls._COLLECTION].aggregate(pipeline):
+            stats = kinds.setdefault(row["_id"]["kind"], {"pending": 0, "running": 0, "dead": 0, "oldest_created_at": None})
+            stats[row["_id"]["status"]] = row["count"]
+            if stats["oldest_created_at"] is None or row["oldest"] < stats["oldest_created_at"]:
+                stats["oldest_created_at"] = row["oldest"]
+        async for row in db[cls._DEAD_COLLECTION].aggregate([{"$group": {"_id": "$kind", "count": {"$sum": 1}}}]):
+            kinds.setdefault(row["_id"], {"pending": 0, "running": 0, "dead": 0, "oldest_created_at": None})["dead"] = row["count"]
+        return kinds
+
+    async def _monitor(self):
+        while True:
+            try:
+                kinds = await self.backlog(self.db)
+                now = datetime.now()
+                for kind in set(self._handlers) | set(kinds):
+                    stats = kinds.get(kind, {})
+                    for status in self._STATUSES:
+                        OUTBOX_BACKLOG.labels(kind=kind, status=status).set(stats.get(status, 0))
+                    OUTBOX_DEAD_LETTERS.labels(kind=kind).set(stats.get("dead", 0))
+                    oldest = stats.get("oldest_created_at")
+                    OUTBOX_OLDEST_PENDING.labels(kind=kind).set((now - oldest).total_seconds() if oldest else 0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error(f"후속 작업 대기열 집계 실패: {e}")
+            await asyncio.sleep(self._poll_interval)
@@ -0,0 +1,168 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from prometheus_client import Counter
+
+from services.outbox import OutboxWorker
+from utils.logger import Logger
+
+
+PURGE_OBJECTS_DELETED_TOTAL = Counter("space_purge_objects_deleted_total", "삭제된 S3 객체 수")
+
+
+class SpacePurgeWorker:
+    """소프트 삭제된 공간의 S3 이미지와 문서를 정리하는 후속 작업(outbox) handler
+
+    작업은 OutboxWorker 의 space_outbox 컬렉션에 저장되고 재시도/중단 처리도 OutboxWorker 가 맡는다.
+    - purge_space: 공간 prefix 전체 삭제 후 문서는 변경 피드용 삭제 표시(purged_at)만 남기고 비움
+    - purge_images: 공간 수정 / 등록 실패로 더 이상 참조되지 않는 이미지 키 삭제
+    """
+
+    _instance: Optional['SpacePurgeWorker'] = None
+
+    # S3 delete_objects 한 번에 지울 수 있는 최대 키 수
+    _S3_DELETE_BATCH = 1000
+
+    def __init__(self, db: AsyncIOMotorDatabase, s3_config: Dict):
+        self.db = db
+        self.s3_client = s3_config["s3_client"]
+        self.bucket = s3_config["bucket"]
+        self._logger = Logger.setup_logger()
+        self._tombstone_retention_days = int(os.getenv("SPACE_TOMBSTONE_RETENTION_DAYS", "30"))
+
+    @classmethod
+    def get_instance(cls, db: AsyncIOMotorDatabase, s3_config: Dict) -> 'SpacePurgeWorker':
+        if cls._instance is None:
+            cls._instance = SpacePurgeWorker(db, s3_config)
+        return cls._instance
+
+    def register(self, outbox: OutboxWorker):
+        outbox.register("purge_space", self._purge_space)
+        outbox.register("purge_images", self._purge_images)
+
+    async def initialize(self):
+        await self.db.spaces.create_index("deleted_at", sparse=True, name="deleted_at")
+        # 변경 피드 소비자가 삭제를 확인할 수 있도록 보관한 삭제 표시는 보관 기간 후 자동 삭제
+        await self.db.spaces.create_index(
+            "purged_at",
+            expireAfterSeconds=self._tombstone_retention_days * 86400,
+            name="purged_at_ttl"
+        )
+        await self._enqueue_missing_jobs()
+
+    # 소프트 삭제 후 작업 등록 전에 프로세스가 종료된 경우를 복구 (트랜잭션 미지원 환경)
+    # 재시도를 중단한 작업은 관리자가 다시 등록할 때까지 제외
+    async def _enqueue_missing_jobs(self):
+        dead = set(await self.db[OutboxWorker._DEAD_COLLECTION].distinct("dedupe_key", {"kind": "purge_space"}))
+        tombstones = self.db.spaces.find({"deleted_at": {"$ne": None}, "purged_at": None}, {"user_id": 1})
+        async for space in tombstones:
+            if self._dedupe_key(str(space["_id"])) not in dead:
+                await self.enqueue(self.db, str(space["_id"]), space["user_id"])
+
+    @staticmethod
+    def _dedupe_key(space_id: str) -> str:
+        return f"purge_space:{space_id}"
+
+    # 삭제 작업 등록 (같은 공간에 대한 중복 등록은 무시)
+    @classmethod
+    async def enqueue(cls, db: AsyncIOMotorDatabase, space_id: str, user_id: str, session: Optional[AsyncIOMotorClientSession] = None):
+        await OutboxWorker.enqueue(
+            db,
+            "purge_space",
+            {"space_id": space_id, "user_id": user_id},
+            session=session,
+            dedupe_key=cls._dedupe_key(space_id)
+        )
+
+    # 더 이상 참조되지 않는 이미지 삭제 작업 등록
+    @classmethod
+    async def enqueue_images(
+        cls,
+        db: AsyncIOMotorDatabase,
+        space_id: str,
+        user_id: str,
+        keys: List[str],
+        session: Optional[AsyncIOMotorClientSession] = None
+    ):
+        await OutboxWorker.enqueue(
+            db,
+            "purge_images",
+            {"space_id": space_id, "user_id": user_id, "keys": keys},
+            session=session
+        )
+
+    async def stop(self):
+        SpacePurgeWorker._instance = None
+
+    async def _purge_space(self, payload: Dict):
+        deleted = await self._purge_objects(f"{payload['user_id']}/{payload['space_id']}/")
+        await self._leave_tombstone(payload["space_id"])
+        self._logger.info(f"이미지 및 공간 삭제 완료: {payload['space_id']} (S3 객체 {deleted}개)")
+
+    async def _purge_images(self, payload: Dict):
+        deleted = await self._delete_unreferenced_images(payload)
+        self._logger.info(f"참조되지 않는 이미지 삭제 완료: {payload['space_id']} (S3 객체 {deleted}개)")
+
+    # 문서 본문을 지우고 삭제 표시만 남김 (updated_at / version 은 소프트 삭제 시점 그대로 유지)
+    async def _leave_tombstone(self, space_id: str):
+        object_id = ObjectId(space_id)
+        space = await self.db.spaces.find_one(
+            {"_id": object_id, "deleted_at": {"$ne": None}, "purged_at": None},
+            {"user_id": 1, "deleted_at": 1, "updated_at": 1, "version": 1}
+        )
+        if not space:
+            return
+        await self.db.spaces.replace_one(
+            {"_id": object_id, "purged_at": None},
+            {
+                "user_id": space["user_id"],
+                "is_operate": False,
+                "deleted_at": space["deleted_at"],
+                "updated_at": space.get("updated_at") or space["deleted_at"],
+                "version": space.get("version", 0),
+                "purged_at": datetime.now()
+            }
+        )
+
+    # 작업 등록 이후 같은 이미지가 다시 등록되었을 수 있으므로 현재 문서가 참조하는 키는 제외하고 삭제
+    async def _delete_unreferenced_images(self, payload: Dict) -> int:
+        space = await self.db.spaces.find_one({"_id": ObjectId(payload["space_id"])}, {"images.filename": 1})
+        referenced = {
+            f"{payload['user_id']}/{payload['space_id']}/{image['filename']}" for image in (space or {}).get("images", [])
+        }
+        keys = [key for key in payload["keys"] if key not in referenced]
+        return await self._delete_keys(keys)
+
+    async def _delete_keys(self, keys: List[str]) -> int:
+        for start in range(0, len(keys), self._S3_DELETE_BATCH):
+            objects = [{"Key": key} for key in keys[start:start + self._S3_DELETE_BATCH]]
+            result = await asyncio.to_thread(
+                self.s3_client.delete_objects,
+                Bucket=self.bucket,
+                Delete={"Objects": objects, "Quiet": True}
+            )
+            if result.get("Errors"):
+                raise RuntimeError(f"S3 객체 삭제 실패: {result['Errors'][0]}")
+            PURGE_OBJECTS_DELETED_TOTAL.inc(len(objects))
+        return len(keys)
+
+    # prefix 아래의 객체를 페이지 단위로 조회하여 일괄 삭제
+    async def _purge_objects(self, prefix: str) -> int:
+        deleted = 0
+        continuation_token = None
+
+        while True:
+            params = {"Bucket": self.bucket, "Prefix": prefix, "MaxKeys": self._S3_DELETE_BATCH}
+            if continuation_token:
+                params["ContinuationToken"] = continuation_token
+            response = await asyncio.to_thread(self.s3_client.list_objects_v2, **params)
+
+            deleted += await self._delete_keys([obj["Key"] for obj in response.get("Contents", [])])
+
+            if not response.get("IsTruncated"):
+                return deleted
+            continuation_token = response.get("NextContinuationToken")
@@ -1,16 +1,29 @@
+import hashlib
 import logging
 import os
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from bson import ObjectId
-from fastapi import Depends, HTTPException, Query, status
+from bson.errors import InvalidId
+from fastapi import Depends, HTTPException, Query, UploadFile, status
 
 from enums.space_type import SpaceType
-from schemas.space_request import SpaceRequest, SpaceUpdateRequest
+from schemas.space_request import SpaceMetadataUpdateRequest, SpaceRequest, SpaceUpdateRequest
 from schemas.space_response import SpaceResponse
 from services.aws_service import AWSService, get_aws_service
+from services.facet_service import SpaceFacetService
+from services.geo_index_service import SpaceGeoIndex
+from services.outbox import OutboxWorker
+from services.purge_worker import SpacePurgeWorker
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from utils import geohash
+from utils.conditional import Validators, list_validators, space_validators
+from utils.cursor import decode_cursor, encode_cursor
+from utils.deadline import check_deadline, max_time_ms
+from utils.metrics import record_documents, record_s3, stage
 from utils.mongodb import get_mongodb
+from utils.type.space_record_type import MySpaceRecord, SpaceListRecord
 
 
 async def get_space_service(db: AsyncIOMotorDatabase = Depends(get_mongodb), aws_service: AWSService = Depends(get_aws_service)):
@@ -20,8 +33,26 @@ class SpaceService:
     
     # 이미지 확장자 목록
     _ALLOWED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}
+    _HASH_CHUNK_SIZE = 1024 * 1024
     _logger = logging.getLogger()
 
+    # 조건부 요청(ETag/Last-Modified) 확인 시 필요한 필드
+    _VALIDATOR_PROJECTION = {"version": 1, "updated_at": 1, "created_at": 1}
+
+    # 지도 줌 레벨별 클러스터 geohash 길이 (SPACE_MAP_LEAF_ZOOM 이상은 개별 공간)
+    _ZOOM_PRECISIONS = ((3, 1), (5, 2), (8, 3), (10, 4), (13, 5), (15, 6), (17, 7))
+    _MAP_SPACE_PROJECTION = {"space_name": 1, "unit_price": 1, "user_id": 1, "location.coordinates": 1, "images": {"$slice": 1}}
+
+    # $geoNear 결과에서 목록 응답에 필요한 필드 (aggregate $project 는 $slice 를 식으로 지정)
+    _NEARBY_PROJECTION = {
+        **{field: 1 for field in SpaceListRecord.PROJECTION if field != "images"},
+        "images": {"$slice": ["$images", 1]},
+        "distance": 1
+    }
+
+    # 타입 × 시도 집계(space_facets) 증감 / 위치 인덱스 반영에 필요한 변경 전 필드
+    _CHANGE_PROJECTION = {"space_type": 1, "location.sido": 1, "location.coordinates": 1, "is_operate": 1, "unit_price": 1}
+
     def __init__(self, db: AsyncIOMotorDatabase, aws_service:AWSService):
         self.db = db
         aws_service = get_aws_service()
@@ -30,44 +61,174 @@ class SpaceService:
     def _allowed_file(self, filename: str) -> bool:
         return '.' in filename and os.path.splitext(filename)[1].lower() in self._ALLOWED_EXTENSIONS
 
+    def _validate_images(self, images: List[UploadFile]):
+        for image in images:
+            if not self._allowed_file(image.filename):
+                self._logger.error(f"{image.filename}은 지원하지 않는 이미지 형식입니다.")
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{image.filename}은 지원하지 않는 이미지 형식입니다.")
+
+    # 업로드된 임시 파일을 청크 단위로 읽어 SHA-256 계산 (이미지 동일성 판단 기준)
+    def _hash_image(self, image: UploadFile) -> str:
+        digest = hashlib.sha256()
+        image.file.seek(0)
+        for chunk in iter(lambda: image.file.read(self._HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        image.file.seek(0)
+        return digest.hexdigest()
+
+    def _image_entry(self, image: UploadFile, digest: str) -> Dict:
+        file_extension = os.path.splitext(image.filename)[1].lower()
+        return {
+            "filename": f"{digest}{file_extension}", # 예: {sha256}.png
+            "original_filename": image.filename,
+            "sha256": digest,
+            "size": image.size
+        }
+
+    # ACL 을 업로드 요청에 함께 지정하여 put_object_acl 호출을 생략
+    def _upload_image(self, operation: str, image: UploadFile, path: str):
+        # 요청 기한이 지났으면 업로드를 시작하지 않음 (S3 호출 자체는 클라이언트 timeout 적용)
+        check_deadline()
+        with stage(operation, "s3_upload"):
+            self.s3["s3_client"].upload_fileobj(
+                image.file,
+                self.s3["bucket"],
+                path,
+                ExtraArgs={"ACL": "public-read", "ContentType": image.content_type or "application/octet-stream"}
+            )
+            record_s3(operation, "upload", image.size or 0)
+
+    # 실패한 요청에서 새로 올린 이미지만 정리
+    def _delete_uploaded(self, operation: str, paths: List[str]):
+        if not paths:
+            return
+        try:
+            with stage(operation, "s3_delete"):
+                self.s3["s3_client"].delete_objects(
+                    Bucket=self.s3["bucket"],
+                    Delete={"Objects": [{"Key": path} for path in paths], "Quiet": True}
+                )
+                record_s3(operation, "delete_objects")
+        except Exception as e:
+            self._logger.error(f"업로드된 이미지 정리 중 오류가 발생했습니다.{paths} {e}")
+
+    def _image_url(self, user_id: str, space_id: str, filename: str) -> str:
+        return f"https://{self.s3['bucket']}.s3.{os.getenv('REGION_NAME')}.amazonaws.com/{user_id}/{space_id}/{filename}"
+
+    # 가공 전 문서(_id)의 첫 번째 이미지 URL
+    def _first_image_url(self, space: Dict) -> Optional[str]:
+        images = space.get('images')
+        if not images:
+            return None
+        return self._image_url(space['user_id'], str(space['_id']), images[0]['filename'])
+
+    def _thumbnail_url(self, space: Dict) -> Optional[str]:
+        images = space.get('images')
+        if not images:
+            return None
+        return self._image_url(space['user_id'], space['space_id'], images[0]['filename'])
+
+    # 지도 클러스터 조회 기준 (location.coordinates 는 경도, 위도 순서)
+    @staticmethod
+    def geohash_of(location: Dict) -> str:
+        longitude, latitude = location["coordinates"][:2]
+        return geohash.encode(latitude, longitude)
+
+    # 변경 전 문서(_CHANGE_PROJECTION)에 수정 내용을 반영한 집계/위치 인덱스용 문서
+    @staticmethod
+    def _after_update(previous_space: Dict, update_data: Dict) -> Dict:
+        after = dict(previous_space)
+        for field in ("space_type", "is_operate", "unit_price"):
+            if field in update_data:
+                after[field] = update_data[field]
+        if "location" in update_data:
+            after["location"] = update_data["location"]
+        return after
+
+    # 수정 시각과 버전을 함께 갱신 (ETag 계산 기준)
+    @staticmethod
+    def _with_revision(update: Dict) -> Dict:
+        update.setdefault("$set", {})["updated_at"] = datetime.now()
+        update.setdefault("$inc", {})["version"] = 1
+        return update
+
+    def _object_id(self, space_id: str) -> ObjectId:
+        try:
+            return ObjectId(space_id)
+        except (InvalidId, TypeError):
+            self._logger.error(f"유효하지 않은 공간입니다.{space_id}")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="공간을 찾을 수 없습니다.")
+
+    # 본인 소유 공간만 한 번의 조회로 가져오고, 실패한 경우에만 존재 여부를 확인
+    async def _find_owned_space(self, space_id: str, user_id: str, projection: Optional[Dict], forbidden_detail: str) -> Dict:
+        object_id = self._object_id(space_id)
+        existing_space = await self.db.spaces.find_one({"_id": object_id, "user_id": user_id, "deleted_at": None}, projection, max_time_ms=max_time_ms())
+        if existing_space:
+            return existing_space
+
+        await self._raise_not_owned(object_id, space_id, user_id, forbidden_detail)
+
+    async def _raise_not_owned(self, object_id: ObjectId, space_id: str, user_id: str, forbidden_detail: str):
+        if await self.db.spaces.count_documents({"_id": object_id, "deleted_at": None}, limit=1):
+            self._logger.error(f"{forbidden_detail}{user_id}")
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=forbidden_detail)
+
+        self._logger.error(f"공간을 찾을 수 없습니다.{space_id}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="공간을 찾을 수 없습니다.")
+
 
 
     # 공간 등록
     async def create_space(self, space: SpaceRequest):
+        operation = "create_space"
+        self._validate_images(space.images)
+
         # 1차적인 공간 저장
         space_dict = space.model_dump(exclude={"images"})
         space_dict["is_operate"] = True
+        space_dict["updated_at"] = space_dict["created_at"]
+        space_dict["version"] = 1
+        space_dict["geohash"] = self.geohash_of(space_dict["location"])
         
-        result = await self.db.spaces.insert_one(space_dict)
+        with stage(operation, "db_insert"):
+            result = await self.db.spaces.insert_one(space_dict)
         space_id = result.inserted_id
 
-        s3_client = self.s3["s3_client"]
-        bucket_name = self.s3["bucket"]
-
+        uploaded_paths = []
         try:
-            # s3 이미지 업로드
-            image_urls = []
-            for idx, image in enumerate(space.images):
-                if not self._allowed_file(image.filename):
-                    self._logger.error(f"{image.filename}은 지원하지 않는 이미지 형식입니다.")
-                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{image.filename}은 지원하지 않는 이미지 형식입니다.")
-                
-                file_extension = os.path.splitext(image.filename)[1]
-                path = f"{space.user_id}/{space_id}/{idx}{file_extension}" # 예: user_id/{space_id}/0.png
-
-                s3_client.upload_fileobj(image.file, bucket_name, path)
-                image_urls.append({
-                    "filename": f"{idx}{file_extension}",
-                    "original_filename": image.filename
-                })
-
-                s3_client.put_object_acl(Bucket=bucket_name, Key=path, ACL='public-read')
-
-            # 이미지 데이터 업데이트
-            await self.db.spaces.update_one({"_id": space_id}, {"$set": {"images": image_urls}})
+            # s3 이미지 업로드 (같은 내용의 이미지는 한 번만 저장)
+            image_entries = []
+            digests = set()
+            for image in space.images:
+                with stage(operation, "hashing"):
+                    digest = self._hash_image(image)
+                if digest in digests:
+                    continue
+                digests.add(digest)
+
+                entry = self._image_entry(image, digest)
+                path = f"{space.user_id}/{space_id}/{entry['filename']}" # 예: user_id/{space_id}/{sha256}.png
+                self._upload_image(operation, image, path)
+                uploaded_paths.append(path)
+                image_entries.append(entry)
+
+            # 이미지 데이터 업데이트 (집계 갱신은 같은 트랜잭션으로 후속 작업 등록)
+            async def save_images(session):
+                await self.db.spaces.update_one({"_id": space_id}, {"$set": {"images": image_entries}}, session=session)
+                with stage(operation, "enqueue"):
+                    await SpaceFacetService.apply_created(self.db, [space_dict], session=session)
+
+            with stage(operation, "db_update"):
+                await OutboxWorker.run_in_transaction(self.db, save_images)
             self._logger.info(f"이미지 업로드 성공")
+            SpaceGeoIndex.apply([space_dict])
 
+        except HTTPException:
+            self._delete_uploaded(operation, uploaded_paths)
+            await self.db.spaces.delete_one({"_id": space_id})
+            raise
         except Exception as e:
+            self._delete_uploaded(operation, uploaded_paths)
             await self.db.spaces.delete_one({"_id": space_id})
             self._logger.error(f"이미지 업로드 중 오류가 발생했습니다.{space_id}")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"이미지 업로드 중 오류가 발생했습니다.{e}")
@@ -82,10 +243,22 @@ class SpaceService:
         limit: int = Query(default=10, ge=1, le=100),
         space_type: Optional[SpaceType] = None,
         sido: Optional[str] = None
-    ) -> List[Dict]:
-        query = {"is_operate" : True}
+    ) -> List[SpaceListRecord]:
+        operation = "get_spaces"
+        query = self._spaces_query(space_type, sido)
+
+        with stage(operation, "db_query"):
+            result_cursor = self.db.spaces.find(query, SpaceListRecord.PROJECTION, max_time_ms=max_time_ms()).sort({ "created_at": -1 }).skip(skip).limit(limit)
+            spaces = await result_cursor.to_list()
+            record_documents(operation, len(spaces))
+
+        with stage(operation, "shaping"):
+            return [SpaceListRecord.from_document(space, self._first_image_url(space)) for space in spaces]
 
-        bucket_name = self.s3["bucket"]
+
+    @staticmethod
+    def _spaces_query(space_type: Optional[SpaceType], sido: Optional[str]) -> Dict:
+        query = {"is_operate" : True}
 
         if space_type:
             query["space_type"] = space_type
@@ -93,139 +266,378 @@ class SpaceService:
         if sido:
             query["location.sido"] = sido
 
-        result_cursor = self.db.spaces.find(query).sort({ "created_at": -1 }).skip(skip).limit(limit)
-        spaces = await result_cursor.to_list()
+        return query
+
+
+    # 공간 목록의 버전 정보만 조회 (If-None-Match 확인용)
+    async def get_spaces_validators(self, skip: int, limit: int, space_type: Optional[SpaceType], sido: Optional[str]) -> Validators:
+        with stage("get_spaces", "db_version_check"):
+            result_cursor = self.db.spaces.find(self._spaces_query(space_type, sido), self._VALIDATOR_PROJECTION, max_time_ms=max_time_ms()).sort({ "created_at": -1 }).skip(skip).limit(limit)
+            spaces = await result_cursor.to_list(length=limit)
+        return list_validators(self.spaces_list_key(skip, limit, space_type, sido), spaces)
 
-        for space in spaces:
-            space['space_id'] = str(space['_id'])
-            space['thumbnail'] = f"https://{bucket_name}.s3.{os.getenv('REGION_NAME')}.amazonaws.com/{space['user_id']}/{space['space_id']}/{space['images'][0]['filename']}"
-            del space['_id']
+    @staticmethod
+    def spaces_list_key(skip: int, limit: int, space_type: Optional[SpaceType], sido: Optional[str]) -> str:
+        return f"{skip}:{limit}:{space_type.value if space_type else ''}:{sido or ''}"
 
-        return spaces
+
+    # 내 공간 목록 조회 (운영 중단된 공간 포함)
+    async def get_my_spaces(self, user_id: str, cursor: Optional[str] = None, limit: int = 20) -> Tuple[List[MySpaceRecord], Optional[str]]:
+        operation = "get_my_spaces"
+        query = {"user_id": user_id, "deleted_at": None}
+
+        # (created_at, _id) 내림차순 기준으로 커서 이후의 문서만 조회
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}}
+            ]
+
+        with stage(operation, "db_query"):
+            result_cursor = self.db.spaces.find(query, MySpaceRecord.PROJECTION, max_time_ms=max_time_ms()).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1)
+            spaces = await result_cursor.to_list(length=limit + 1)
+            record_documents(operation, len(spaces))
+
+        next_cursor = None
+        if len(spaces) > limit:
+            spaces = spaces[:limit]
+            next_cursor = encode_cursor(spaces[-1]['created_at'], spaces[-1]['_id'])
+
+        with stage(operation, "shaping"):
+            return [MySpaceRecord.from_document(space, self._first_image_url(space)) for space in spaces], next_cursor
+
+
+    # 특정 공간의 버전 정보만 조회 (If-None-Match 확인용, 문서 본문은 가져오지 않음)
+    async def get_space_validators(self, space_id: str) -> Optional[Validators]:
+        with stage("get_space", "db_version_check"):
+            space = await self.db.spaces.find_one({"_id": self._object_id(space_id), "is_operate": True}, self._VALIDATOR_PROJECTION, max_time_ms=max_time_ms())
+        return space_validators(space) if space else None
 
 
     # 특정 공간 조회
     async def get_space(self, space_id: str) -> SpaceResponse:
-        bucket_name = self.s3["bucket"]
-        space = await self.db.spaces.find_one({"_id": ObjectId(space_id), "is_operate": True})
+        operation = "get_space"
+
+        with stage(operation, "db_query"):
+            space = await self.db.spaces.find_one({"_id": self._object_id(space_id), "is_operate": True}, max_time_ms=max_time_ms())
+            record_documents(operation, 1 if space else 0)
         if not space:
             self._logger.error(f"공간을 찾을 수 없습니다.{space_id}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="공간을 찾을 수 없습니다.")
                     
+        with stage(operation, "shaping"):
+            return self.shape_space(space)
+
+    # 공간 문서를 응답 형태로 변환 (이미지는 URL 목록으로)
+    def shape_space(self, space: Dict) -> Dict:
         space['space_id'] = str(space['_id'])
-        images = []
-        for image in space['images']:
-            images.append(f"https://{bucket_name}.s3.{os.getenv('REGION_NAME')}.amazonaws.com/{space['user_id']}/{space['space_id']}/{image['filename']}")
+        images = [self._image_url(space['user_id'], space['space_id'], image['filename']) for image in space.get('images', [])]
         del space['_id']
         space['images'] = images
-
         return space
 
 
-    # 공간 수정
+    # 공간 수정 (내용이 같은 이미지는 유지하고 새 이미지만 업로드, 제외된 이미지 삭제는 후속 작업으로 등록)
     async def update_spaces(self, user_id: str, space_id: str, space: SpaceUpdateRequest):
-        existing_space = await self.db.spaces.find_one({"_id": ObjectId(space_id)})
-
-        if not existing_space:
-            self._logger.error(f"공간을 찾을 수 없습니다.{space_id}")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="공간을 찾을 수 없습니다.")
-        if user_id != existing_space["user_id"]:
-            self._logger.error(f"본인 공간만 수정 가능합니다.{user_id}")
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="본인 공간만 수정 가능합니다.")
-    
-        # 기존 이미지 삭제
-        existing_image_paths = [f"{user_id}/{space_id}/{img['filename']}" for img in existing_space['images']]
-        s3_client = self.s3["s3_client"]
-        bucket_name = self.s3["bucket"]
-
-        for image_path in existing_image_paths:
-            s3_client.delete_object(Bucket=bucket_name, Key=image_path)
-            
-        self._logger.error(f"기존 이미지 삭제 완료")
-
+        operation = "update_spaces"
+        self._validate_images(space.images)
+
+        with stage(operation, "db_query"):
+            existing_space = await self._find_owned_space(space_id, user_id, {"images": 1}, "본인 공간만 수정 가능합니다.")
+
+        existing_images = existing_space.get('images', [])
+        images_by_filename = {image['filename']: image for image in existing_images}
+        images_by_digest = {image['sha256']: image for image in existing_images if image.get('sha256')}
+
+        image_entries = []
+        identities = set()
+
+        # 유지할 기존 이미지 (파일 재전송 없이 순서 지정)
+        for filename in space.keep_images or []:
+            image = images_by_filename.get(filename)
+            if image is None:
+                self._logger.error(f"존재하지 않는 이미지입니다.{filename}")
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"존재하지 않는 이미지입니다.{filename}")
+            identity = image.get('sha256') or image['filename']
+            if identity not in identities:
+                identities.add(identity)
+                image_entries.append(image)
+
+        # 전송된 이미지 중 기존에 없는 내용만 업로드 대상
+        uploads = []
+        for image in space.images:
+            with stage(operation, "hashing"):
+                digest = self._hash_image(image)
+            if digest in identities:
+                continue
+            identities.add(digest)
+
+            if digest in images_by_digest:
+                image_entries.append(images_by_digest[digest])
+                continue
+            entry = self._image_entry(image, digest)
+            image_entries.append(entry)
+            uploads.append((image, entry))
+
+        if not image_entries:
+            self._logger.error(f"이미지를 등록해야 합니다.{user_id}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미지를 등록해야 합니다.")
+
+        kept_filenames = {image['filename'] for image in image_entries}
+        removed_paths = [f"{user_id}/{space_id}/{image['filename']}" for image in existing_images if image['filename'] not in kept_filenames]
+
+        uploaded_paths = []
         try:
-            # 받아온 이미지 업로드
-            image_urls = []
-            if not space.images:
-                self._logger.error(f"이미지를 등록해야 합니다.{user_id}")
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미지를 등록해야 합니다.")
-            
-            # 1차적으로 지원하는 이미지 형식인지 확인하고 업로드
-            for image in space.images:
-                if not self._allowed_file(image.filename):
-                    self._logger.error(f"{image.filename}은 지원하지 않는 이미지 형식입니다.")
-                    raise HTTPException(status_code=400, detail=f"{image.filename}은 지원하지 않는 이미지 형식입니다.")
-                
-            for idx, image in enumerate(space.images):
-                file_extension = os.path.splitext(image.filename)[1]
-                path = f"{user_id}/{space_id}/{idx}{file_extension}" # 예: user_id/space_id/0.png
-
-                s3_client.upload_fileobj(image.file, bucket_name, path)
-                image_urls.append({
-                    "filename": f"{idx}{file_extension}",
-                    "original_filename": image.filename
-                })
-
-            self._logger.info(f"수정된 이미지 업로드 완료")
-
-            update_data = space.model_dump(exclude_unset=True)
-            if image_urls:
-                update_data['images'] = image_urls
-            await self.db.spaces.update_one({"_id": ObjectId(space_id)}, {"$set": update_data})
-
+            for image, entry in uploads:
+                path = f"{user_id}/{space_id}/{entry['filename']}" # 예: user_id/space_id/{sha256}.png
+                self._upload_image(operation, image, path)
+                uploaded_paths.append(path)
+
+            update_data = space.model_dump(exclude_unset=True, exclude={"images", "keep_images"})
+            update_data['images'] = image_entries
+
+            async def save_update(session):
+                nonlocal uploaded_paths
+                previous_space = await self.db.spaces.find_one_and_update(
+                    {"_id": existing_space["_id"], "user_id": user_id, "deleted_at": None},
+                    self._with_revision({"$set": update_data}),
+                    projection=self._CHANGE_PROJECTION,
+                    session=session
+                )
+                if previous_space is None:
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="공간을 찾을 수 없습니다.")
+                if session is None:
+                    # 트랜잭션 없이 이미 저장되었으므로 이후 등록이 실패해도 업로드한 이미지는 유지
+                    uploaded_paths = []
+
+                after_space = self._after_update(previous_space, update_data)
+                with stage(operation, "enqueue"):
+                    if removed_paths:
+                        await SpacePurgeWorker.enqueue_images(self.db, space_id, user_id, removed_paths, session=session)
+                    await SpaceFacetService.apply_change(self.db, previous_space, after_space, session=session)
+                return after_space
+
+            with stage(operation, "db_update"):
+                after_space = await OutboxWorker.run_in_transaction(self.db, save_update)
+
+        except HTTPException:
+            self._delete_uploaded(operation, uploaded_paths)
+            raise
         except Exception as e:
-            await self.db.spaces.delete_one({"_id": space_id})
+            self._delete_uploaded(operation, uploaded_paths)
             self._logger.error(f"이미지 업로드 중 오류가 발생했습니다.{space_id}")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"이미지 업로드 중 오류가 발생했습니다.{e}")
-        
 
-    # 공간 삭제
-    async def delete_space(self, space_id: str, user_id: str):
-        existing_space = await self.db.spaces.find_one({"_id": ObjectId(space_id)})
+        SpaceGeoIndex.apply([after_space])
 
-        if not existing_space:
-            self._logger.error(f"유효하지 않은 공간입니다.{space_id}")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="공간을 찾을 수 없습니다.")
-        
-        if existing_space['user_id'] != user_id:
-            self._logger.error(f"본인 공간만 삭제할 수 있습니다.{user_id}")
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="본인 공간만 삭제할 수 있습니다.")
-        
-        # 이미지 삭제
-        path = f"{user_id}/{space_id}"
-        s3_client = self.s3["s3_client"]
-        bucket_name = self.s3["bucket"]
-
-        response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=path)
-
-        if 'Contents' in response:
-            for obj in response['Contents']:
-                s3_client.delete_object(Bucket=bucket_name, Key=obj['Key'])
-
-        await self.db.spaces.delete_one({"_id": ObjectId(space_id)})
-        self._logger.info(f"이미지 및 공간 삭제 완료: {space_id}")
-
-    # 위치 기준 데이터 가져오기
-    async def get_nearby_spaces(self, longitude: float, latitude: float, radius: float) -> List[Dict]:
-        nearby_space_cursor = self.db.spaces.find({
-            "location": {
-                "$near": {
-                    "$geometry": {
-                        "type": "Point",
-                        "coordinates": [longitude, latitude]
-                    },
-                    "$maxDistance": radius * 1000 # km 변환
-                }
+        self._logger.info(f"공간 수정 완료: {space_id} (업로드 {len(uploads)}개, 유지 {len(image_entries) - len(uploads)}개, 삭제 예약 {len(removed_paths)}개)")
+
+
+    # 공간 정보 수정 (이미지 변경 없이 JSON 으로 전달된 항목만 수정)
+    async def update_space_metadata(self, user_id: str, space_id: str, space: SpaceMetadataUpdateRequest):
+        operation = "update_space_metadata"
+        update_data = space.model_dump(exclude_unset=True, exclude_none=True)
+        if not update_data:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="수정할 항목이 없습니다.")
+
+        object_id = self._object_id(space_id)
+
+        async def save_update(session):
+            previous_space = await self.db.spaces.find_one_and_update(
+                {"_id": object_id, "user_id": user_id, "deleted_at": None},
+                self._with_revision({"$set": update_data}),
+                projection=self._CHANGE_PROJECTION,
+                session=session
+            )
+            if previous_space is None:
+                await self._raise_not_owned(object_id, space_id, user_id, "본인 공간만 수정 가능합니다.")
+
+            after_space = self._after_update(previous_space, update_data)
+            with stage(operation, "enqueue"):
+                await SpaceFacetService.apply_change(self.db, previous_space, after_space, session=session)
+            return after_space
+
+        with stage(operation, "db_update"):
+            after_space = await OutboxWorker.run_in_transaction(self.db, save_update)
+        SpaceGeoIndex.apply([after_space])
+
+
+    # 공간 삭제 (소프트 삭제와 같은 트랜잭션으로 이미지/문서 정리 작업 등록)
+    async def delete_space(self, space_id: str, user_id: str):
+        operation = "delete_space"
+        object_id = self._object_id(space_id)
+
+        async def soft_delete(session):
+            deleted_space = await self.db.spaces.find_one_and_update(
+                {"_id": object_id, "user_id": user_id, "deleted_at": None},
+                self._with_revision({"$set": {"is_operate": False, "deleted_at": datetime.now()}}),
+                projection=self._CHANGE_PROJECTION,
+                session=session
+            )
+            if not deleted_space:
+                await self._raise_not_owned(object_id, space_id, user_id, "본인 공간만 삭제할 수 있습니다.")
+
+            with stage(operation, "enqueue"):
+                await SpaceFacetService.apply_change(self.db, deleted_space, None, session=session)
+                await SpacePurgeWorker.enqueue(self.db, space_id, user_id, session=session)
+
+        with stage(operation, "db_update"):
+            await OutboxWorker.run_in_transaction(self.db, soft_delete)
+        SpaceGeoIndex.remove(object_id)
+        self._logger.info(f"공간 삭제 처리 완료(이미지 정리 예약): {space_id}")
+
+    # 타입 / 시도별 공간 수 (집계 문서 하나만 조회)
+    async def get_facets(self) -> Dict:
+        with stage("get_facets", "db_query"):
+            return await SpaceFacetService.get_counts(self.db)
+
+    # 지도 화면 조회 (줌 레벨에 맞는 geohash 칸별 클러스터, 최대 확대 시 개별 공간)
+    async def get_map(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int) -> Dict:
+        operation = "get_map"
+        max_cells = int(os.getenv("SPACE_MAP_MAX_CELLS", "256"))
+        leaf_zoom = int(os.getenv("SPACE_MAP_LEAF_ZOOM", "17"))
+        max_spaces = int(os.getenv("SPACE_MAP_MAX_SPACES", "300"))
+
+        if zoom >= leaf_zoom:
+            spaces = await self._map_spaces(operation, min_lon, min_lat, max_lon, max_lat, max_spaces, max_cells)
+            if spaces is not None:
+                return {"precision": geohash.STORED_PRECISION, "spaces": spaces}
+
+        precision = next((precision for max_zoom, precision in self._ZOOM_PRECISIONS if zoom < max_zoom), self._ZOOM_PRECISIONS[-1][1] + 1)
+        precision = self._fit_precision(min_lon, min_lat, max_lon, max_lat, precision, max_cells)
+
+        pipeline = [
+            {"$match": self._map_match(min_lon, min_lat, max_lon, max_lat, precision)},
+            {"$group": {
+                "_id": {"$substrBytes": ["$geohash", 0, precision]}, # geohash 는 ASCII
+                "count": {"$sum": 1},
+                "longitude": {"$avg": {"$arrayElemAt": ["$location.coordinates", 0]}},
+                "latitude": {"$avg": {"$arrayElemAt": ["$location.coordinates", 1]}},
+                "min_price": {"$min": "$unit_price"}
+            }}
+        ]
+        with stage(operation, "db_aggregate", precision=precision):
+            # maxTimeMS=0 은 제한 없음
+            cells = await self.db.spaces.aggregate(pipeline, maxTimeMS=max_time_ms() or 0).to_list(length=None)
+            record_documents(operation, len(cells))
+
+        clusters = [
+            {
+                "geohash": cell["_id"],
+                "count": cell["count"],
+                "centroid": [cell["longitude"], cell["latitude"]],
+                "min_price": cell["min_price"]
             }
-        })
+            for cell in cells
+        ]
+        return {"precision": precision, "clusters": clusters}
+
+    # 화면에 보이는 칸 수가 max_cells 를 넘지 않도록 geohash 길이 조정
+    @staticmethod
+    def _fit_precision(min_lon: float, min_lat: float, max_lon: float, max_lat: float, precision: int, max_cells: int) -> int:
+        while precision > 1 and geohash.count_cells(min_lon, min_lat, max_lon, max_lat, precision) > max_cells:
+            precision -= 1
+        return precision
+
+    def _map_match(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float, precision: int) -> Dict:
+        # 영역과 겹치는 geohash 칸의 접두어 범위 조회 (geohash 인덱스 사용)
+        ranges = [{"geohash": {"$gte": cell, "$lt": f"{cell}{{"}} for cell in geohash.cells(min_lon, min_lat, max_lon, max_lat, precision)]
+        return {"is_operate": True, "$or": ranges}
+
+    async def _map_spaces(self, operation: str, min_lon: float, min_lat: float, max_lon: float, max_lat: float, max_spaces: int, max_cells: int) -> Optional[List[Dict]]:
+        # 영역 안 공간이 max_spaces 를 넘으면 None (클러스터로 응답)
+        precision = self._fit_precision(min_lon, min_lat, max_lon, max_lat, geohash.STORED_PRECISION, max_cells)
+
+        with stage(operation, "db_query"):
+            cursor = self.db.spaces.find(
+                self._map_match(min_lon, min_lat, max_lon, max_lat, precision),
+                self._MAP_SPACE_PROJECTION,
+                max_time_ms=max_time_ms()
+            )
+            spaces = []
+            async for space in cursor:
+                longitude, latitude = space["location"]["coordinates"][:2]
+                if not (min_lon <= longitude <= max_lon and min_lat <= latitude <= max_lat):
+                    continue
+                if len(spaces) >= max_spaces:
+                    return None
+                space["space_id"] = str(space.pop("_id"))
+                spaces.append(space)
+            record_documents(operation, len(spaces))
+
+        with stage(operation, "shaping"):
+            return [
+                {
+                    "space_id": space["space_id"],
+                    "space_name": space["space_name"],
+                    "unit_price": space["unit_price"],
+                    "coordinates": space["location"]["coordinates"],
+                    "thumbnail": self._thumbnail_url(space)
+                }
+                for space in spaces
+            ]
+
+    # 위치 기준 데이터 가져오기 (가까운 순, distance 는 m 단위)
+    async def get_nearby_spaces(
+        self,
+        longitude: float,
+        latitude: float,
+        radius: float,
+        limit: Optional[int] = None,
+        space_type: Optional[SpaceType] = None,
+        max_price: Optional[int] = None
+    ) -> List[SpaceListRecord]:
+        operation = "get_nearby_spaces"
+
+        geo_index = SpaceGeoIndex.ready()
+        if geo_index:
+            # 메모리 인덱스로 거리/필터를 계산하고 응답할 공간의 문서만 조회
+            with stage(operation, "geo_index", radius_km=radius):
+                hits = geo_index.query(longitude, latitude, radius * 1000, limit, space_type, max_price)
+            with stage(operation, "db_query"):
+                spaces = await self.db.spaces.find(
+                    {"_id": {"$in": [object_id for _, object_id in hits]}, "deleted_at": None},
+                    SpaceListRecord.PROJECTION,
+                    max_time_ms=max_time_ms()
+                ).to_list(length=None)
+                record_documents(operation, len(spaces))
+            spaces_by_id = {space["_id"]: space for space in spaces}
+            with stage(operation, "shaping"):
+                nearby_spaces = []
+                for distance, object_id in hits:
+                    space = spaces_by_id.get(object_id)
+                    if space:
+                        nearby_spaces.append(SpaceListRecord.from_document(space, self._first_image_url(space), distance))
+        else:
+            query = {"deleted_at": None}
+            if space_type:
+                query["space_type"] = space_type.value
+            if max_price is not None:
+                query["unit_price"] = {"$lte": max_price}
+            pipeline = [{
+                "$geoNear": {
+                    "near": {"type": "Point", "coordinates": [longitude, latitude]},
+                    "key": "location",
+                    "distanceField": "distance",
+                    "maxDistance": radius * 1000, # km 변환
+                    "spherical": True,
+                    "query": query
+                }
+            }]
+            if limit:
+                pipeline.append({"$limit": limit})
+            pipeline.append({"$project": self._NEARBY_PROJECTION})
+
+            with stage(operation, "db_query", radius_km=radius):
+                spaces = await self.db.spaces.aggregate(pipeline, maxTimeMS=max_time_ms() or 0).to_list(length=None)
+                record_documents(operation, len(spaces))
+
+            with stage(operation, "shaping"):
+                nearby_spaces = [SpaceListRecord.from_document(space, self._first_image_url(space), space["distance"]) for space in spaces]
 
-        nearby_spaces = await nearby_space_cursor.to_list(length=None)
-        for space in nearby_spaces:
-            space['space_id'] = str(space['_id'])
-            del space['_id']
-            
         if not nearby_spaces:
             self._logger.info(f"인근 공간이 없습니다.")
             self._logger.info(f"lat:{latitude}, long:{longitude}")
             raise HTTPException(status_code=404, detail="인근 공간이 없습니다.")
-        return nearby_spaces
\ No newline at end of file
+        return nearby_spaces
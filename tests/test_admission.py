@@ -0,0 +1,194 @@
+import asyncio
+import heapq
+
+import pytest
+
+from utils.admission import AdmissionLimiter, AdmissionRejected
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _handoff_then_raise(limiter: AdmissionLimiter, error: BaseException):
+    """대기 시간 초과/취소 직전에 release() 로 자리가 넘어온 상황 재현"""
+
+    async def wait_for(aw, timeout):
+        limiter.release()
+        aw.cancel()
+        raise error
+
+    return wait_for
+
+
+def test_acquire_enters_immediately_under_limit():
+    async def run():
+        limiter = AdmissionLimiter("test", 2, 2)
+        await limiter.acquire(0, 1.0)
+        await limiter.acquire(0, 1.0)
+        assert limiter._active == 2
+        assert limiter._queued == 0
+
+    asyncio.run(run())
+
+
+def test_acquire_rejects_when_queue_is_full():
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 1)
+        await limiter.acquire(0, 1.0)
+        queued = asyncio.create_task(limiter.acquire(0, 1.0))
+        await _settle()
+
+        with pytest.raises(AdmissionRejected) as e:
+            await limiter.acquire(0, 1.0)
+        assert e.value.reason == "queue_full"
+
+        limiter.release()
+        await queued
+        assert limiter._active == 1
+        assert limiter._queued == 0
+
+    asyncio.run(run())
+
+
+def test_acquire_rejects_without_waiting_when_timeout_is_spent():
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 1)
+        await limiter.acquire(0, 1.0)
+
+        with pytest.raises(AdmissionRejected) as e:
+            await limiter.acquire(0, 0)
+        assert e.value.reason == "queue_timeout"
+        assert limiter._queued == 0
+
+    asyncio.run(run())
+
+
+def test_acquire_times_out_in_queue():
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 1)
+        await limiter.acquire(0, 1.0)
+
+        with pytest.raises(AdmissionRejected) as e:
+            await limiter.acquire(0, 0.01)
+        assert e.value.reason == "queue_timeout"
+        assert limiter._queued == 0
+
+        # 시간 초과된 대기자에게는 자리가 넘어가지 않음
+        limiter.release()
+        assert limiter._active == 0
+
+    asyncio.run(run())
+
+
+def test_release_hands_off_by_priority_then_arrival():
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 8)
+        await limiter.acquire(0, 1.0)
+
+        order = []
+
+        async def enter(name, priority):
+            await limiter.acquire(priority, 1.0)
+            order.append(name)
+
+        tasks = [
+            asyncio.create_task(enter("upload", 2)),
+            asyncio.create_task(enter("write-1", 1)),
+            asyncio.create_task(enter("read", 0)),
+            asyncio.create_task(enter("write-2", 1)),
+        ]
+        await _settle()
+        assert limiter._queued == 4
+
+        for _ in tasks:
+            limiter.release()
+            await _settle()
+            # 자리를 그대로 넘기므로 처리 중인 수는 유지
+            assert limiter._active == 1
+
+        await asyncio.gather(*tasks)
+        assert order == ["read", "write-1", "write-2", "upload"]
+        assert limiter._queued == 0
+
+        limiter.release()
+        assert limiter._active == 0
+
+    asyncio.run(run())
+
+
+def test_release_skips_cancelled_waiter():
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 2)
+        await limiter.acquire(0, 1.0)
+
+        cancelled = asyncio.create_task(limiter.acquire(0, 1.0))
+        waiting = asyncio.create_task(limiter.acquire(1, 1.0))
+        await _settle()
+
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert limiter._queued == 1
+
+        limiter.release()
+        await waiting
+        assert limiter._active == 1
+        assert limiter._queued == 0
+
+    asyncio.run(run())
+
+
+def test_cancel_racing_handoff_passes_slot_on(monkeypatch):
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 2)
+        await limiter.acquire(0, 1.0)
+
+        next_waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(limiter._waiters, (9, -1, next_waiter))
+        limiter._queued += 1
+
+        monkeypatch.setattr(asyncio, "wait_for", _handoff_then_raise(limiter, asyncio.CancelledError()))
+        with pytest.raises(asyncio.CancelledError):
+            await limiter.acquire(0, 1.0)
+
+        # 취소된 요청이 받은 자리는 다음 대기자에게 넘어감
+        assert next_waiter.done()
+        assert limiter._active == 1
+        assert limiter._queued == 0
+
+    asyncio.run(run())
+
+
+def test_cancel_racing_handoff_frees_slot(monkeypatch):
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 1)
+        await limiter.acquire(0, 1.0)
+
+        monkeypatch.setattr(asyncio, "wait_for", _handoff_then_raise(limiter, asyncio.CancelledError()))
+        with pytest.raises(asyncio.CancelledError):
+            await limiter.acquire(0, 1.0)
+
+        assert limiter._active == 0
+        assert limiter._queued == 0
+
+    asyncio.run(run())
+
+
+def test_timeout_racing_handoff_keeps_slot(monkeypatch):
+    async def run():
+        limiter = AdmissionLimiter("test", 1, 1)
+        await limiter.acquire(0, 1.0)
+
+        monkeypatch.setattr(asyncio, "wait_for", _handoff_then_raise(limiter, asyncio.TimeoutError()))
+        # 자리를 받은 뒤의 시간 초과는 입장으로 처리
+        await limiter.acquire(0, 1.0)
+
+        assert limiter._active == 1
+        assert limiter._queued == 0
+
+        limiter.release()
+        assert limiter._active == 0
+
+    asyncio.run(run())
@@ -0,0 +1,73 @@
+import asyncio
+import random
+
+from jose import jwt
+
+from benchmarks.api_bench import _measure
+from benchmarks.stand_ins import (
+    BENCH_JWT_SECRET,
+    local_backends,
+    make_image_bytes,
+    make_space_documents,
+    make_token,
+    seed_spaces,
+)
+from utils.type.space_record_type import SpaceListRecord
+
+
+def _without_ids(documents):
+    return [{key: value for key, value in document.items() if key not in ("_id", "created_at")} for document in documents]
+
+
+def test_make_space_documents_is_deterministic_per_seed():
+    assert _without_ids(make_space_documents(20, seed=7)) == _without_ids(make_space_documents(20, seed=7))
+    assert _without_ids(make_space_documents(20, seed=7)) != _without_ids(make_space_documents(20, seed=8))
+
+
+def test_make_space_documents_match_list_record():
+    for document in make_space_documents(20):
+        record = SpaceListRecord.from_document(document, None)
+        assert record.location["coordinates"] == document["location"]["coordinates"]
+        assert document["images"]
+
+
+def test_make_token_is_signed_with_bench_secret():
+    claims = jwt.decode(make_token("provider-1"), BENCH_JWT_SECRET, algorithms=["HS256"])
+    assert claims["user_id"] == "provider-1"
+
+
+def test_make_image_bytes_size():
+    data = make_image_bytes(random.Random(1), 1024)
+    assert data.startswith(b"\x89PNG")
+    assert len(data) == 1024 + 8
+
+
+def test_local_backends_seed_and_reset():
+    from utils.mongodb import MongoDB
+
+    async def run():
+        async with local_backends() as backends:
+            assert MongoDB._instance.db is backends["db"]
+            await seed_spaces(backends["db"], 30)
+            assert await backends["db"].spaces.count_documents({}) == 30
+            # 다시 시드하면 이전 데이터는 지워짐
+            await seed_spaces(backends["db"], 10)
+            assert await backends["db"].spaces.count_documents({}) == 10
+            assert backends["s3_client"].list_objects_v2(Bucket="space-place-bench")["KeyCount"] == 0
+        assert MongoDB._instance is None
+
+    asyncio.run(run())
+
+
+def test_measure_reports_request_counts_with_extra_fields():
+    calls = []
+
+    async def request(idx: int) -> int:
+        calls.append(idx)
+        return 500 if idx == 3 else 200
+
+    result = asyncio.run(_measure("scenario", request, 5, 2, 2, dataset_size=10, images=3))
+    assert len(calls) == 7
+    assert result["requests"] == 5 and result["warmup"] == 2
+    assert result["dataset_size"] == 10 and result["images"] == 3
+    assert result["samples"] == 5 and result["errors"] == 1
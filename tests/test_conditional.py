@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from bson import ObjectId
+from starlette.requests import Request
+from starlette.responses import Response
+
+from utils.conditional import (
+    apply_validators,
+    etag_for_encoding,
+    is_not_modified,
+    list_validators,
+    space_validators,
+)
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def _space(updated_at: datetime, version: int = 1) -> dict:
+    return {"_id": ObjectId(), "updated_at": updated_at, "version": version}
+
+
+def _http_date(value: datetime) -> str:
+    # MongoDB 의 naive UTC datetime 을 HTTP 날짜로
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+A, B, C = _space(BASE + timedelta(minutes=5)), _space(BASE + timedelta(minutes=4)), _space(BASE + timedelta(minutes=3))
+
+
+def test_list_ignores_if_modified_since_when_item_leaves_page():
+    before = list_validators("spaces", [A, B])
+    after = list_validators("spaces", [B, C])
+    assert before.etag != after.etag
+    assert not is_not_modified(_request(if_modified_since=_http_date(A["updated_at"])), after)
+
+
+def test_list_response_has_no_last_modified():
+    response = Response()
+    apply_validators(response, list_validators("spaces", [A, B]))
+    assert "last-modified" not in response.headers
+    assert response.headers["etag"]
+
+
+def test_list_if_none_match():
+    validators = list_validators("spaces", [A, B])
+    assert is_not_modified(_request(if_none_match=validators.etag), validators)
+    assert not is_not_modified(_request(if_none_match=list_validators("spaces", [B, C]).etag), validators)
+
+
+def test_if_none_match_strips_encoding_suffixes():
+    validators = space_validators(A)
+    for encoding in ("gzip", "br"):
+        tag = etag_for_encoding(validators.etag, encoding)
+        assert tag != validators.etag
+        assert is_not_modified(_request(if_none_match=tag), validators)
+        assert is_not_modified(_request(if_none_match=f'"other", W/{tag}'), validators)
+    assert not is_not_modified(_request(if_none_match=etag_for_encoding(space_validators(B).etag, "gzip")), validators)
+
+
+def test_space_if_modified_since():
+    validators = space_validators(A)
+    at = _http_date(A["updated_at"])
+    earlier = _http_date(A["updated_at"] - timedelta(seconds=1))
+
+    assert is_not_modified(_request(if_modified_since=at), validators)
+    assert not is_not_modified(_request(if_modified_since=earlier), validators)
+    # If-None-Match 가 있으면 If-Modified-Since 는 무시
+    assert not is_not_modified(_request(if_none_match='"other"', if_modified_since=at), validators)
@@ -0,0 +1,184 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from benchmarks.stand_ins import local_backends
+from services.idempotency_service import IdempotencyService
+
+
+USER_ID = "provider-1"
+KEY = "key-1"
+RECORD_ID = f"{USER_ID}:{KEY}"
+
+
+def _run_with_service(test, monkeypatch, wait_seconds: str = "1"):
+    monkeypatch.setenv("SPACE_IDEMPOTENCY_WAIT_SECONDS", wait_seconds)
+
+    async def run():
+        async with local_backends() as backends:
+            await test(IdempotencyService(backends["db"]))
+
+    asyncio.run(run())
+
+
+def _counting_handler(status_code=201, body=None, error=None):
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        if error is not None:
+            raise error
+        return status_code, body or {"space_id": "space-1"}
+
+    return handler, calls
+
+
+def test_execute_replays_stored_response(monkeypatch):
+    async def test(service):
+        handler, calls = _counting_handler()
+        fingerprint = IdempotencyService.fingerprint({"space_name": "a"})
+
+        assert await service.execute(USER_ID, KEY, fingerprint, handler) == (201, {"space_id": "space-1"}, False)
+        assert await service.execute(USER_ID, KEY, fingerprint, handler) == (201, {"space_id": "space-1"}, True)
+        assert len(calls) == 1
+
+    _run_with_service(test, monkeypatch)
+
+
+def test_execute_rejects_different_payload_with_same_key(monkeypatch):
+    async def test(service):
+        handler, calls = _counting_handler()
+        await service.execute(USER_ID, KEY, IdempotencyService.fingerprint({"space_name": "a"}), handler)
+
+        with pytest.raises(HTTPException) as e:
+            await service.execute(USER_ID, KEY, IdempotencyService.fingerprint({"space_name": "b"}), handler)
+        assert e.value.status_code == 422
+        assert len(calls) == 1
+
+    _run_with_service(test, monkeypatch)
+
+
+def test_retry_waits_for_in_progress_request(monkeypatch):
+    async def test(service):
+        started = asyncio.Event()
+        finish = asyncio.Event()
+        calls = []
+
+        async def slow_handler():
+            calls.append(1)
+            started.set()
+            await finish.wait()
+            return 201, {"space_id": "space-1"}
+
+        first = asyncio.create_task(service.execute(USER_ID, KEY, "fp", slow_handler))
+        await started.wait()
+        retry = asyncio.create_task(service.execute(USER_ID, KEY, "fp", slow_handler))
+        await asyncio.sleep(0.05)
+        finish.set()
+
+        assert await first == (201, {"space_id": "space-1"}, False)
+        assert await retry == (201, {"space_id": "space-1"}, True)
+        assert len(calls) == 1
+
+    _run_with_service(test, monkeypatch)
+
+
+def test_retry_gets_conflict_after_wait_times_out(monkeypatch):
+    async def test(service):
+        owner, stored = await service.begin(USER_ID, KEY, "fp")
+        assert owner is not None and stored is None
+
+        handler, calls = _counting_handler()
+        with pytest.raises(HTTPException) as e:
+            await service.execute(USER_ID, KEY, "fp", handler)
+        assert e.value.status_code == 409
+        assert e.value.headers["Retry-After"] == "1"
+        assert not calls
+
+    _run_with_service(test, monkeypatch, wait_seconds="0.2")
+
+
+def test_server_error_releases_key(monkeypatch):
+    async def test(service):
+        failing, failed_calls = _counting_handler(error=HTTPException(status_code=500, detail="오류"))
+        with pytest.raises(HTTPException):
+            await service.execute(USER_ID, KEY, "fp", failing)
+        assert await service.keys.find_one({"_id": RECORD_ID}) is None
+
+        handler, calls = _counting_handler()
+        assert await service.execute(USER_ID, KEY, "fp", handler) == (201, {"space_id": "space-1"}, False)
+        assert len(failed_calls) == 1 and len(calls) == 1
+
+    _run_with_service(test, monkeypatch)
+
+
+def test_client_error_is_stored(monkeypatch):
+    async def test(service):
+        failing, calls = _counting_handler(error=HTTPException(status_code=404, detail="공간을 찾을 수 없습니다."))
+        with pytest.raises(HTTPException):
+            await service.execute(USER_ID, KEY, "fp", failing)
+
+        assert await service.execute(USER_ID, KEY, "fp", failing) == (404, {"detail": "공간을 찾을 수 없습니다."}, True)
+        assert len(calls) == 1
+
+    _run_with_service(test, monkeypatch)
+
+
+def test_expired_lease_is_taken_over_and_old_owner_is_ignored(monkeypatch):
+    async def test(service):
+        stale_owner, _ = await service.begin(USER_ID, KEY, "fp")
+        # 처리하던 인스턴스가 종료되어 임대가 만료된 상태
+        await service.keys.update_one({"_id": RECORD_ID}, {"$set": {"locked_until": datetime.now() - timedelta(seconds=1)}})
+
+        handler, calls = _counting_handler()
+        new_owner, stored = await service.begin(USER_ID, KEY, "fp")
+        assert stored is None
+        assert new_owner != stale_owner
+
+        # 이전 owner 의 완료/해제는 반영되지 않음
+        await service.complete(USER_ID, KEY, stale_owner, 500, {"detail": "stale"})
+        await service.release(USER_ID, KEY, stale_owner)
+        record = await service.keys.find_one({"_id": RECORD_ID})
+        assert record["status"] == "in_progress"
+        assert record["owner"] == new_owner
+
+        status_code, body = await handler()
+        await service.complete(USER_ID, KEY, new_owner, status_code, body)
+        assert await service.execute(USER_ID, KEY, "fp", handler) == (201, {"space_id": "space-1"}, True)
+        assert len(calls) == 1
+
+    _run_with_service(test, monkeypatch)
+
+
+def test_key_length_is_validated(monkeypatch):
+    async def test(service):
+        handler, calls = _counting_handler()
+        for key in ("", "k" * 256):
+            with pytest.raises(HTTPException) as e:
+                await service.execute(USER_ID, key, "fp", handler)
+            assert e.value.status_code == 400
+        assert not calls
+
+    _run_with_service(test, monkeypatch)
+
+
+def test_cancelled_request_releases_key(monkeypatch):
+    async def test(service):
+        started = asyncio.Event()
+
+        async def slow_handler():
+            started.set()
+            await asyncio.sleep(10)
+            return 201, {}
+
+        task = asyncio.create_task(service.execute(USER_ID, KEY, "fp", slow_handler))
+        await started.wait()
+        task.cancel()
+        # 취소된 요청은 기록을 해제하고 취소를 그대로 전달
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await service.keys.find_one({"_id": RECORD_ID}) is None
+
+    _run_with_service(test, monkeypatch)
@@ -0,0 +1,225 @@
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo.errors import ExecutionTimeout
+
+from utils.deadline import deadline_scope, remaining
+from utils.logger import Logger
+
+
+ADMISSION_IN_FLIGHT = Gauge("space_admission_in_flight", "처리 중인 요청 수", ["pool"])
+ADMISSION_QUEUED = Gauge("space_admission_queued", "대기 중인 요청 수", ["pool"])
+ADMISSION_WAIT_SECONDS = Histogram(
+    "space_admission_wait_seconds",
+    "admission 대기 시간(초)",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+ADMISSION_REJECTED = Counter("space_admission_rejected_total", "거절(503)/기한 초과(504)된 요청 수", ["route", "reason"])
+
+
+class AdmissionPolicy(NamedTuple):
+    kind: str
+    priority: int           # 작을수록 먼저 입장 (공유 풀에서 읽기 우선)
+    max_concurrency: int    # 라우트별 동시 처리 수
+    max_queue: int          # 라우트별 대기열 길이
+    queue_timeout: float    # 대기 최대 시간(초)
+    deadline: float         # 요청 처리 기한(초), MongoDB maxTimeMS / S3 호출에 적용
+
+
+# 종류별 기본값 (priority, max_concurrency, max_queue, queue_timeout, deadline)
+# 환경 변수 SPACE_ADMISSION_{KIND}_LIMIT / _QUEUE / _QUEUE_TIMEOUT / _DEADLINE 로 변경
+_POLICY_DEFAULTS = {
+    "read": (0, 64, 128, 1.0, 5.0),
+    "geo": (1, 16, 32, 0.5, 3.0),
+    "write": (1, 32, 32, 2.0, 10.0),
+    "upload": (2, 8, 8, 2.0, 30.0),
+}
+
+
+def admission(kind: str) -> Callable:
+    """엔드포인트에 admission 종류 지정 (라우터 데코레이터 아래에 위치)
+
+    @space_router.get("/nearby", ...)
+    @admission("geo")
+    async def get_nearby_spaces(...):
+    """
+    if kind not in _POLICY_DEFAULTS:
+        raise ValueError(f"알 수 없는 admission 종류입니다: {kind}")
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__admission_kind__ = kind
+        return endpoint
+
+    return decorator
+
+
+def load_policy(kind: str) -> AdmissionPolicy:
+    priority, limit, queue, queue_timeout, deadline = _POLICY_DEFAULTS[kind]
+    prefix = f"SPACE_ADMISSION_{kind.upper()}"
+    return AdmissionPolicy(
+        kind=kind,
+        priority=priority,
+        max_concurrency=int(os.getenv(f"{prefix}_LIMIT", str(limit))),
+        max_queue=int(os.getenv(f"{prefix}_QUEUE", str(queue))),
+        queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT", str(queue_timeout))),
+        deadline=float(os.getenv(f"{prefix}_DEADLINE", str(deadline)))
+    )
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """동시 처리 수 제한 + 우선순위 대기열 (같은 우선순위는 도착 순서대로)"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._active = 0
+        self._queued = 0
+        self._waiters: List = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority: int, timeout: float) -> None:
+        if self._active < self.max_concurrency and self._queued == 0:
+            self._active += 1
+            self._update_gauges()
+            return
+
+        if self._queued >= self.max_queue:
+            raise AdmissionRejected("queue_full")
+        if timeout <= 0:
+            raise AdmissionRejected("queue_timeout")
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._queued += 1
+        self._update_gauges()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                # 입장 직후에 시간 초과/취소된 경우: 받은 자리를 처리
+                if isinstance(e, asyncio.CancelledError):
+                    self.release()
+                    raise
+                return
+            waiter.cancel()
+            self._queued -= 1
+            self._update_gauges()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise AdmissionRejected("queue_timeout")
+
+    def release(self) -> None:
+        # 대기자가 있으면 자리를 그대로 넘김 (active 수 유지)
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._queued -= 1
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self._active -= 1
+        self._update_gauges()
+
+    def _update_gauges(self):
+        ADMISSION_IN_FLIGHT.labels(pool=self.name).set(self._active)
+        ADMISSION_QUEUED.labels(pool=self.name).set(self._queued)
+
+
+class AdmissionController:
+    """라우트별 제한 + 백엔드(MongoDB 커넥션 풀/S3) 공유 제한
+
+    요청은 라우트 풀을 먼저 통과한 뒤 공유 풀에 들어가며, 공유 풀에서는 우선순위(읽기 > 쓰기 > 업로드)로 입장한다.
+    대기열이 가득 찼거나 대기 시간이 지나면 즉시 503 + Retry-After 로 거절한다.
+    """
+
+    _instance: Optional['AdmissionController'] = None
+
+    def __init__(self):
+        self._logger = Logger.setup_logger()
+        self._policies: Dict[str, AdmissionPolicy] = {}
+        self._limiters: Dict[str, AdmissionLimiter] = {}
+        self._backend = AdmissionLimiter(
+            "backend",
+            int(os.getenv("SPACE_ADMISSION_BACKEND_LIMIT", "80")),
+            int(os.getenv("SPACE_ADMISSION_BACKEND_QUEUE", "256"))
+        )
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return os.getenv("SPACE_ADMISSION", "true").lower() == "true"
+
+    @classmethod
+    def get_instance(cls) -> 'AdmissionController':
+        # .env 로드(lifespan) 이후 첫 요청 시점에 생성
+        if cls._instance is None:
+            cls._instance = AdmissionController()
+        return cls._instance
+
+    def _policy(self, kind: str) -> AdmissionPolicy:
+        if kind not in self._policies:
+            self._policies[kind] = load_policy(kind)
+        return self._policies[kind]
+
+    def _limiter(self, route: str, policy: AdmissionPolicy) -> AdmissionLimiter:
+        if route not in self._limiters:
+            self._limiters[route] = AdmissionLimiter(route, policy.max_concurrency, policy.max_queue)
+        return self._limiters[route]
+
+    @asynccontextmanager
+    async def admit(self, route: str, kind: str):
+        policy = self._policy(kind)
+
+        # 대기 시간도 요청 기한에 포함
+        with deadline_scope(policy.deadline):
+            started = time.monotonic()
+            limiter = self._limiter(route, policy)
+            await self._acquire(limiter, route, policy, policy.queue_timeout)
+            try:
+                left = policy.queue_timeout - (time.monotonic() - started)
+                await self._acquire(self._backend, route, policy, left)
+            except BaseException:
+                limiter.release()
+                raise
+            ADMISSION_WAIT_SECONDS.labels(route=route).observe(time.monotonic() - started)
+
+            try:
+                yield
+            except ExecutionTimeout:
+                # MongoDB maxTimeMS 초과
+                ADMISSION_REJECTED.labels(route=route, reason="deadline").inc()
+                raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="요청 처리 시간이 초과되었습니다.")
+            finally:
+                self._backend.release()
+                limiter.release()
+
+    async def _acquire(self, limiter: AdmissionLimiter, route: str, policy: AdmissionPolicy, timeout: float):
+        left = remaining()
+        if left is not None:
+            timeout = min(timeout, left)
+        try:
+            await limiter.acquire(policy.priority, timeout)
+        except AdmissionRejected as e:
+            ADMISSION_REJECTED.labels(route=route, reason=f"{limiter.name if limiter is self._backend else 'route'}_{e.reason}").inc()
+            self._logger.warning(f"요청이 거절되었습니다.({route}, {limiter.name}, {e.reason})")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(max(1, math.ceil(policy.queue_timeout)))}
+            )
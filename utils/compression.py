@@ -0,0 +1,113 @@
+import gzip
+import os
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from utils.conditional import etag_for_encoding
+from utils.metrics import record_response_bytes
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 사용
+    brotli = None
+
+
+# 압축 효과가 있는 응답 형식
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+# 서버 선호 순서 (같은 q 값이면 앞쪽 우선)
+_SERVER_PREFERENCE = ("br", "gzip")
+
+
+def _settings() -> Dict:
+    # .env 는 lifespan 에서 로드되므로 호출 시점에 읽음
+    return {
+        "enabled": os.getenv("SPACE_COMPRESSION", "true").lower() == "true",
+        "min_size": int(os.getenv("SPACE_COMPRESSION_MIN_SIZE", "1024")),
+        "gzip_level": int(os.getenv("SPACE_GZIP_LEVEL", "6")),
+        "brotli_quality": int(os.getenv("SPACE_BROTLI_QUALITY", "4"))
+    }
+
+
+def available_encodings():
+    return tuple(encoding for encoding in _SERVER_PREFERENCE if encoding != "br" or brotli is not None)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding(q 값 포함)에서 사용할 인코딩 선택, 없으면 None (identity)"""
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, settings: Optional[Dict] = None) -> bytes:
+    settings = settings or _settings()
+    if encoding == "br":
+        return brotli.compress(body, quality=settings["brotli_quality"])
+    return gzip.compress(body, compresslevel=settings["gzip_level"])
+
+
+def compress_response(request: Request, response: Response, operation: str) -> Response:
+    """본문이 임계값 이상인 JSON/텍스트 응답을 클라이언트가 지원하는 인코딩으로 압축
+
+    스트리밍 응답, 이미 인코딩된 응답, 본문이 없는 상태 코드는 그대로 반환한다.
+    압축한 응답의 ETag 는 인코딩별로 구분되도록 접미사를 붙인다.
+    """
+    body = getattr(response, "body", None)
+    if not isinstance(body, (bytes, bytearray)):
+        return response
+
+    if response.status_code < 200 or response.status_code in (204, 304) or "content-encoding" in response.headers:
+        return response
+
+    content_type = response.headers.get("content-type", "")
+    if not content_type.startswith(_COMPRESSIBLE_TYPES):
+        return response
+
+    settings = _settings()
+    response.headers["Vary"] = _vary_with_accept_encoding(response.headers.get("vary"))
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding")) if settings["enabled"] else None
+    if encoding is None or len(body) < settings["min_size"]:
+        record_response_bytes(operation, "identity", len(body))
+        return response
+
+    compressed = compress(bytes(body), encoding, settings)
+    response.body = compressed
+    response.headers["Content-Length"] = str(len(compressed))
+    response.headers["Content-Encoding"] = encoding
+    if "etag" in response.headers:
+        response.headers["ETag"] = etag_for_encoding(response.headers["etag"], encoding)
+
+    record_response_bytes(operation, encoding, len(compressed), len(body))
+    return response
+
+
+def _vary_with_accept_encoding(vary: Optional[str]) -> str:
+    if not vary:
+        return "Accept-Encoding"
+    if "accept-encoding" in vary.lower():
+        return vary
+    return f"{vary}, Accept-Encoding"
@@ -0,0 +1,111 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+# 응답 형태가 바뀌면 올려서 기존 ETag 를 무효화
+_REPRESENTATION_VERSION = "1"
+# 압축된 응답의 ETag 접미사 (utils.compression)
+_ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def _field(space: Any, name: str):
+    # MongoDB 문서(dict) 또는 utils.type.space_record_type 의 레코드
+    return space.get(name) if isinstance(space, dict) else getattr(space, name, None)
+
+
+def _revision(space: Any) -> str:
+    space_id = _field(space, "space_id") or _field(space, "_id")
+    updated_at = _field(space, "updated_at") or _field(space, "created_at")
+    updated_ms = int(_as_utc(updated_at).timestamp() * 1000) if updated_at else 0
+    return f"{space_id}:{_field(space, 'version') or 0}:{updated_ms}"
+
+
+def _as_utc(value: datetime) -> datetime:
+    # MongoDB 는 naive UTC datetime 을 반환
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _strong_etag(*parts: str) -> str:
+    digest = hashlib.blake2b(":".join(parts).encode("UTF-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def space_validators(space: Dict) -> Validators:
+    updated_at = space.get("updated_at") or space.get("created_at")
+    return Validators(
+        etag=_strong_etag(_REPRESENTATION_VERSION, "space", _revision(space)),
+        last_modified=_as_utc(updated_at) if updated_at else None
+    )
+
+
+def list_validators(key: str, spaces: Iterable[Any]) -> Validators:
+    # 목록은 Last-Modified 없이 ETag 로만 확인
+    # (공간이 목록에서 빠지고 더 오래된 공간이 들어오면 max(updated_at) 이 줄어 If-Modified-Since 로는 변경을 알 수 없음)
+    revisions = [_revision(space) for space in spaces]
+    return Validators(
+        etag=_strong_etag(_REPRESENTATION_VERSION, "list", key, *revisions),
+        last_modified=None
+    )
+
+
+def etag_for_encoding(etag: str, encoding: str) -> str:
+    # 인코딩별 표현은 서로 다른 ETag 를 가져야 함 ("abc" -> "abc-gzip")
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def _strip_encoding(tag: str) -> str:
+    tag = tag.strip().removeprefix("W/")
+    for suffix in _ENCODING_SUFFIXES:
+        if tag.endswith(f'{suffix}"'):
+            return f'{tag[:-len(suffix) - 1]}"'
+    return tag
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """If-None-Match 가 있으면 ETag 로만, 없으면 If-Modified-Since 로 판단"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match 는 약한 비교 (W/ 접두어, 압축 인코딩 접미사 무시)
+        candidates = {_strip_encoding(tag) for tag in if_none_match.split(",")}
+        return validators.etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return validators.last_modified.replace(microsecond=0) <= _as_utc(since)
+
+    return False
+
+
+def apply_validators(response: Response, validators: Validators) -> None:
+    response.headers["ETag"] = validators.etag
+    response.headers["Cache-Control"] = "no-cache"
+    if validators.last_modified:
+        response.headers["Last-Modified"] = format_datetime(validators.last_modified, usegmt=True)
+
+
+def not_modified_response(validators: Validators) -> Response:
+    response = Response(status_code=304)
+    apply_validators(response, validators)
+    return response
@@ -0,0 +1,23 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+
+# (정렬 기준 시각, _id) 쌍을 불투명한 페이지 커서 문자열로 변환
+def encode_cursor(sort_value: datetime, object_id: ObjectId) -> str:
+    raw = f"{sort_value.isoformat()}|{object_id}"
+    return base64.urlsafe_b64encode(raw.encode("UTF-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("UTF-8")
+        sort_value, object_id = raw.split("|", 1)
+        return datetime.fromisoformat(sort_value), ObjectId(object_id)
+    except (ValueError, InvalidId, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="유효하지 않은 커서입니다.")
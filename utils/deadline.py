@@ -0,0 +1,52 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+
+# 요청 처리 기한 (time.monotonic 기준), 라우트 admission 에서 설정
+_deadline: ContextVar[Optional[float]] = ContextVar("space_request_deadline", default=None)
+
+# 남은 시간이 이보다 짧으면 백엔드 호출을 시작하지 않음
+_MIN_BUDGET_SECONDS = 0.005
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """블록 안에서 실행되는 MongoDB 조회/S3 호출에 요청 기한을 적용 (중첩 시 더 이른 기한 유지)"""
+    if not seconds:
+        yield
+        return
+
+    current = _deadline.get()
+    candidate = time.monotonic() + seconds
+    token = _deadline.set(candidate if current is None else min(current, candidate))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    # 이미 기한이 지난 요청은 더 이상 백엔드 자원을 쓰지 않도록 중단
+    left = remaining()
+    if left is not None and left < _MIN_BUDGET_SECONDS:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="요청 처리 시간이 초과되었습니다.")
+
+
+def max_time_ms() -> Optional[int]:
+    """MongoDB 조회에 전달할 maxTimeMS (기한이 없으면 None)"""
+    left = remaining()
+    if left is None:
+        return None
+    check_deadline()
+    return max(1, int(left * 1000))
@@ -0,0 +1,79 @@
+import math
+from typing import List, Tuple
+
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+# 공간 문서에 저장하는 geohash 길이 (약 4.8m x 4.8m)
+STORED_PRECISION = 9
+
+
+def encode(latitude: float, longitude: float, precision: int = STORED_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        # 짝수 번째 비트는 경도, 홀수 번째 비트는 위도
+        value, value_range = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits <<= 1
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """geohash 칸의 (min_lon, min_lat, max_lon, max_lat)"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            value_range = lon_range if even else lat_range
+            mid = (value_range[0] + value_range[1]) / 2
+            if (value >> shift) & 1:
+                value_range[0] = mid
+            else:
+                value_range[1] = mid
+            even = not even
+    return lon_range[0], lat_range[0], lon_range[1], lat_range[1]
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """길이 precision 인 칸의 (경도 폭, 위도 높이) (도 단위)"""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = math.floor(precision * 5 / 2)
+    return 360.0 / (2 ** lon_bits), 180.0 / (2 ** lat_bits)
+
+
+def count_cells(min_lon: float, min_lat: float, max_lon: float, max_lat: float, precision: int) -> int:
+    lon_step, lat_step = cell_size(precision)
+    columns = math.floor(max_lon / lon_step) - math.floor(min_lon / lon_step) + 1
+    rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+    return columns * rows
+
+
+def cells(min_lon: float, min_lat: float, max_lon: float, max_lat: float, precision: int) -> List[str]:
+    """영역과 겹치는 길이 precision 의 geohash 칸 목록"""
+    lon_step, lat_step = cell_size(precision)
+    result = []
+    row = math.floor(min_lat / lat_step)
+    while row * lat_step <= max_lat:
+        column = math.floor(min_lon / lon_step)
+        while column * lon_step <= max_lon:
+            # 칸의 중심점으로 인코딩
+            latitude = min(89.999999, max(-89.999999, (row + 0.5) * lat_step))
+            longitude = min(179.999999, max(-179.999999, (column + 0.5) * lon_step))
+            result.append(encode(latitude, longitude, precision))
+            column += 1
+        row += 1
+    return list(dict.fromkeys(result))
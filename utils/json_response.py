@@ -0,0 +1,27 @@
+import os
+from typing import Type
+
+from fastapi.responses import JSONResponse
+
+from utils.logger import Logger
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+
+def json_response_class() -> Type[JSONResponse]:
+    """라우터 기본 응답 클래스 (SPACE_JSON_RESPONSE=orjson | std, 기본값 orjson)
+
+    라우터 생성 시점(import)에 결정되므로 .env 가 아닌 프로세스 환경 변수로 지정한다.
+    """
+    if os.getenv("SPACE_JSON_RESPONSE", "orjson").lower() == "std":
+        return JSONResponse
+
+    if orjson is None:
+        Logger.setup_logger().warning("orjson 이 설치되어 있지 않아 표준 JSON 응답을 사용합니다.")
+        return JSONResponse
+
+    from fastapi.responses import ORJSONResponse
+    return ORJSONResponse
@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional
+
+from opentelemetry import trace
+from prometheus_client import Counter, Histogram
+
+
+# 요청 내부 단계별(DB 조회, S3 업로드, 응답 가공 등) 소요 시간
+STAGE_SECONDS = Histogram(
+    "space_service_stage_seconds",
+    "공간 서비스 단계별 소요 시간(초)",
+    ["operation", "stage"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+DOCUMENTS_RETURNED = Histogram(
+    "space_service_documents_returned",
+    "조회 1회당 반환된 문서 수",
+    ["operation"],
+    buckets=(0, 1, 5, 10, 20, 50, 100, 200, 500, 1000)
+)
+S3_OPERATIONS = Counter("space_service_s3_operations_total", "S3 호출 수", ["operation", "s3_operation"])
+S3_BYTES = Counter("space_service_s3_bytes_total", "S3 업로드 바이트 수", ["operation"])
+RESPONSE_BYTES = Counter("space_service_response_bytes_total", "전송된 응답 본문 바이트 수", ["operation", "encoding"])
+RESPONSE_UNCOMPRESSED_BYTES = Counter("space_service_response_uncompressed_bytes_total", "압축 전 응답 본문 바이트 수", ["operation"])
+
+_tracer = trace.get_tracer("space-service")
+
+
+@contextmanager
+def stage(operation: str, name: str, **attributes):
+    """단계 하나를 span 으로 기록하고 소요 시간을 히스토그램에 남김
+
+    with stage("create_space", "db_insert"):
+        ...
+    """
+    started = perf_counter()
+    with _tracer.start_as_current_span(f"{operation}.{name}", attributes=attributes) as span:
+        try:
+            yield span
+        finally:
+            STAGE_SECONDS.labels(operation=operation, stage=name).observe(perf_counter() - started)
+
+
+def record_documents(operation: str, count: int) -> None:
+    DOCUMENTS_RETURNED.labels(operation=operation).observe(count)
+    trace.get_current_span().set_attribute("db.documents_returned", count)
+
+
+def record_s3(operation: str, s3_operation: str, size: int = 0) -> None:
+    S3_OPERATIONS.labels(operation=operation, s3_operation=s3_operation).inc()
+    if size:
+        S3_BYTES.labels(operation=operation).inc(size)
+    span = trace.get_current_span()
+    span.set_attribute("s3.operation", s3_operation)
+    if size:
+        span.set_attribute("s3.bytes", size)
+
+
+def record_response_bytes(operation: str, encoding: str, size: int, uncompressed_size: Optional[int] = None) -> None:
+    RESPONSE_BYTES.labels(operation=operation, encoding=encoding).inc(size)
+    RESPONSE_UNCOMPRESSED_BYTES.labels(operation=operation).inc(uncompressed_size if uncompressed_size is not None else size)
@@ -1,9 +1,12 @@
 from typing import Optional
 from fastapi import HTTPException
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
+from utils import geohash
 from utils.database_config import DatabaseConfig
 from utils.logger import Logger
+from utils.query_monitor import QueryMonitor
 
 
 class MongoDB:
@@ -18,7 +21,10 @@ class MongoDB:
     async def connect(self):
         if not self.client:
             try:
-                self.client = AsyncIOMotorClient(self._build_connection_string())
+                # 느린 쿼리 모니터 (SPACE_DB_QUERY_MONITOR=true 일 때만 등록)
+                query_monitor = QueryMonitor.get_instance()
+                event_listeners = [query_monitor] if query_monitor else []
+                self.client = AsyncIOMotorClient(self._build_connection_string(), event_listeners=event_listeners)
                 self.db = self.client[self._db_config.dbname]
                 
                 self._logger.info('몽고DB 연결 중...')
@@ -53,12 +59,46 @@ class MongoDB:
                 self._logger.info(f"location, 2dsphere 인덱스 생성")
                 await self.db.spaces.create_index([("location", "2dsphere")])            
 
+            # updated_at / version 이 없는 기존 문서 보정 (ETag 계산 기준)
+            await self.db.spaces.update_many(
+                {"updated_at": {"$exists": False}},
+                [{"$set": {"updated_at": "$created_at", "version": {"$ifNull": ["$version", 0]}}}]
+            )
+
+            # 지도 클러스터 조회용 geohash (기존 문서 보정 후 인덱스 생성)
+            await self._backfill_geohash()
+            await self.db.spaces.create_index([("geohash", 1)], name="geohash")
+
+            # 변경 피드((updated_at, _id) 순서로 이어 읽기)용 인덱스
+            await self.db.spaces.create_index([("updated_at", 1), ("_id", 1)], name="updated_at_id")
+
+            # 공급자별 공간 목록 조회(내 공간) 커서 페이지네이션용 인덱스
+            await self.db.spaces.create_index(
+                [("user_id", 1), ("created_at", -1), ("_id", -1)],
+                name="user_id_created_at"
+            )
+
             return self.db
         
         except Exception as e:
             self._logger.error(f"DB 초기화 중 오류가 발생했습니다.: {e}")
             raise HTTPException(status_code=500, detail="내부적으로 오류가 발생했습니다.")
     
+    async def _backfill_geohash(self, batch_size: int = 500):
+        cursor = self.db.spaces.find(
+            {"geohash": {"$exists": False}, "location.coordinates": {"$exists": True}},
+            {"location.coordinates": 1}
+        )
+        updates = []
+        async for space in cursor:
+            longitude, latitude = space["location"]["coordinates"][:2]
+            updates.append(UpdateOne({"_id": space["_id"]}, {"$set": {"geohash": geohash.encode(latitude, longitude)}}))
+            if len(updates) >= batch_size:
+                await self.db.spaces.bulk_write(updates, ordered=False)
+                updates = []
+        if updates:
+            await self.db.spaces.bulk_write(updates, ordered=False)
+
     async def close(self):
         if self.client:
             self.client.close()
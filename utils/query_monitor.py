@@ -0,0 +1,298 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from prometheus_client import Counter, Histogram
+from pymongo import monitoring
+
+from utils.logger import Logger
+
+
+COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB 명령 소요 시간(초)",
+    ["command", "collection"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+SLOW_COMMANDS = Counter("mongodb_slow_commands_total", "임계값을 넘은 MongoDB 명령 수", ["command", "collection"])
+EXPLAIN_FLAGS = Counter("mongodb_explain_plan_flags_total", "explain 결과에서 발견된 비효율 실행 단계", ["collection", "flag"])
+
+
+class _ShapeStats:
+    __slots__ = ("command", "collection", "shape", "count", "total_ms", "max_ms", "slow_count", "recent_ms", "last_explain", "last_explain_at")
+
+    def __init__(self, command: str, collection: str, shape: str, recent_size: int):
+        self.command = command
+        self.collection = collection
+        self.shape = shape
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+        self.recent_ms = deque(maxlen=recent_size)
+        self.last_explain: Optional[Dict] = None
+        self.last_explain_at = 0.0
+
+    def to_dict(self) -> Dict:
+        recent = sorted(self.recent_ms)
+        return {
+            "command": self.command,
+            "collection": self.collection,
+            "shape": self.shape,
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(recent[len(recent) // 2], 3) if recent else 0.0,
+            "p99_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.99))], 3) if recent else 0.0,
+            "last_explain": self.last_explain
+        }
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """AsyncIOMotorClient 에 등록하는 명령 모니터 (SPACE_DB_QUERY_MONITOR=true 일 때만 사용)
+
+    명령 형태(필터 키/연산자, 정렬, 파이프라인 단계)별로 소요 시간을 집계하고,
+    임계값을 넘은 find/aggregate 는 형태별로 주기적으로 explain 을 실행해 COLLSCAN / 메모리 정렬을 표시한다.
+    메모리는 형태 수(LRU), 형태별 최근 샘플 수, 대기 중인 explain 수로 제한된다.
+    """
+
+    _instance: Optional['QueryMonitor'] = None
+
+    # 집계 대상 명령
+    _TRACKED_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "insert", "findAndModify"}
+    _EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+    # explain 시 그대로 전달할 명령 필드
+    _EXPLAIN_FIELDS = {"find", "aggregate", "count", "distinct", "filter", "query", "key", "sort", "projection", "skip", "limit", "hint", "pipeline", "collation"}
+    _MAX_INFLIGHT = 10000
+
+    def __init__(self):
+        self._logger = Logger.setup_logger()
+        self.slow_ms = float(os.getenv("SPACE_DB_SLOW_QUERY_MS", "100"))
+        self._max_shapes = int(os.getenv("SPACE_DB_QUERY_SHAPES_MAX", "200"))
+        self._explain_interval = float(os.getenv("SPACE_DB_EXPLAIN_INTERVAL", "300"))
+        self._recent_size = int(os.getenv("SPACE_DB_QUERY_SAMPLES", "200"))
+
+        self._lock = threading.Lock()
+        self._shapes: "OrderedDict[str, _ShapeStats]" = OrderedDict()
+        self._inflight: "OrderedDict[int, tuple]" = OrderedDict()
+        self._explain_queue: deque = deque(maxlen=50)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._explain_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return os.getenv("SPACE_DB_QUERY_MONITOR", "false").lower() == "true"
+
+    @classmethod
+    def get_instance(cls) -> Optional['QueryMonitor']:
+        if cls._instance is None and cls.is_enabled():
+            cls._instance = QueryMonitor()
+        return cls._instance
+
+    # ---- pymongo 이벤트 (드라이버 스레드에서 호출됨) ----
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        if event.command_name not in self._TRACKED_COMMANDS:
+            return
+
+        command = event.command
+        collection = str(command.get(event.command_name, ""))
+        shape = self._shape(event.command_name, command)
+        explain_command = None
+        if event.command_name in self._EXPLAINABLE_COMMANDS:
+            explain_command = {key: value for key, value in command.items() if key in self._EXPLAIN_FIELDS}
+
+        with self._lock:
+            self._inflight[event.request_id] = (event.command_name, collection, shape, explain_command, event.database_name)
+            if len(self._inflight) > self._MAX_INFLIGHT:
+                self._inflight.popitem(last=False)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event.request_id, event.duration_micros)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event.request_id, event.duration_micros)
+
+    def _finish(self, request_id: int, duration_micros: int):
+        with self._lock:
+            inflight = self._inflight.pop(request_id, None)
+        if inflight is None:
+            return
+
+        command_name, collection, shape, explain_command, database_name = inflight
+        duration_ms = duration_micros / 1000
+        COMMAND_DURATION.labels(command=command_name, collection=collection).observe(duration_ms / 1000)
+
+        slow = duration_ms >= self.slow_ms
+        schedule_explain = False
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = _ShapeStats(command_name, collection, shape, self._recent_size)
+                self._shapes[shape] = stats
+                if len(self._shapes) > self._max_shapes:
+                    self._shapes.popitem(last=False)
+            else:
+                self._shapes.move_to_end(shape)
+
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.recent_ms.append(duration_ms)
+
+            if slow:
+                stats.slow_count += 1
+                now = time.monotonic()
+                if explain_command and now - stats.last_explain_at >= self._explain_interval:
+                    stats.last_explain_at = now
+                    self._explain_queue.append((shape, collection, database_name, explain_command))
+                    schedule_explain = True
+
+        if slow:
+            SLOW_COMMANDS.labels(command=command_name, collection=collection).inc()
+            self._logger.warning(f"느린 쿼리 감지({duration_ms:.1f}ms): {shape}")
+
+        if schedule_explain and self._loop and self._explain_ready:
+            self._loop.call_soon_threadsafe(self._explain_ready.set)
+
+    # ---- explain 샘플링 (이벤트 루프에서 실행) ----
+
+    def start(self, db: AsyncIOMotorDatabase):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._explain_ready = asyncio.Event()
+            self._task = asyncio.create_task(self._explain_loop(db))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        QueryMonitor._instance = None
+
+    async def _explain_loop(self, db: AsyncIOMotorDatabase):
+        while True:
+            await self._explain_ready.wait()
+            self._explain_ready.clear()
+
+            while True:
+                with self._lock:
+                    if not self._explain_queue:
+                        break
+                    shape, collection, database_name, command = self._explain_queue.popleft()
+                try:
+                    explain = await db.client[database_name].command("explain", command, verbosity="queryPlanner")
+                    self._record_explain(shape, collection, explain)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._logger.warning(f"explain 실행 실패: {shape} {e}")
+
+    def _record_explain(self, shape: str, collection: str, explain: Dict):
+        stages = self._winning_plan_stages(explain)
+        flags = []
+        if "COLLSCAN" in stages:
+            flags.append("COLLSCAN")
+        if "SORT" in stages:
+            flags.append("IN_MEMORY_SORT")
+
+        for flag in flags:
+            EXPLAIN_FLAGS.labels(collection=collection, flag=flag).inc()
+        if flags:
+            self._logger.warning(f"비효율 실행 계획 {flags}: {shape}")
+
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats:
+                stats.last_explain = {"stages": stages, "flags": flags, "explained_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+    @classmethod
+    def _winning_plan_stages(cls, explain: Any) -> List[str]:
+        stages: List[str] = []
+
+        def collect(node: Any):
+            if isinstance(node, dict):
+                if "stage" in node:
+                    stages.append(node["stage"])
+                for key, value in node.items():
+                    if key != "rejectedPlans":
+                        collect(value)
+            elif isinstance(node, list):
+                for item in node:
+                    collect(item)
+
+        def find_plans(node: Any):
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key == "winningPlan":
+                        collect(value)
+                    elif key != "rejectedPlans":
+                        find_plans(value)
+            elif isinstance(node, list):
+                for item in node:
+                    find_plans(item)
+
+        find_plans(explain)
+        return stages
+
+    # ---- 명령 형태 ----
+
+    @classmethod
+    def _shape(cls, command_name: str, command: Dict) -> str:
+        parts = [command_name, str(command.get(command_name, ""))]
+        if command_name == "aggregate":
+            parts.append("pipeline=" + json.dumps([cls._normalize_stage(stage) for stage in command.get("pipeline", [])], ensure_ascii=False, sort_keys=True))
+        else:
+            for key in ("filter", "query"):
+                if key in command:
+                    parts.append(f"{key}=" + json.dumps(cls._normalize(command[key]), ensure_ascii=False, sort_keys=True))
+            if "sort" in command:
+                parts.append("sort=" + json.dumps(dict(command["sort"]), sort_keys=False))
+            for key in ("updates", "deletes"):
+                if command.get(key):
+                    parts.append(f"{key}=" + json.dumps(cls._normalize(command[key][0].get("q", {})), ensure_ascii=False, sort_keys=True))
+        return " ".join(parts)
+
+    @classmethod
+    def _normalize_stage(cls, stage: Dict) -> Dict:
+        name = next(iter(stage), "")
+        if name in ("$match", "$geoNear"):
+            return {name: cls._normalize(stage[name])}
+        if name == "$sort":
+            return {name: dict(stage[name])}
+        return {name: "?"}
+
+    @classmethod
+    def _normalize(cls, value: Any) -> Any:
+        # 값은 지우고 필드 이름과 연산자만 남김
+        if isinstance(value, dict):
+            return {key: cls._normalize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            if value and all(isinstance(item, dict) for item in value):
+                return [cls._normalize(item) for item in value]
+            return "?"
+        return "?"
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            shapes = [stats.to_dict() for stats in self._shapes.values()]
+            pending = len(self._explain_queue)
+        shapes.sort(key=lambda stats: stats["total_ms"], reverse=True)
+        return {
+            "slow_query_ms": self.slow_ms,
+            "tracked_shapes": len(shapes),
+            "pending_explains": pending,
+            "shapes": shapes
+        }
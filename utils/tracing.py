@@ -0,0 +1,55 @@
+import json
+import os
+import threading
+from typing import Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.semconv.resource import ResourceAttributes
+
+
+class FileSpanExporter(SpanExporter):
+    """오프라인 분석용으로 span 을 한 줄에 하나씩 JSON(NDJSON)으로 기록"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = [json.dumps(json.loads(span.to_json()), ensure_ascii=False) for span in spans]
+        with self._lock:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def setup_tracing(service_name: str = "space-service") -> None:
+    """SPACE_TRACE_EXPORTER 값에 따라 trace provider 설정
+
+    - otlp: 템포(Tempo) 등 OTLP HTTP 수집기로 전송 (SPACE_OTLP_ENDPOINT)
+    - file: SPACE_TRACE_FILE 경로에 NDJSON 으로 기록
+    - none (기본값): provider 를 설정하지 않음 (span 은 no-op)
+    """
+    exporter_type = os.getenv("SPACE_TRACE_EXPORTER", "none").lower()
+    if exporter_type == "none":
+        return
+
+    if exporter_type == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter(endpoint=os.getenv("SPACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"))
+    elif exporter_type == "file":
+        exporter = FileSpanExporter(os.getenv("SPACE_TRACE_FILE", "/var/log/spaceplace/space/traces.jsonl"))
+    else:
+        raise RuntimeError(f"지원하지 않는 trace exporter 입니다: {exporter_type}")
+
+    resource = Resource.create({ResourceAttributes.SERVICE_NAME: service_name})
+    trace_provider = TracerProvider(resource=resource)
+    trace_provider.add_span_processor(BatchSpanProcessor(exporter)) # Span 프로세서 추가
+    trace.set_tracer_provider(trace_provider)
@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Dict, List, Optional
+
+
+def _location(location: Dict) -> Dict:
+    return {
+        "sido": location.get("sido"),
+        "address": location.get("address"),
+        "type": location.get("type", "Point"),
+        "coordinates": location.get("coordinates")
+    }
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+@dataclass(slots=True)
+class SpaceListRecord:
+    """공간 목록 / 주변 조회 한 건 (SpaceListResponse 필드 + ETag 계산용 버전 정보)
+
+    MongoDB 문서에서 PROJECTION 필드만 받아 바로 만들고, 응답 시 to_payload() 로 한 번만 변환한다.
+    """
+
+    PROJECTION: ClassVar[Dict] = {
+        "user_id": 1,
+        "space_name": 1,
+        "description": 1,
+        "usage_unit": 1,
+        "unit_price": 1,
+        "amenities": 1,
+        "location.sido": 1,
+        "location.address": 1,
+        "location.type": 1,
+        "location.coordinates": 1,
+        "images": {"$slice": 1},
+        "version": 1,
+        "updated_at": 1,
+        "created_at": 1
+    }
+
+    space_id: str
+    space_name: str
+    description: str
+    usage_unit: str
+    unit_price: int
+    amenities: List[str]
+    location: Dict
+    thumbnail: Optional[str]
+    version: int
+    updated_at: Optional[datetime]
+    distance: Optional[float] = None
+
+    @classmethod
+    def from_document(cls, document: Dict, thumbnail: Optional[str], distance: Optional[float] = None) -> 'SpaceListRecord':
+        return cls(
+            space_id=str(document["_id"]),
+            space_name=document["space_name"],
+            description=document["description"],
+            usage_unit=document["usage_unit"],
+            unit_price=document["unit_price"],
+            amenities=document.get("amenities", []),
+            location=_location(document["location"]),
+            thumbnail=thumbnail,
+            version=document.get("version", 0),
+            updated_at=document.get("updated_at") or document.get("created_at"),
+            distance=round(distance, 1) if distance is not None else None
+        )
+
+    def to_payload(self) -> Dict:
+        payload = {
+            "space_id": self.space_id,
+            "space_name": self.space_name,
+            "description": self.description,
+            "usage_unit": self.usage_unit,
+            "unit_price": self.unit_price,
+            "amenities": self.amenities,
+            "location": self.location,
+            "thumbnail": self.thumbnail
+        }
+        if self.distance is not None:
+            payload["distance"] = self.distance
+        return payload
+
+
+@dataclass(slots=True)
+class MySpaceRecord:
+    """내 공간 목록 한 건 (MySpaceListResponse 필드)"""
+
+    PROJECTION: ClassVar[Dict] = {
+        "user_id": 1,
+        "space_type": 1,
+        "space_name": 1,
+        "usage_unit": 1,
+        "unit_price": 1,
+        "is_operate": 1,
+        "created_at": 1,
+        "images": {"$slice": 1}
+    }
+
+    space_id: str
+    space_type: str
+    space_name: str
+    usage_unit: str
+    unit_price: int
+    is_operate: bool
+    created_at: datetime
+    thumbnail: Optional[str]
+
+    @classmethod
+    def from_document(cls, document: Dict, thumbnail: Optional[str]) -> 'MySpaceRecord':
+        return cls(
+            space_id=str(document["_id"]),
+            space_type=document["space_type"],
+            space_name=document["space_name"],
+            usage_unit=document["usage_unit"],
+            unit_price=document["unit_price"],
+            is_operate=document["is_operate"],
+            created_at=document["created_at"],
+            thumbnail=thumbnail
+        )
+
+    def to_payload(self) -> Dict:
+        return {
+            "space_id": self.space_id,
+            "space_type": self.space_type,
+            "space_name": self.space_name,
+            "usage_unit": self.usage_unit,
+            "unit_price": self.unit_price,
+            "is_operate": self.is_operate,
+            "created_at": _isoformat(self.created_at),
+            "thumbnail": self.thumbnail
+        }